@@ -0,0 +1,224 @@
+'''
+Statistics of learning over journal of answers.
+
+Records of journal are loaded into columnar numpy arrays without copying of file
+and every statistic is counted by vectorized operations: ids of words are mapped
+to dense indexes once, so numbers of answers by word and by day are counted by bincount,
+and answers are sorted by word only for learning curve.
+Numpy is optional dependency; module is imported only, when statistics are shown.
+'''
+from typing import NamedTuple
+
+import numpy as np
+
+from journal import RECORD
+from session import CORRECT
+
+
+DAY = 24 * 60 * 60
+LATENCY_PERCENTILES = (50, 90, 99)
+CURVE_ATTEMPTS = 10
+MASTERED_ACCURACY = 0.9
+HARD_ACCURACY = 0.5
+SHOWN_DAYS = 7
+
+RECORD_DTYPE = np.dtype([('word_id', '<u8'),
+                         ('time', '<f8'),
+                         ('answer_offset', '<u8'),
+                         ('latency', '<f4'),
+                         ('status', 'u1'),
+                         ('typos', 'u1'),
+                         ('reversed', 'u1'),
+                         ('padding', 'u1')])
+assert RECORD_DTYPE.itemsize == RECORD.size
+
+STATS_TEXT = '''Odpowiedzi: %s, poprawnych: %.0f%%
+Słowa: %s, opanowane: %s, trudne: %s
+Czas odpowiedzi: mediana %.1f s, 90%%: %.1f s, 99%%: %.1f s
+Seria poprawnych: obecna %s, najdłuższa %s
+Krzywa nauki (próba: poprawne): %s
+Ostatnie dni: %s'''
+NO_ANSWERS_TEXT = 'Brak zapisanych odpowiedzi'
+
+
+class AnswerHistory(NamedTuple):
+    '''
+    Class, that represents
+    all recorded answers as columns in order of answering.
+
+    Attributes:
+    -----------
+        word_ids: np.ndarray
+            ids of answered words
+
+        times: np.ndarray
+            times of answers, in seconds since the epoch
+
+        latencies: np.ndarray
+            time in seconds from showing of question to checking of answer, 0 if it is unknown
+
+        is_correct: np.ndarray
+            boolean values, if answers were correct
+    '''
+    word_ids: np.ndarray
+    times: np.ndarray
+    latencies: np.ndarray
+    is_correct: np.ndarray
+
+
+    @classmethod
+    def from_records(cls, records: bytes) -> 'AnswerHistory':
+        '''
+        Returns history from records of journal;
+        columns are views of passed buffer, except of is_correct.
+
+        Parameters:
+        -----------
+            records: bytes
+                complete records of journal
+        '''
+        table = np.frombuffer(records, dtype = RECORD_DTYPE)
+        return cls(table['word_id'], table['time'], table['latency'], table['status'] == CORRECT)
+
+
+    def __len__(self) -> int:
+        return len(self.word_ids)
+
+
+class LearningStats(NamedTuple):
+    '''
+    Class, that represents
+    statistics of learning.
+
+    Attributes:
+    -----------
+        answers: int
+            number of all answers
+
+        accuracy: float
+            part of correct answers
+
+        word_ids: np.ndarray
+            sorted ids of answered words
+
+        word_attempts: np.ndarray
+            number of answers to every word
+
+        word_accuracy: np.ndarray
+            part of correct answers to every word
+
+        latency_percentiles: np.ndarray
+            latencies of answers by LATENCY_PERCENTILES
+
+        current_streak: int
+            number of the last correct answers in a row
+
+        longest_streak: int
+            the longest number of correct answers in a row
+
+        learning_curve: np.ndarray
+            part of correct answers among first, second and further attempts of words
+
+        days: np.ndarray
+            days with answers, in days since the epoch
+
+        daily_accuracy: np.ndarray
+            part of correct answers in every day
+    '''
+    answers: int
+    accuracy: float
+    word_ids: np.ndarray
+    word_attempts: np.ndarray
+    word_accuracy: np.ndarray
+    latency_percentiles: np.ndarray
+    current_streak: int
+    longest_streak: int
+    learning_curve: np.ndarray
+    days: np.ndarray
+    daily_accuracy: np.ndarray
+
+
+def _streaks(is_correct: np.ndarray):
+    # runs of correct answers start and end, where padded column changes
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], is_correct.view(np.int8), [0]))))
+    lengths = edges[1::2] - edges[::2]
+    if not len(lengths):
+        return 0, 0
+    current = int(lengths[-1]) if edges[-1] == len(is_correct) else 0
+    return current, int(lengths.max())
+
+
+def compute_stats(history: AnswerHistory) -> LearningStats:
+    '''
+    Returns statistics of learning,
+    counted from history of answers.
+
+    Parameters:
+    -----------
+        history: AnswerHistory
+            recorded answers in order of answering
+    '''
+    is_correct = history.is_correct
+    answers = len(history)
+    word_ids, word_indexes = np.unique(history.word_ids, return_inverse = True)
+    word_indexes = word_indexes.ravel()
+    word_attempts = np.bincount(word_indexes, minlength = len(word_ids))
+    word_correct = np.bincount(word_indexes, weights = is_correct, minlength = len(word_ids))
+    # keys of answers are unique, so their quick sort orders answers by word,
+    # keeping order of answering inside every word
+    order = np.sort(word_indexes.astype(np.int64) * answers + np.arange(answers)) % max(answers, 1)
+    group_starts = np.cumsum(word_attempts) - word_attempts
+    # number of attempt of every answer inside its word, from 0
+    attempt_numbers = np.arange(answers) - np.repeat(group_starts, word_attempts)
+    is_counted = attempt_numbers < CURVE_ATTEMPTS
+    curve_attempts = np.bincount(attempt_numbers[is_counted], minlength = CURVE_ATTEMPTS)
+    curve_correct = np.bincount(attempt_numbers[is_counted],
+                                weights = is_correct[order][is_counted],
+                                minlength = CURVE_ATTEMPTS)
+    curve_length = int(np.count_nonzero(curve_attempts))
+    day_numbers = (history.times * (1 / DAY)).astype(np.int64)
+    first_day = int(day_numbers.min()) if answers else 0
+    day_answers = np.bincount(day_numbers - first_day)
+    day_correct = np.bincount(day_numbers - first_day, weights = is_correct)
+    days = np.flatnonzero(day_answers)
+    latencies = history.latencies[history.latencies > 0]
+    current_streak, longest_streak = _streaks(is_correct)
+    return LearningStats(
+        answers = answers,
+        accuracy = float(is_correct.mean()) if answers else 0.0,
+        word_ids = word_ids,
+        word_attempts = word_attempts,
+        word_accuracy = word_correct / np.maximum(word_attempts, 1),
+        latency_percentiles = np.percentile(latencies, LATENCY_PERCENTILES) if len(latencies)
+                              else np.zeros(len(LATENCY_PERCENTILES)),
+        current_streak = current_streak,
+        longest_streak = longest_streak,
+        learning_curve = curve_correct[:curve_length] / curve_attempts[:curve_length],
+        days = days + first_day,
+        daily_accuracy = day_correct[days] / day_answers[days],
+    )
+
+
+def format_stats(stats: LearningStats) -> str:
+    '''
+    Returns text with statistics
+    of learning for results view.
+
+    Parameters:
+    -----------
+        stats: LearningStats
+            statistics, returned by compute_stats
+    '''
+    if not stats.answers:
+        return NO_ANSWERS_TEXT
+    curve = ', '.join('%s: %.0f%%' % (attempt, accuracy * 100)
+                      for attempt, accuracy in enumerate(stats.learning_curve, 1))
+    days = ', '.join('%s: %.0f%%' % (np.datetime64(int(day), 'D'), accuracy * 100)
+                     for day, accuracy in zip(stats.days[-SHOWN_DAYS:], stats.daily_accuracy[-SHOWN_DAYS:]))
+    return STATS_TEXT % (stats.answers, stats.accuracy * 100,
+                         len(stats.word_ids),
+                         np.count_nonzero(stats.word_accuracy >= MASTERED_ACCURACY),
+                         np.count_nonzero(stats.word_accuracy < HARD_ACCURACY),
+                         *stats.latency_percentiles,
+                         stats.current_streak, stats.longest_streak,
+                         curve, days)
@@ -0,0 +1,171 @@
+'''
+Bidirectional index of accepted answers.
+
+Normalized foreign words are mapped to accepted translations
+and every normalized accepted translation is mapped to foreign words,
+so several words with the same foreign word or the same translation
+accept answers of each other, and grading in either direction
+is one lookup. Index keeps only normalized texts, words of vocabulary
+aren't copied; texts, that map to one answer, share it with the answer itself.
+'''
+from typing import Dict, Iterable, List, Union
+
+from vocabulary import Word
+from matching import (AnswerMatcher,
+                      AnswerSet,
+                      NormalizedAnswers)
+
+
+def _add_answers(answers_by_key: Dict,
+                 key: str,
+                 answers: NormalizedAnswers) -> None:
+    # several answers of key are collected in mutable set,
+    # which is frozen into AnswerSet on the first lookup
+    current: Union[NormalizedAnswers, set, None] = answers_by_key.get(key)
+    if current is None or current == answers:
+        answers_by_key[key] = answers
+        return
+    if isinstance(current, str):
+        current = {current}
+    elif not isinstance(current, set):
+        current = set(current)
+    if isinstance(answers, str):
+        current.add(answers)
+    else:
+        current.update(answers)
+    answers_by_key[key] = current
+
+
+def _get_answers(answers_by_key: Dict,
+                 key: str) -> NormalizedAnswers:
+    answers = answers_by_key[key]
+    if isinstance(answers, set):
+        answers = AnswerSet(answers)
+        answers_by_key[key] = answers
+    return answers
+
+
+class AnswerIndex:
+    '''
+    Class, that represents
+    index of accepted answers for questions in both directions.
+
+    Attributes:
+    -----------
+        matcher: AnswerMatcher
+            matcher, which rules are used for normalization of foreign words
+
+        foreign_keys: list
+            normalized foreign words by index of word in vocabulary
+
+    Methods:
+    --------
+        add_words(words, normalized_answers) -> None:
+            adds words of vocabulary to index.
+
+        forward_answers(word_index) -> NormalizedAnswers:
+            returns accepted translations of foreign word of word.
+
+        reverse_answers(normalized_answers) -> NormalizedAnswers:
+            returns accepted foreign words for translation.
+
+        update_word(word_index, word, normalized_answers) -> None:
+            adds changed translation of word to index.
+    '''
+    def __init__(self, matcher: AnswerMatcher) -> None:
+        self.matcher = matcher
+        self.foreign_keys: List[str] = []
+        self._translations: Dict[str, NormalizedAnswers] = {}
+        self._foreign_words: Dict[str, NormalizedAnswers] = {}
+
+
+    def add_words(self, words: Iterable[Word],
+                        normalized_answers: Iterable[NormalizedAnswers]) -> None:
+        '''
+        Adds words of vocabulary to index;
+        words are expected in order of vocabulary.
+
+        Parameters:
+        -----------
+            words: Iterable[Word]
+                words of vocabulary
+
+            normalized_answers: Iterable[NormalizedAnswers]
+                accepted answers of words, normalized by matcher
+        '''
+        normalize = self.matcher.normalize
+        for word, answers in zip(words, normalized_answers):
+            foreign_key = normalize(word.foreign_word)
+            self.foreign_keys.append(foreign_key)
+            self._add(foreign_key, answers)
+
+
+    def _add(self, foreign_key: str,
+                   answers: NormalizedAnswers) -> None:
+        _add_answers(self._translations, foreign_key, answers)
+        if isinstance(answers, str):
+            _add_answers(self._foreign_words, answers, foreign_key)
+        else:
+            for answer in answers:
+                _add_answers(self._foreign_words, answer, foreign_key)
+
+
+    def update_word(self, word_index: int,
+                          word: Word,
+                          normalized_answers: NormalizedAnswers) -> None:
+        '''
+        Adds changed translation of word
+        to index. Answers are shared by several words, so previous translation
+        isn't removed and stays accepted, until index is built again.
+
+        Parameters:
+        -----------
+            word_index: int
+                index of word in vocabulary
+
+            word: Word
+                word with changed translation
+
+            normalized_answers: NormalizedAnswers
+                accepted answers of changed translation, normalized by matcher
+        '''
+        foreign_key = self.matcher.normalize(word.foreign_word)
+        self.foreign_keys[word_index] = foreign_key
+        self._add(foreign_key, normalized_answers)
+
+
+    def forward_answers(self, word_index: int) -> NormalizedAnswers:
+        '''
+        Returns accepted translations
+        of foreign word of word, including translations of other words
+        with the same foreign word.
+
+        Parameters:
+        -----------
+            word_index: int
+                index of word in vocabulary
+        '''
+        return _get_answers(self._translations, self.foreign_keys[word_index])
+
+
+    def reverse_answers(self, normalized_answers: NormalizedAnswers) -> NormalizedAnswers:
+        '''
+        Returns accepted foreign words
+        for translation: foreign words of all words,
+        that have any of its answers.
+
+        Parameters:
+        -----------
+            normalized_answers: NormalizedAnswers
+                accepted answers of asked word, normalized by matcher
+        '''
+        if isinstance(normalized_answers, str):
+            return _get_answers(self._foreign_words, normalized_answers)
+        foreign_words = set()
+        for answer in normalized_answers:
+            answers = _get_answers(self._foreign_words, answer)
+            if isinstance(answers, str):
+                foreign_words.add(answers)
+            else:
+                foreign_words.update(answers)
+        return AnswerSet(foreign_words)
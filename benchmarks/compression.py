@@ -0,0 +1,128 @@
+'''
+Compares loading of plain and compressed vocabulary json.
+
+Synthetic vocabulary is compressed by every stdlib codec, every case is run
+in new interpreter, which streams all words of vocabulary through the parser;
+load time and peak resident memory of the process are measured,
+growth of memory shows, that compressed file isn't inflated whole.
+Peak memory is read from /proc on Linux and by resource module on other POSIX systems.
+
+Usage:
+    python -m benchmarks.compression [--words 100000 1000000] [--runs 3]
+'''
+import os
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+from typing import Dict, List
+
+from benchmarks.synthetic import write_vocabulary
+
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CODECS = ('json', 'gz', 'xz', 'bz2')
+PROBE = '''
+import sys, time, json
+sys.path.insert(0, %(repository)r)
+from vocabulary import load_words
+
+def peak_rss():
+    # high water mark of /proc is reset by exec, ru_maxrss keeps peak of forked parent
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    import resource
+    # ru_maxrss is counted in bytes on macOS and in kilobytes elsewhere
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+
+baseline = peak_rss()
+start = time.perf_counter()
+words = sum(1 for _ in load_words(%(path)r))
+elapsed = time.perf_counter() - start
+print(json.dumps({'words': words, 'load_ms': elapsed * 1000, 'baseline': baseline, 'peak': peak_rss()}))
+'''
+
+
+def compress(path: str,
+             codec: str) -> str:
+    '''
+    Writes compressed copy of vocabulary json,
+    returns its path; plain json is returned as it is.
+
+    Parameters:
+    -----------
+        path: str
+            path to vocabulary json
+
+        codec: str
+            one of CODECS
+    '''
+    match codec:
+        case 'json':
+            return path
+        case 'gz':
+            import gzip
+            open_compressed = gzip.open
+        case 'xz':
+            import lzma
+            open_compressed = lzma.open
+        case _:
+            import bz2
+            open_compressed = bz2.open
+    compressed_path = '%s.%s' % (path, codec)
+    with open(path, 'rb') as source, open_compressed(compressed_path, 'wb') as target:
+        shutil.copyfileobj(source, target, 1024 * 1024)
+    return compressed_path
+
+
+def run_once(path: str) -> Dict:
+    '''
+    Streams all words of vocabulary in new interpreter,
+    returns number of words, load time in milliseconds
+    and resident memory in bytes before loading and at its peak.
+
+    Parameters:
+    -----------
+        path: str
+            path to plain or compressed vocabulary json
+    '''
+    process = subprocess.run([sys.executable, '-c', PROBE % {'repository': REPOSITORY, 'path': path}],
+                             capture_output = True, text = True, check = True)
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def main(arguments: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument('--words', type = int, nargs = '+', default = [100000, 1000000])
+    parser.add_argument('--runs', type = int, default = 3)
+    options = parser.parse_args(arguments)
+
+    print('%10s  %-6s %14s %12s %16s %16s' % ('words', 'codec', 'file, KiB', 'load, ms',
+                                              'peak RSS, MiB', 'RSS growth, MiB'))
+    with tempfile.TemporaryDirectory() as directory:
+        for number_of_words in options.words:
+            json_path = write_vocabulary(os.path.join(directory, 'vocabulary_pl.json'), number_of_words)
+            for codec in CODECS:
+                path = compress(json_path, codec)
+                runs = [run_once(path) for _ in range(options.runs)]
+                assert all(run['words'] == number_of_words for run in runs)
+                peak = statistics.median(run['peak'] for run in runs)
+                growth = statistics.median(run['peak'] - run['baseline'] for run in runs)
+                print('%10s  %-6s %14.1f %12.1f %16.1f %16.1f' % (number_of_words, codec,
+                                                                  os.path.getsize(path) / 1024,
+                                                                  statistics.median(run['load_ms'] for run in runs),
+                                                                  peak / 1024 ** 2, growth / 1024 ** 2))
+                if path != json_path:
+                    os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+'''
+Memory benchmark of loaded vocabulary.
+
+Synthetic vocabulary is loaded under tracemalloc three times: into list of words,
+as vocabulary was kept before, into compact vocabulary alone, and by quiz engine,
+which is opened and loads whole json, as terminal mode does. Memory, that stays
+allocated after loading, is reported per word together with peak of loading.
+Prints json report and exits with code 1, if quiz engine takes more bytes per word
+than budget; cache, spaced repetition and journal are disabled, so only vocabulary,
+quiz session and data of matching of answers are counted.
+
+Usage:
+    python -m benchmarks.memory [--words 1000000] [--budget-bytes 64] [--direction forward]
+'''
+import os
+import sys
+import json
+import argparse
+import tempfile
+import tracemalloc
+from itertools import islice
+from typing import Callable, Dict, List
+
+from benchmarks.synthetic import write_vocabulary
+from compact import CompactVocabulary
+from vocabulary import load_words
+
+
+BATCH_SIZE = 2000
+
+
+def load_list(path: str) -> List:
+    return list(load_words(path))
+
+
+def load_compact(path: str) -> CompactVocabulary:
+    vocabulary = CompactVocabulary()
+    words = load_words(path)
+    while batch := list(islice(words, BATCH_SIZE)):
+        vocabulary.extend(batch)
+    return vocabulary
+
+
+def engine_loader(direction: str) -> Callable:
+    '''
+    Returns function, that opens quiz engine
+    on vocabulary json in its directory and loads all words.
+
+    Parameters:
+    -----------
+        direction: str
+            direction of quiz session
+    '''
+    from cli import parse_arguments
+    from engine import QuizEngine
+
+    def load_engine(path: str) -> QuizEngine:
+        working_directory = os.getcwd()
+        os.chdir(os.path.dirname(path))
+        try:
+            engine = QuizEngine(parse_arguments(['--no-cache', '--no-schedule', '--no-journal',
+                                                 '--direction', direction]))
+            engine.open()
+            engine.load_all()
+        finally:
+            os.chdir(working_directory)
+        return engine
+
+    return load_engine
+
+
+def measure(load: Callable,
+            path: str,
+            number_of_words: int) -> Dict:
+    '''
+    Loads vocabulary under tracemalloc,
+    returns memory, that loaded vocabulary takes, and peak of loading
+    in bytes per word.
+
+    Parameters:
+    -----------
+        load: Callable
+            function, that returns vocabulary or quiz engine loaded from passed path
+
+        path: str
+            path to vocabulary json
+
+        number_of_words: int
+            number of words in vocabulary
+    '''
+    tracemalloc.start()
+    baseline, _ = tracemalloc.get_traced_memory()
+    loaded = load(path)
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    vocabulary = getattr(loaded, 'vocabulary', loaded)
+    assert len(vocabulary) == number_of_words
+    return {'bytes_per_word': (current - baseline) / number_of_words,
+            'peak_bytes_per_word': (peak - baseline) / number_of_words}
+
+
+def main(arguments: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument('--words', type = int, default = 1000000)
+    parser.add_argument('--budget-bytes', type = float, default = 64.0,
+                        help = 'max bytes per word, that quiz engine takes after loading')
+    parser.add_argument('--direction', choices = ['forward', 'reverse', 'mixed'], default = 'forward')
+    options = parser.parse_args(arguments)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = write_vocabulary(os.path.join(directory, 'vocabulary_pl.json'), options.words)
+        text_bytes = sum(len(foreign_word.encode('utf-8')) + len(translation.encode('utf-8'))
+                         for foreign_word, translation in load_words(path))
+        words_list = measure(load_list, path, options.words)
+        compact = measure(load_compact, path, options.words)
+        engine = measure(engine_loader(options.direction), path, options.words)
+
+    report = {
+        'words': options.words,
+        'direction': options.direction,
+        'text_bytes_per_word': text_bytes / options.words,
+        'list': words_list,
+        'compact': compact,
+        'engine': engine,
+        'budget_bytes': options.budget_bytes,
+        'within_budget': engine['bytes_per_word'] <= options.budget_bytes,
+    }
+    print(json.dumps(report, indent = 4))
+    if not report['within_budget']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
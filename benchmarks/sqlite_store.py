@@ -0,0 +1,99 @@
+'''
+Compares startup time and memory of SQLite store
+with json loaders.
+
+Usage:
+    python -m benchmarks.sqlite_store [--words 10000 100000 ...]
+'''
+import os
+import json
+import random
+import time
+import argparse
+import tempfile
+import tracemalloc
+from itertools import islice
+from typing import Callable, Tuple
+
+from store import (VocabularyStore,
+                   SqliteVocabulary)
+from vocabulary import load_words
+from benchmarks.synthetic import write_vocabulary
+
+
+FIRST_BATCH_SIZE = 20
+
+
+def measure(function: Callable) -> Tuple[float, int]:
+    '''
+    Calls function, returns time of call in milliseconds
+    and peak of memory allocations in bytes.
+
+    Parameters:
+    -----------
+        function: Callable
+            function without arguments
+    '''
+    tracemalloc.start()
+    start = time.perf_counter()
+    function()
+    elapsed = (time.perf_counter() - start) * 1000
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def load_json(path: str):
+    with open(path, encoding = 'utf-8') as file:
+        words = list(json.load(file).values())[0]
+    return words[0]
+
+
+def stream_first_batch(path: str):
+    return list(islice(load_words(path), FIRST_BATCH_SIZE))
+
+
+def stream_all(path: str):
+    return list(load_words(path))
+
+
+def open_store(database: str):
+    vocabulary = SqliteVocabulary(VocabularyStore(database), 'pl')
+    word = vocabulary[0]
+    vocabulary.store.close()
+    return word
+
+
+def sample_store(database: str):
+    store = VocabularyStore(database)
+    words = store.words_at('pl', store.sample_positions('pl', FIRST_BATCH_SIZE, random.Random(0)))
+    store.close()
+    return words
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument('--words', type = int, nargs = '+', default = [10000, 100000])
+    arguments = parser.parse_args()
+
+    print('%10s  %-34s %12s %14s' % ('words', 'case', 'time, ms', 'peak, KiB'))
+    with tempfile.TemporaryDirectory() as directory:
+        for number_of_words in arguments.words:
+            json_path = write_vocabulary(os.path.join(directory, 'vocabulary_pl.json'), number_of_words)
+            database = os.path.join(directory, 'vocabulary_%s.db' % number_of_words)
+            import_time, _ = measure(lambda: VocabularyStore(database).import_json(json_path))
+            cases = (
+                ('json.load (whole file)', lambda: load_json(json_path)),
+                ('stream json: first question', lambda: stream_first_batch(json_path)),
+                ('stream json: whole vocabulary', lambda: stream_all(json_path)),
+                ('sqlite: open + first question', lambda: open_store(database)),
+                ('sqlite: sample %s questions' % FIRST_BATCH_SIZE, lambda: sample_store(database)),
+            )
+            for name, function in cases:
+                elapsed, peak = measure(function)
+                print('%10s  %-34s %12.1f %14.1f' % (number_of_words, name, elapsed, peak / 1024))
+            print('%10s  %-34s %12.1f' % (number_of_words, 'sqlite: one-off import', import_time))
+
+
+if __name__ == '__main__':
+    main()
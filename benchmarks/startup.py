@@ -0,0 +1,126 @@
+'''
+Startup benchmark of Qt window.
+
+Every run starts new interpreter with "-X importtime" under Qt offscreen platform,
+measures time from start of process until window shell is shown
+and until first question is shown, collects import time of top-level modules.
+Prints json report and exits with code 1, if median time to first question
+exceeds budget.
+
+Usage:
+    python -m benchmarks.startup [--runs 5] [--budget-ms 1000] [--words 1000]
+'''
+import os
+import re
+import sys
+import json
+import time
+import argparse
+import tempfile
+import statistics
+import subprocess
+from collections import defaultdict
+from typing import Dict, List
+
+from benchmarks.synthetic import write_vocabulary
+
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PROBE = '''
+import sys, time, json
+sys.path.insert(0, %(repository)r)
+from PySide6 import QtWidgets
+import main
+
+marks = {}
+app = QtWidgets.QApplication()
+window = main.MainWindow(main.parse_arguments(['--no-cache', '--no-schedule', '--no-journal']))
+
+def on_content_built():
+    marks['first_question'] = time.time()
+    app.quit()
+
+window.content_built.connect(on_content_built)
+window.start()
+marks['shell_shown'] = time.time()
+app.exec()
+print(json.dumps(marks))
+'''
+IMPORT_TIME_LINE = re.compile(r'import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+def parse_import_times(stderr: str) -> Dict[str, int]:
+    '''
+    Returns cumulative import time in microseconds
+    for every top-level module from "-X importtime" output.
+
+    Parameters:
+    -----------
+        stderr: str
+            standard error of interpreter
+    '''
+    times = {}
+    for match in IMPORT_TIME_LINE.finditer(stderr):
+        if len(match.group(3)) == 1:
+            times[match.group(4)] = int(match.group(2))
+    return times
+
+
+def run_once(directory: str) -> Dict:
+    '''
+    Starts window in new interpreter,
+    returns times in milliseconds and import times of top-level modules.
+
+    Parameters:
+    -----------
+        directory: str
+            directory with vocabulary json, it is used as working directory
+    '''
+    environment = dict(os.environ, QT_QPA_PLATFORM = 'offscreen')
+    start = time.time()
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', PROBE % {'repository': REPOSITORY}],
+                             cwd = directory, env = environment,
+                             capture_output = True, text = True, check = True)
+    marks = json.loads(process.stdout.strip().splitlines()[-1])
+    return {'shell_shown_ms': (marks['shell_shown'] - start) * 1000,
+            'first_question_ms': (marks['first_question'] - start) * 1000,
+            'imports_us': parse_import_times(process.stderr)}
+
+
+def main(arguments: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument('--runs', type = int, default = 5)
+    parser.add_argument('--words', type = int, default = 1000)
+    parser.add_argument('--budget-ms', type = float, default = 1000.0,
+                        help = 'max median time from start of process to first question')
+    parser.add_argument('--top', type = int, default = 10,
+                        help = 'number of the slowest top-level imports in report')
+    options = parser.parse_args(arguments)
+
+    with tempfile.TemporaryDirectory() as directory:
+        write_vocabulary(os.path.join(directory, 'vocabulary_pl.json'), options.words)
+        runs = [run_once(directory) for _ in range(options.runs)]
+
+    imports = defaultdict(list)
+    for run in runs:
+        for module, microseconds in run['imports_us'].items():
+            imports[module].append(microseconds)
+    slowest = sorted(((statistics.median(values) / 1000, module) for module, values in imports.items()),
+                     reverse = True)[:options.top]
+    first_question_ms = statistics.median(run['first_question_ms'] for run in runs)
+    report = {
+        'runs': options.runs,
+        'words': options.words,
+        'shell_shown_ms': statistics.median(run['shell_shown_ms'] for run in runs),
+        'first_question_ms': first_question_ms,
+        'budget_ms': options.budget_ms,
+        'within_budget': first_question_ms <= options.budget_ms,
+        'slowest_imports_ms': {module: milliseconds for milliseconds, module in slowest},
+    }
+    print(json.dumps(report, indent = 4))
+    if not report['within_budget']:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,228 @@
+'''
+Benchmark suite of Qt window at scale.
+
+For every size synthetic vocabulary is generated and window is run in new
+interpreter under Qt offscreen platform, which measures:
+time from MainWindow.run until first question is shown and until whole
+vocabulary is loaded, latency of buttons "Next", "Back" and "Ok" clicked
+through callbacks of Callbacker, time of showing results and peak resident memory.
+Latency of button includes processing of events, that click posts.
+Report is printed as json and can be written to file, so reports
+of different revisions can be compared.
+
+Usage:
+    python -m benchmarks.suite [--words 100 1000 10000 100000 1000000] [--steps 200] [--runs 1] [--output report.json]
+'''
+import os
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import statistics
+import subprocess
+from typing import Dict, List, Optional
+
+from benchmarks.synthetic import (random_text,
+                                  write_vocabulary)
+
+
+REPOSITORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_WORDS = [100, 1000, 10000, 100000, 1000000]
+WINDOW_ARGUMENTS = ['--no-cache', '--no-schedule', '--no-journal', '--no-reload']
+
+
+def peak_rss() -> int:
+    '''
+    Returns peak resident memory
+    of current process in bytes.
+
+    Parameters:
+    -----------
+        Doesn't have
+    '''
+    # high water mark of /proc is reset by exec, ru_maxrss keeps peak of forked parent
+    try:
+        with open('/proc/self/status') as status:
+            for line in status:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    import resource
+    # ru_maxrss is counted in bytes on macOS and in kilobytes elsewhere
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+
+
+def summarize(name: str,
+              latencies: List[float]) -> Dict[str, float]:
+    '''
+    Returns median, 95th percentile and max
+    of latencies in milliseconds.
+
+    Parameters:
+    -----------
+        name: str
+            prefix of returned keys
+
+        latencies: List[float]
+            latencies in seconds
+    '''
+    if not latencies:
+        return {}
+    latencies = sorted(latency * 1000 for latency in latencies)
+    return {name + '_median_ms': statistics.median(latencies),
+            name + '_p95_ms': latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))],
+            name + '_max_ms': latencies[-1]}
+
+
+def probe(steps: int) -> Dict:
+    '''
+    Runs window on vocabulary json in working directory,
+    returns its measurements. It is run in new interpreter by run_once.
+
+    Parameters:
+    -----------
+        steps: int
+            number of clicks of every button
+    '''
+    import random
+    from PySide6 import QtWidgets
+    import main
+
+    app = QtWidgets.QApplication([])
+    baseline = peak_rss()
+    start = time.perf_counter()
+    window = main.MainWindow(main.parse_arguments(WINDOW_ARGUMENTS))
+    marks = {}
+    window.content_built.connect(lambda: marks.setdefault('first_question', time.perf_counter()))
+    window.run()
+    while 'first_question' not in marks:
+        app.processEvents()
+    while window.engine.is_loading:
+        app.processEvents()
+    window.thread_pool.waitForDone()
+    app.processEvents()
+    loaded = time.perf_counter()
+
+    frame = window.question_frame
+    engine = window.engine
+    generator = random.Random(0)
+
+    def click(button) -> float:
+        click_start = time.perf_counter()
+        button.click()
+        app.processEvents()
+        return time.perf_counter() - click_start
+
+    ok, next_, back = [], [], []
+    steps = min(steps, len(engine.session) - 1)
+    for _ in range(steps):
+        # about half of answers are wrong, so both branches of grading are measured
+        answer = engine.answer(frame.current_frame_index)
+        frame.input_line.setText(answer if generator.random() < 0.5 else random_text(generator))
+        ok.append(click(frame.button_ok))
+        next_.append(click(frame.button_next))
+    for _ in range(steps):
+        back.append(click(frame.button_back))
+    results = click(frame.button_results)
+    peak = peak_rss()
+    window.close()
+
+    return {'words': len(engine.vocabulary),
+            'questions': len(engine.session),
+            'correct_answers': engine.get_number_of_correct_answers(),
+            'first_question_ms': (marks['first_question'] - start) * 1000,
+            'loaded_ms': (loaded - start) * 1000,
+            **summarize('next', next_),
+            **summarize('back', back),
+            **summarize('ok', ok),
+            'results_ms': results * 1000,
+            'peak_rss_mib': peak / 1024 ** 2,
+            'rss_growth_mib': (peak - baseline) / 1024 ** 2}
+
+
+def run_once(directory: str,
+             steps: int) -> Dict:
+    '''
+    Runs probe in new interpreter
+    with Qt offscreen platform and empty data directories,
+    returns its measurements.
+
+    Parameters:
+    -----------
+        directory: str
+            directory with vocabulary json, it is used as working directory
+
+        steps: int
+            number of clicks of every button
+    '''
+    with tempfile.TemporaryDirectory() as home:
+        environment = dict(os.environ,
+                           QT_QPA_PLATFORM = 'offscreen',
+                           PYTHONPATH = os.pathsep.join(filter(None, [REPOSITORY, os.environ.get('PYTHONPATH')])),
+                           XDG_DATA_HOME = os.path.join(home, 'data'),
+                           XDG_CACHE_HOME = os.path.join(home, 'cache'),
+                           XDG_RUNTIME_DIR = home)
+        process = subprocess.run([sys.executable, '-m', 'benchmarks.suite', '--probe', '--steps', str(steps)],
+                                 cwd = directory, env = environment,
+                                 capture_output = True, text = True, check = True)
+    return json.loads(process.stdout.strip().splitlines()[-1])
+
+
+def get_revision() -> Optional[str]:
+    '''
+    Returns git revision of repository,
+    None if it isn't known.
+
+    Parameters:
+    -----------
+        Doesn't have
+    '''
+    try:
+        process = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd = REPOSITORY,
+                                 capture_output = True, text = True, check = True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return process.stdout.strip()
+
+
+def main(arguments: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description = __doc__)
+    parser.add_argument('--words', type = int, nargs = '+', default = DEFAULT_WORDS)
+    parser.add_argument('--steps', type = int, default = 200,
+                        help = 'number of clicks of every button')
+    parser.add_argument('--runs', type = int, default = 1,
+                        help = 'number of runs of every size, medians are reported')
+    parser.add_argument('--output', help = 'file, that report is written to')
+    parser.add_argument('--probe', action = 'store_true', help = argparse.SUPPRESS)
+    options = parser.parse_args(arguments)
+
+    if options.probe:
+        print(json.dumps(probe(options.steps)))
+        return
+
+    sizes = []
+    with tempfile.TemporaryDirectory() as directory:
+        for number_of_words in options.words:
+            write_vocabulary(os.path.join(directory, 'vocabulary_pl.json'), number_of_words)
+            runs = [run_once(directory, options.steps) for _ in range(options.runs)]
+            sizes.append({key: statistics.median(run[key] for run in runs) for key in runs[0]})
+
+    report = {
+        'revision': get_revision(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'steps': options.steps,
+        'runs': options.runs,
+        'sizes': sizes,
+    }
+    print(json.dumps(report, indent = 4))
+    if options.output:
+        with open(options.output, 'w') as file:
+            json.dump(report, file, indent = 4)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,64 @@
+'''
+Generator of synthetic vocabularies for benchmarks.
+'''
+import json
+import random
+import string
+from typing import Optional
+
+
+def random_text(generator: random.Random,
+                min_length: int = 3,
+                max_length: int = 12) -> str:
+    '''
+    Returns random lowercase word.
+
+    Parameters:
+    -----------
+        generator: random.Random
+            source of randomness
+
+        min_length: int
+            min number of letters
+
+        max_length: int
+            max number of letters
+    '''
+    return ''.join(generator.choices(string.ascii_lowercase + 'ąćęłńóśźż',
+                                     k = generator.randint(min_length, max_length)))
+
+
+def write_vocabulary(path: str,
+                     number_of_words: int,
+                     language: str = 'pl',
+                     seed: Optional[int] = 0) -> str:
+    '''
+    Writes vocabulary json with passed number of random words
+    in the same format as "vocabulary_pl.json", returns its path.
+    Words are written one by one, so big vocabularies aren't kept in memory.
+
+    Parameters:
+    -----------
+        path: str
+            path to vocabulary json
+
+        number_of_words: int
+            number of words in vocabulary
+
+        language: str
+            language abbreviature for name of words array
+
+        seed: int
+            seed for random words, same seed gives same vocabulary
+    '''
+    generator = random.Random(seed)
+    with open(path, 'w', encoding = 'utf-8') as file:
+        file.write('{\n    "words_%s": [' % language)
+        for index in range(number_of_words):
+            if index:
+                file.write(',')
+            file.write('\n        ')
+            json.dump({'foreign_word': '%s %s' % (random_text(generator), index),
+                       'translation': random_text(generator)}, file, ensure_ascii = False)
+        file.write('\n    ]\n}\n')
+    return path
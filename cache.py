@@ -0,0 +1,298 @@
+'''
+Persistent cache of parsed vocabularies.
+
+Every vocabulary json has its own cache file, named by hash of its absolute path.
+Cache file contains header with size, mtime and content hash of json,
+and columns of compact vocabulary serialized with marshal: they are raw buffers,
+so they are loaded by copying of memory, much faster than json is parsed.
+Cache files of older format are treated as misses and rewritten.
+Size, mtime and inode of json are taken before it is parsed, words aren't cached,
+if json was changed while it was parsed.
+'''
+import os
+import json
+import time
+import struct
+import marshal
+import hashlib
+import logging
+from typing import Dict, Optional, Sequence, Tuple
+
+from vocabulary import Word
+from compact import CompactVocabulary
+
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+HASH_CHUNK_SIZE = 1024 * 1024
+HEADER_SIZE = struct.Struct('<I')
+CACHE_SUFFIX = '.vocache'
+CACHE_FORMAT = 2
+STATS_FILE = 'stats.json'
+
+
+def get_default_cache_directory() -> str:
+    '''
+    Returns directory for cache
+    according to XDG base directory specification.
+
+    Parameters:
+    -----------
+        Doesn't have
+    '''
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'voctester')
+
+
+def hash_file(path: str) -> str:
+    '''
+    Returns hash of file content.
+
+    Parameters:
+    -----------
+        path: str
+            path to file
+    '''
+    digest = hashlib.blake2b(digest_size = 16)
+    with open(path, 'rb') as file:
+        while chunk := file.read(HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def source_stamp(path: str) -> Optional[Tuple[int, int, int]]:
+    '''
+    Returns size, mtime and inode of file,
+    that change, when file is saved or replaced;
+    returns None, if file doesn't exist.
+
+    Parameters:
+    -----------
+        path: str
+            path to file
+    '''
+    try:
+        source = os.stat(path)
+    except OSError:
+        return None
+    return source.st_size, source.st_mtime_ns, source.st_ino
+
+
+class VocabularyCache:
+    '''
+    Class, that represents
+    directory with parsed vocabularies.
+
+    Cache file is valid, while size and mtime of vocabulary json are the same,
+    or, if they changed, while content hash of json is the same.
+    When total size of cache files exceeds max_bytes, least recently used
+    files are removed.
+
+    Attributes:
+    -----------
+        directory: str
+            directory with cache files
+
+        max_bytes: int
+            max total size of cache files
+
+        hits: int
+            number of hits in current run
+
+        misses: int
+            number of misses in current run
+
+        saved_seconds: float
+            time, that was saved by hits in current run
+
+    Methods:
+    --------
+        load(path) -> Optional[CompactVocabulary]:
+            returns words of vocabulary json from cache, or None, if cache is invalid.
+
+        store(path, words, parse_seconds, stamp) -> None:
+            saves words of vocabulary json to cache.
+
+        load_stats() -> Dict:
+            returns total number of hits, misses and saved time for all runs.
+
+        report() -> str:
+            returns text with hits, misses and saved time.
+    '''
+    def __init__(self, directory: Optional[str] = None,
+                       max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = directory or get_default_cache_directory()
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.saved_seconds = 0.0
+
+
+    def _cache_path(self, path: str) -> str:
+        name = hashlib.blake2b(os.path.abspath(path).encode('utf-8'), digest_size = 16).hexdigest()
+        return os.path.join(self.directory, name + CACHE_SUFFIX)
+
+
+    def load(self, path: str) -> Optional[CompactVocabulary]:
+        '''
+        Returns words of vocabulary json from cache,
+        or None, if there is no valid cache for it.
+
+        Parameters:
+        -----------
+            path: str
+                path to vocabulary json
+        '''
+        start = time.perf_counter()
+        cache_path = self._cache_path(path)
+        try:
+            source = os.stat(path)
+            with open(cache_path, 'rb') as file:
+                header_size, = HEADER_SIZE.unpack(file.read(HEADER_SIZE.size))
+                header: Dict = json.loads(file.read(header_size))
+                if header.get('format') != CACHE_FORMAT or header['size'] != source.st_size:
+                    return self._miss()
+                if header['mtime_ns'] != source.st_mtime_ns:
+                    if header['hash'] != hash_file(path):
+                        return self._miss()
+                    header['mtime_ns'] = source.st_mtime_ns
+                    self._write(cache_path, header, file.read())
+                    file.seek(HEADER_SIZE.size + header_size)
+                words = CompactVocabulary.from_bytes(*marshal.loads(file.read()))
+        except (OSError, ValueError, EOFError, KeyError, TypeError, struct.error):
+            return self._miss()
+
+        os.utime(cache_path)
+        self._record(hits = 1,
+                     saved_seconds = max(header['parse_seconds'] - (time.perf_counter() - start), 0.0))
+        return words
+
+
+    def store(self, path: str,
+                    words: Sequence[Word],
+                    parse_seconds: float,
+                    stamp: Tuple[int, int, int]) -> None:
+        '''
+        Saves words of vocabulary json to cache,
+        removes least recently used cache files, if cache is too big.
+        Words aren't saved, if json was changed since stamp was taken,
+        as they could be parsed from its older version.
+
+        Parameters:
+        -----------
+            path: str
+                path to vocabulary json
+
+            words: Sequence[Word]
+                parsed words of vocabulary
+
+            parse_seconds: float
+                time, that parsing of json took
+
+            stamp: Tuple[int, int, int]
+                size, mtime and inode of json, returned by source_stamp before parsing
+        '''
+        try:
+            # hash is taken before stamp is compared, so hashed content is the parsed one
+            content_hash = hash_file(path)
+            if source_stamp(path) != stamp:
+                logging.info("Vocabulary %s was changed while it was parsed, it isn't cached.", path)
+                return
+            size, mtime_ns, _ = stamp
+            header = {'format': CACHE_FORMAT,
+                      'path': os.path.abspath(path),
+                      'size': size,
+                      'mtime_ns': mtime_ns,
+                      'hash': content_hash,
+                      'parse_seconds': parse_seconds}
+            if not isinstance(words, CompactVocabulary):
+                words = CompactVocabulary(words)
+            payload = marshal.dumps(words.to_bytes())
+            os.makedirs(self.directory, exist_ok = True)
+            self._write(self._cache_path(path), header, payload)
+            self._evict()
+        except OSError:
+            logging.exception("Vocabulary cache can't be saved.")
+
+
+    def _write(self, cache_path: str,
+                     header: Dict,
+                     payload: bytes) -> None:
+        encoded_header = json.dumps(header).encode('utf-8')
+        temporary_path = cache_path + '.tmp'
+        with open(temporary_path, 'wb') as file:
+            file.write(HEADER_SIZE.pack(len(encoded_header)))
+            file.write(encoded_header)
+            file.write(payload)
+        os.replace(temporary_path, cache_path)
+
+
+    def _evict(self) -> None:
+        entries = []
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith(CACHE_SUFFIX):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            os.remove(path)
+            total -= size
+
+
+    def _miss(self) -> None:
+        self._record(misses = 1)
+
+
+    def _record(self, hits: int = 0,
+                      misses: int = 0,
+                      saved_seconds: float = 0.0) -> None:
+        self.hits += hits
+        self.misses += misses
+        self.saved_seconds += saved_seconds
+        stats = self.load_stats()
+        stats['hits'] += hits
+        stats['misses'] += misses
+        stats['saved_seconds'] += saved_seconds
+        try:
+            os.makedirs(self.directory, exist_ok = True)
+            with open(self._stats_path(), 'w') as file:
+                json.dump(stats, file)
+        except OSError:
+            pass
+
+
+    def _stats_path(self) -> str:
+        return os.path.join(self.directory, STATS_FILE)
+
+
+    def load_stats(self) -> Dict:
+        '''
+        Returns total number of hits, misses
+        and saved time for all runs.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        try:
+            with open(self._stats_path()) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {'hits': 0, 'misses': 0, 'saved_seconds': 0.0}
+
+
+    def report(self) -> str:
+        '''
+        Returns text with hits, misses and saved time
+        of current run and of all runs.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        total = self.load_stats()
+        return ('Vocabulary cache: %s hits, %s misses, %.1f ms saved '
+                '(all runs: %s hits, %s misses, %.1f ms saved)' % (
+                    self.hits, self.misses, self.saved_seconds * 1000,
+                    total['hits'], total['misses'], total['saved_seconds'] * 1000))
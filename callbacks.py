@@ -1,3 +1,6 @@
+from engine import RESPONSE_TEXTS
+
+
 class Callbacker:
     '''
     Class, that implements initialization of
@@ -10,42 +13,31 @@ class Callbacker:
         represents link to main window
     frame: QuestionFrame
         represents link to parent frame
-    is_first: bool
-        represents boolean value, if parent frame is first question
-    is_last: bool
-        represents boolean value, if parent frame is last question
+    is_results_frame: bool
+        represents boolean value, if parent frame is results frame
 
 
     Methods:
 
-    init_variables(main_window, frame, answer, is_first, is_last) -> None:
+    init_variables(main_window, frame, is_results_frame) -> None:
         Constructs all the necessary attributes for the person object.
 
     init_callbacks() -> None:
         Inits all the necessary callbacks for buttons of parent frame
-        depending on the information if parent frame is first, last or results frame.
+        depending on the information if parent frame is question or results frame.
 
     
     '''
     def __init__(self, main_window,
                        frame,
-                       answer: str = None,
-                       is_first: bool = False,
-                       is_last: bool = False,
                        is_results_frame = False) -> None:
         self.init_variables(main_window = main_window,
                             frame = frame,
-                            answer = answer,
-                            is_first = is_first,
-                            is_last = is_last,
                             is_results_frame = is_results_frame)
     
 
     def init_variables(self, main_window,
                              frame,
-                             answer,
-                             is_first,
-                             is_last,
                              is_results_frame) -> None:
         '''
         Constructs all the necessary attributes for the person object.
@@ -58,24 +50,18 @@ class Callbacker:
             frame: QuestionFrame
                 represents link to parent frame
 
-            is_first: bool
-                represents boolean value, if parent frame is first question
-                
-            is_last: bool
-                represents boolean value, if parent frame is last question
+            is_results_frame: bool
+                represents boolean value, if parent frame is results frame
         '''
         self.main_window = main_window
         self.frame = frame
-        self.answer = answer
-        self.is_first = is_first
-        self.is_last = is_last
         self.is_results_frame = is_results_frame
 
 
     def init_callbacks(self) -> None:
         '''
         Inits all the necessary callbacks for buttons of parent frame
-        depending on the information if parent frame is first, last or results frame.
+        depending on the information if parent frame is question or results frame.
 
         Parameters:
         -----------
@@ -84,42 +70,33 @@ class Callbacker:
 
         match self.is_results_frame:
             case False:
-
-                match self.is_first, self.is_last:
-                    case True, False:
-                        self.set_callback_for_button_ok()
-                        self.set_callback_for_button_next()
-                    
-                    case False, True:
-                        self.set_callback_for_button_back()
-                        self.set_callback_for_button_ok()
-                        self.set_callback_for_button_results()
-                    
-                    case _:
-                        self.set_callback_for_button_back()
-                        self.set_callback_for_button_ok()
-                        self.set_callback_for_button_next()
+                self.set_callback_for_button_back()
+                self.set_callback_for_button_ok()
+                self.set_callback_for_button_next()
+                self.set_callback_for_button_results()
+                self.set_callback_for_navigator()
+                if self.main_window.options.live:
+                    self.set_callback_for_input_line()
             
             case True:
                 self.set_callback_for_button_close()
                 self.set_callback_for_button_back()
+                self.set_callback_for_button_stats()
+                self.set_callback_for_review_filter()
         
 
     def set_callback_for_button_next(self) -> None:
         '''
         Inits callback for button "Next"
         Meaning of callback:
-            hide current frame, show next frame.
+            bind next question to current frame.
 
         Parameters:
         -----------
             Doesn't have
         '''
         self.frame.button_next.clicked.connect(
-            lambda: (
-                    self.frame.hide(),
-                    self.main_window.layout.itemAt(self.frame.current_frame_index + 1).widget().show(),
-            )
+            lambda: self.main_window.show_question(self.frame.current_frame_index + 1)
         )
 
 
@@ -127,7 +104,7 @@ class Callbacker:
         '''
         Inits callback for button "Back"
         Meaning of callback:
-            hide current frame, show previous frame.
+            bind previous question to question frame.
 
 
         Parameters:
@@ -135,10 +112,7 @@ class Callbacker:
             Doesn't have
         '''
         self.frame.button_back.clicked.connect(
-            lambda: (
-                    self.frame.hide(),
-                    self.main_window.layout.itemAt(self.frame.current_frame_index - 1).widget().show()
-            )
+            lambda: self.main_window.show_question(self.frame.current_frame_index - 1)
         )
 
 
@@ -163,37 +137,30 @@ class Callbacker:
         '''
         Returns response label text depending on information if user answer is correct
         or is filled.
-        Inits boolean value for frame class variable: self.frame.is_answer_correct
+        Grading and saving of result is made by quiz engine of main window.
 
         Parameters:
         -----------
             Doesn't have
         '''
-        is_answer_correct = self.is_user_translation_correct(self.frame, self.answer)
-        match is_answer_correct:
-            case True:
-                self.frame.is_answer_correct = True
-                return "Odpowiedź jest poprawna"
-            case False:
-                self.frame.is_answer_correct = False
-                return "Odpowiedź nie jest poprawna"
-            case _:
-                self.frame.is_answer_correct = False
-                return "Pole jest nieuzupełnione"
+        status = self.main_window.engine.check(self.frame.current_frame_index,
+                                               self.frame.input_line.text())
+        return RESPONSE_TEXTS[status]
 
-    
-    def is_user_translation_correct(self, frame,
-                                          answer: str) -> bool:
+
+    def set_callback_for_input_line(self) -> None:
         '''
-        Checks user translation with original word
-        from vocabulary.
+        Inits callback for changing of text in input line
+        Meaning of callback:
+            color input line by typed text, when user stops typing for a moment;
+            every change restarts timer, so fast typing isn't checked on every keystroke.
+
+        Parameters:
+        -----------
+            Doesn't have
         '''
-        user_answer = frame.input_line.text()
-        if user_answer == answer:
-            return True
-        if not user_answer:
-            return None
-        return False
+        self.frame.input_line.textChanged.connect(self.frame.live_timer.start)
+        self.frame.live_timer.timeout.connect(self.frame.update_live_state)
 
 
     def set_callback_for_button_results(self):
@@ -206,32 +173,55 @@ class Callbacker:
         -----------
             Doesn't have
         '''
-        self.frame.button_results.clicked.connect(
-            lambda: (
-                self.frame.hide(),
-                self.main_window.results_frame.results_label.setText(
-                    "Ilość poprawnych odpowiedzi: %s z %s" % (self.get_number_of_correct_answers(),
-                                                              self.main_window.number_of_question_frames)),
-                self.main_window.results_frame.show()
-            )
-        )
+        self.frame.button_results.clicked.connect(self.main_window.show_results)
 
 
-    def set_callback_for_button_close(self):
-        self.frame.button_close.clicked.connect(self.main_window.close)
+    def set_callback_for_navigator(self):
+        '''
+        Inits callbacks for button "Szukaj" and widgets of navigator
+        Meaning of callbacks:
+            show or hide navigator, jump to question with chosen number
+            or with found word, search words while text is typed.
 
-    
-    def get_number_of_correct_answers(self) -> None:
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        navigator = self.main_window.navigator_frame
+        self.frame.button_navigator.toggled.connect(navigator.set_shown)
+        navigator.button_go.clicked.connect(navigator.jump_to_number)
+        navigator.number_box.lineEdit().returnPressed.connect(navigator.jump_to_number)
+        navigator.search_line.textChanged.connect(lambda _: navigator.update_search())
+        navigator.results_list.itemActivated.connect(navigator.jump_to_word)
+        navigator.results_list.itemClicked.connect(navigator.jump_to_word)
+
+
+    def set_callback_for_button_stats(self):
+        '''
+        Inits callback for button "Statystyki"
+        Meaning of callback:
+            show statistics of learning over all recorded answers.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        self.frame.button_stats.clicked.connect(self.frame.show_stats)
+
+
+    def set_callback_for_review_filter(self):
         '''
-        Returns number of correct answers
+        Inits callbacks for filter line and check box of review table
+        Meaning of callbacks:
+            show in review table only questions, that pass filter.
 
         Parameters:
         -----------
             Doesn't have
         '''
-        number_of_correct_answers = 0 
-        for frame_index in range(self.main_window.number_of_question_frames):
-            question_frame = self.main_window.layout.itemAt(frame_index).widget()
-            if question_frame.is_answer_correct:
-                number_of_correct_answers += 1
-        return number_of_correct_answers
+        self.frame.review_filter_line.textChanged.connect(lambda _: self.frame.update_review_filter())
+        self.frame.only_mistakes_box.toggled.connect(lambda _: self.frame.update_review_filter())
+
+
+    def set_callback_for_button_close(self):
+        self.frame.button_close.clicked.connect(self.main_window.close)
@@ -0,0 +1,112 @@
+'''
+Command line runner of quiz.
+
+Asks questions in terminal without Qt, answers are read line by line
+from standard input, so practice runs can be scripted:
+    python cli.py --language pl < answers.txt
+'''
+import sys
+import argparse
+from typing import List
+
+from engine import (QuizEngine,
+                    RESPONSE_TEXTS,
+                    RESULTS_TEXT,
+                    NO_NUMPY_TEXT,
+                    NO_JOURNAL_TEXT)
+from options import add_arguments
+
+
+def parse_arguments(arguments: List[str] = None) -> argparse.Namespace:
+    '''
+    Parses command line options.
+
+    Parameters:
+    -----------
+        arguments: List[str]
+            command line arguments, by default they are taken from sys.argv
+    '''
+    parser = argparse.ArgumentParser(description = 'Vocabulary tester in terminal')
+    add_arguments(parser)
+    parser.add_argument('--quiet', action = 'store_true',
+                        help = 'print only results, useful for scripted runs')
+    parser.add_argument('--stats', action = 'store_true',
+                        help = 'print statistics of learning over journal of answers after results, needs numpy')
+    return parser.parse_args(arguments)
+
+
+def run(engine: QuizEngine,
+        quiet: bool = False) -> None:
+    '''
+    Asks questions of quiz session one by one,
+    until they are over or standard input is closed,
+    prints results.
+
+    Parameters:
+    -----------
+        engine: QuizEngine
+            quiz engine with opened vocabulary
+
+        quiet: bool
+            represents boolean value, if questions and responses mustn't be printed
+    '''
+    position = 0
+    while position < len(engine.session) or engine.is_loading:
+        if position >= len(engine.session):
+            engine.load_words_batch()
+            continue
+        engine.mark_shown(position)
+        if not quiet:
+            print('[%s/%s%s] %s' % (position + 1, len(engine.session),
+                                    '+' if engine.is_loading else '',
+                                    engine.question(position)))
+        user_answer = sys.stdin.readline()
+        if not user_answer:
+            break
+        status = engine.check(position, user_answer.rstrip('\n'))
+        if not quiet:
+            print(RESPONSE_TEXTS[status])
+        position += 1
+    engine.load_all()
+    print(RESULTS_TEXT % (engine.get_number_of_correct_answers(),
+                          len(engine.session)))
+
+
+def print_stats(engine: QuizEngine) -> None:
+    '''
+    Prints statistics of learning
+    over journal of answers.
+
+    Parameters:
+    -----------
+        engine: QuizEngine
+            quiz engine with journal of answers
+    '''
+    if engine.journal is None:
+        print(NO_JOURNAL_TEXT)
+        return
+    try:
+        from analytics import format_stats
+
+        print(format_stats(engine.learning_stats()))
+    except ImportError:
+        print(NO_NUMPY_TEXT)
+
+
+def main() -> None:
+    options = parse_arguments()
+    engine = QuizEngine(options)
+    try:
+        engine.open()
+        run(engine, quiet = options.quiet)
+        if options.stats:
+            print_stats(engine)
+    finally:
+        # answers, that wait in journal and cards, are written also after Ctrl-C
+        engine.close()
+    if options.cache_stats and engine.cache is not None:
+        print(engine.cache.report())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,235 @@
+'''
+Compact in-memory vocabulary.
+
+Words are stored as struct of arrays: every column (foreign words and translations)
+is one utf-8 buffer with array of offsets, so word costs its encoded letters
+and two offsets instead of tuple and two string objects. Words are referred to
+by their integer indexes, texts are decoded only, when word is read.
+Columns are written to cache as raw buffers, so cached vocabulary is loaded
+by copying of memory, without creating of objects for every word.
+'''
+from array import array
+from itertools import accumulate
+from typing import Dict, Iterable, Iterator, Tuple
+
+from vocabulary import Word
+
+
+class TextColumn:
+    '''
+    Class, that represents
+    texts, stored one after another in one utf-8 buffer.
+
+    Attributes:
+    -----------
+        buffer: bytearray
+            utf-8 encoded texts without separators
+
+        offsets: array
+            offset of every text in buffer and offset after the last text
+
+    Methods:
+    --------
+        extend(texts) -> None:
+            adds texts after stored ones.
+
+        to_bytes() -> Tuple[bytes, bytes]:
+            returns buffer and offsets as bytes.
+
+        from_bytes(buffer, offsets) -> TextColumn:
+            returns column from bytes, returned by to_bytes.
+    '''
+    __slots__ = ('buffer', 'offsets')
+
+    def __init__(self) -> None:
+        self.buffer = bytearray()
+        self.offsets = array('Q', [0])
+
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+
+    def __getitem__(self, index: int) -> str:
+        return self.buffer[self.offsets[index]:self.offsets[index + 1]].decode('utf-8')
+
+
+    def __iter__(self) -> Iterator[str]:
+        buffer = self.buffer
+        offsets = self.offsets
+        for index in range(len(offsets) - 1):
+            yield buffer[offsets[index]:offsets[index + 1]].decode('utf-8')
+
+
+    def extend(self, texts: Iterable[str]) -> None:
+        '''
+        Adds texts after stored ones;
+        they are encoded and joined by one call.
+
+        Parameters:
+        -----------
+            texts: Iterable[str]
+                added texts
+        '''
+        encoded = [text.encode('utf-8') for text in texts]
+        self.buffer += b''.join(encoded)
+        ends = accumulate(map(len, encoded), initial = self.offsets[-1])
+        next(ends)
+        self.offsets.extend(ends)
+
+
+    def to_bytes(self) -> Tuple[bytes, bytes]:
+        '''
+        Returns buffer and offsets
+        as bytes in native byte order.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        return bytes(self.buffer), self.offsets.tobytes()
+
+
+    @classmethod
+    def from_bytes(cls, buffer: bytes,
+                        offsets: bytes) -> 'TextColumn':
+        '''
+        Returns column
+        from bytes, returned by to_bytes.
+
+        Parameters:
+        -----------
+            buffer: bytes
+                utf-8 encoded texts
+
+            offsets: bytes
+                offsets of texts in native byte order
+        '''
+        column = cls()
+        column.buffer = bytearray(buffer)
+        column.offsets = array('Q')
+        column.offsets.frombytes(offsets)
+        if len(column.offsets) < 1 or column.offsets[-1] != len(buffer):
+            raise ValueError('offsets of text column mismatch its buffer')
+        return column
+
+
+class CompactVocabulary:
+    '''
+    Class, that represents
+    vocabulary, stored in two text columns.
+    Word, that is replaced, such as after reloading of changed vocabulary,
+    is kept aside, so columns are only appended to.
+
+    Attributes:
+    -----------
+        foreign_words: TextColumn
+            foreign words in order of vocabulary
+
+        translations: TextColumn
+            translations in the same order
+
+    Methods:
+    --------
+        extend(words) -> None:
+            adds words after stored ones.
+
+        to_bytes() -> Tuple[bytes, bytes, bytes, bytes]:
+            returns buffers and offsets of columns.
+
+        from_bytes(*columns) -> CompactVocabulary:
+            returns vocabulary from bytes, returned by to_bytes.
+    '''
+    __slots__ = ('foreign_words', 'translations', '_replaced')
+
+    def __init__(self, words: Iterable[Word] = ()) -> None:
+        self.foreign_words = TextColumn()
+        self.translations = TextColumn()
+        self._replaced: Dict[int, Word] = {}
+        self.extend(words)
+
+
+    def __len__(self) -> int:
+        return len(self.foreign_words)
+
+
+    def __getitem__(self, index: int) -> Word:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('vocabulary index out of range')
+        if self._replaced:
+            word = self._replaced.get(index)
+            if word is not None:
+                return word
+        return Word(self.foreign_words[index], self.translations[index])
+
+
+    def __setitem__(self, index: int,
+                          word: Word) -> None:
+        if not 0 <= index < len(self):
+            raise IndexError('vocabulary index out of range')
+        self._replaced[index] = word
+
+
+    def __iter__(self) -> Iterator[Word]:
+        words = map(Word, self.foreign_words, self.translations)
+        if not self._replaced:
+            return words
+        return (self._replaced.get(index, word) for index, word in enumerate(words))
+
+
+    def extend(self, words: Iterable[Word]) -> None:
+        '''
+        Adds words
+        after stored ones.
+
+        Parameters:
+        -----------
+            words: Iterable[Word]
+                added words
+        '''
+        if not isinstance(words, (list, tuple)):
+            words = list(words)
+        self.foreign_words.extend(word[0] for word in words)
+        self.translations.extend(word[1] for word in words)
+
+
+    def to_bytes(self) -> Tuple[bytes, bytes, bytes, bytes]:
+        '''
+        Returns buffers and offsets of columns,
+        replaced words are written in place of their originals.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        vocabulary = self
+        if self._replaced:
+            vocabulary = CompactVocabulary(self)
+        return (*vocabulary.foreign_words.to_bytes(), *vocabulary.translations.to_bytes())
+
+
+    @classmethod
+    def from_bytes(cls, foreign_buffer: bytes,
+                        foreign_offsets: bytes,
+                        translation_buffer: bytes,
+                        translation_offsets: bytes) -> 'CompactVocabulary':
+        '''
+        Returns vocabulary
+        from bytes, returned by to_bytes.
+
+        Parameters:
+        -----------
+            foreign_buffer, foreign_offsets: bytes
+                column of foreign words
+
+            translation_buffer, translation_offsets: bytes
+                column of translations
+        '''
+        vocabulary = cls()
+        vocabulary.foreign_words = TextColumn.from_bytes(foreign_buffer, foreign_offsets)
+        vocabulary.translations = TextColumn.from_bytes(translation_buffer, translation_offsets)
+        if len(vocabulary.foreign_words) != len(vocabulary.translations):
+            raise ValueError('columns of vocabulary have different lengths')
+        return vocabulary
@@ -0,0 +1,184 @@
+'''
+Compiled binary vocabulary deck.
+
+Layout of deck file (little-endian):
+    header:   magic b"VOCDECK1", number of words (uint64)
+    offsets:  2 * number of words + 1 offsets (uint64) into strings,
+              foreign word and translation of every word go one after another
+    strings:  utf-8 encoded strings without separators
+
+Usage:
+    python deck.py vocabulary_pl.json [vocabulary_pl.deck]
+'''
+import os
+import sys
+import mmap
+import struct
+from array import array
+from typing import Optional, Tuple
+
+from vocabulary import (Word,
+                        get_vocabulary_path,
+                        load_words,
+                        strip_compression_suffix)
+
+
+MAGIC = b'VOCDECK1'
+HEADER = struct.Struct('<8sQ')
+OFFSET_SIZE = 8
+
+
+def get_deck_path(json_path: str) -> str:
+    '''
+    Returns path to compiled deck
+    for passed vocabulary json.
+
+    Parameters:
+    -----------
+        json_path: str
+            path to vocabulary json
+    '''
+    return os.path.splitext(strip_compression_suffix(json_path))[0] + '.deck'
+
+
+def compile_deck(json_path: str,
+                 deck_path: Optional[str] = None) -> str:
+    '''
+    Compiles vocabulary json into binary deck,
+    returns path to deck.
+    Words are streamed from json, so only offsets table is kept in memory.
+
+    Parameters:
+    -----------
+        json_path: str
+            path to vocabulary json
+
+        deck_path: str
+            path to compiled deck, by default it is placed next to json
+    '''
+    deck_path = deck_path or get_deck_path(json_path)
+    strings_path = deck_path + '.strings'
+    offsets = array('Q', [0])
+    with open(strings_path, 'wb') as strings:
+        position = 0
+        for word in load_words(json_path):
+            for text in word:
+                encoded = text.encode('utf-8')
+                strings.write(encoded)
+                position += len(encoded)
+                offsets.append(position)
+
+    if sys.byteorder != 'little':
+        offsets.byteswap()
+    temporary_path = deck_path + '.tmp'
+    with open(temporary_path, 'wb') as deck, open(strings_path, 'rb') as strings:
+        deck.write(HEADER.pack(MAGIC, (len(offsets) - 1) // 2))
+        offsets.tofile(deck)
+        while chunk := strings.read(1024 * 1024):
+            deck.write(chunk)
+    os.remove(strings_path)
+    os.replace(temporary_path, deck_path)
+    return deck_path
+
+
+def open_compiled_deck(language: str) -> Optional['BinaryDeck']:
+    '''
+    Returns compiled deck for passed language,
+    if it exists and isn't older than its vocabulary json.
+    Otherwise returns None.
+
+    Parameters:
+    -----------
+        language: str
+            language abbreviature, such as: (en, pl, ru, ua etc.)
+    '''
+    json_path = get_vocabulary_path(language)
+    deck_path = get_deck_path(json_path)
+    try:
+        deck_mtime = os.path.getmtime(deck_path)
+    except OSError:
+        return None
+    if os.path.exists(json_path) and os.path.getmtime(json_path) > deck_mtime:
+        return None
+    return BinaryDeck(deck_path)
+
+
+class BinaryDeck:
+    '''
+    Class, that represents
+    compiled deck, opened with mmap.
+    Only header is read on opening, every word is decoded
+    from its own slice of file on access.
+
+    Methods:
+    --------
+        raw(index) -> Tuple[memoryview, memoryview]:
+            returns zero-copy slices with utf-8 foreign word and translation.
+
+        close() -> None:
+            closes memory map of deck file.
+    '''
+    def __init__(self, path: str) -> None:
+        with open(path, 'rb') as file:
+            self._mmap = mmap.mmap(file.fileno(), 0, access = mmap.ACCESS_READ)
+        magic, self._length = HEADER.unpack_from(self._mmap)
+        if magic != MAGIC:
+            self._mmap.close()
+            raise ValueError("%s isn't a compiled vocabulary deck." % path)
+
+        self._view = memoryview(self._mmap)
+        offsets_end = HEADER.size + (2 * self._length + 1) * OFFSET_SIZE
+        offsets = self._view[HEADER.size:offsets_end]
+        if sys.byteorder == 'little':
+            self._offsets = offsets.cast('Q')
+        else:
+            self._offsets = array('Q', offsets)
+            self._offsets.byteswap()
+        self._strings = self._view[offsets_end:]
+
+
+    def __len__(self) -> int:
+        return self._length
+
+
+    def raw(self, index: int) -> Tuple[memoryview, memoryview]:
+        '''
+        Returns zero-copy slices of deck file
+        with utf-8 encoded foreign word and translation.
+
+        Parameters:
+        -----------
+            index: int
+                index of word in deck
+        '''
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError('deck index out of range')
+        start, middle, stop = self._offsets[2 * index:2 * index + 3]
+        return self._strings[start:middle], self._strings[middle:stop]
+
+
+    def __getitem__(self, index: int) -> Word:
+        foreign_word, translation = self.raw(index)
+        return Word(str(foreign_word, 'utf-8'), str(translation, 'utf-8'))
+
+
+    def close(self) -> None:
+        '''
+        Closes memory map of deck file.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        for view in (self._offsets, self._strings, self._view):
+            if isinstance(view, memoryview):
+                view.release()
+        self._mmap.close()
+
+
+if __name__ == '__main__':
+    if len(sys.argv) not in (2, 3):
+        sys.exit(__doc__)
+    print(compile_deck(*sys.argv[1:]))
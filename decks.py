@@ -0,0 +1,139 @@
+'''
+Loading of several vocabulary decks at once.
+
+Session can be built from several vocabulary json files of any languages
+or from directories with them. Every deck is parsed in its own process
+of process pool, so decks are parsed in parallel by all cores,
+and parsed words are merged in order of decks. Words, that are in several decks,
+are kept once: dict of words, which are tuples of foreign word and translation,
+is hash index of merged words, built in C.
+Language of merged session is taken from names of decks (vocabulary_<language>.json).
+'''
+import os
+import glob
+from itertools import chain
+from typing import Iterable, List, Optional
+
+from vocabulary import (Word,
+                        COMPRESSION_SUFFIXES,
+                        load_words,
+                        strip_compression_suffix)
+
+
+DECK_PATTERNS = ('vocabulary_*.json', *('vocabulary_*.json' + suffix for suffix in COMPRESSION_SUFFIXES))
+
+
+def find_decks(paths: Iterable[str]) -> List[str]:
+    '''
+    Returns paths to vocabulary json files:
+    passed files and plain or compressed vocabularies in passed directories,
+    sorted by name; every file is returned once.
+    Raises FileNotFoundError, if passed path doesn't exist.
+
+    Parameters:
+    -----------
+        paths: Iterable[str]
+            paths to vocabulary json files or directories with them
+    '''
+    decks = []
+    for path in paths:
+        if os.path.isdir(path):
+            decks.extend(sorted(deck for pattern in DECK_PATTERNS
+                                for deck in glob.glob(os.path.join(path, pattern))))
+        elif os.path.exists(path):
+            decks.append(path)
+        else:
+            raise FileNotFoundError("Vocabulary deck %s doesn't exist" % path)
+    return list(dict.fromkeys(os.path.realpath(deck) for deck in decks))
+
+
+def deck_language(path: str) -> Optional[str]:
+    '''
+    Returns language of vocabulary json
+    by its name vocabulary_<language>.json, None if name doesn't have it.
+
+    Parameters:
+    -----------
+        path: str
+            path to vocabulary json
+    '''
+    name = os.path.basename(strip_compression_suffix(path))
+    prefix, suffix = 'vocabulary_', '.json'
+    if name.startswith(prefix) and name.endswith(suffix) and len(name) > len(prefix) + len(suffix):
+        return name[len(prefix):-len(suffix)]
+    return None
+
+
+def decks_language(paths: Iterable[str]) -> Optional[str]:
+    '''
+    Returns language of decks, if all of them have the same language,
+    None if decks have different or unknown languages
+    or they don't exist.
+
+    Parameters:
+    -----------
+        paths: Iterable[str]
+            paths to vocabulary json files or directories with them
+    '''
+    try:
+        languages = set(map(deck_language, find_decks(paths)))
+    except FileNotFoundError:
+        return None
+    return languages.pop() if len(languages) == 1 else None
+
+
+def parse_deck(path: str) -> List[Word]:
+    '''
+    Returns all words
+    of vocabulary json.
+
+    Parameters:
+    -----------
+        path: str
+            path to vocabulary json
+    '''
+    return list(load_words(path))
+
+
+def merge_words(decks: Iterable[List[Word]]) -> List[Word]:
+    '''
+    Returns words of all decks
+    in order of decks; words with the same foreign word and translation
+    are kept once, in place of their first occurrence.
+
+    Parameters:
+    -----------
+        decks: Iterable[List[Word]]
+            parsed words of every deck
+    '''
+    return list(dict.fromkeys(chain.from_iterable(decks)))
+
+
+def load_decks(paths: Iterable[str],
+               max_workers: Optional[int] = None) -> List[Word]:
+    '''
+    Parses vocabulary decks in parallel
+    and returns their merged words.
+    Single deck is parsed in current process.
+
+    Parameters:
+    -----------
+        paths: Iterable[str]
+            paths to vocabulary json files or directories with them
+
+        max_workers: int
+            max number of processes, by default it is number of cores
+    '''
+    decks = find_decks(paths)
+    if len(decks) <= 1:
+        return merge_words(map(parse_deck, decks))
+    # process pool is imported only here, so startup without decks doesn't pay for it
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+
+    max_workers = min(len(decks), max_workers or os.cpu_count() or 1)
+    # decks are loaded in worker thread of process with Qt and journal threads,
+    # so forked process could inherit locks, that are held by other threads
+    with ProcessPoolExecutor(max_workers = max_workers,
+                             mp_context = multiprocessing.get_context('spawn')) as pool:
+        return merge_words(pool.map(parse_deck, decks))
@@ -0,0 +1,874 @@
+'''
+Quiz engine without any dependency on Qt.
+
+Opens vocabulary (SQLite store, compiled deck, cache or streamed json),
+orders questions (due repetitions first, then new words in random order,
+or words picked by their error rates in weighted session),
+samples session of passed size without keeping whole vocabulary,
+grades answers, records them to journal and counts score.
+Both Qt window and command line runner are built on it.
+'''
+import time
+import random
+import logging
+import argparse
+from itertools import islice
+from bisect import bisect_left
+from typing import Collection, Dict, Iterable, Iterator, List, Optional, Sequence
+
+from session import (QuizSession,
+                     FORWARD,
+                     CORRECT,
+                     WRONG,
+                     EMPTY,
+                     NOT_CHECKED)
+from vocabulary import (Word,
+                        get_vocabulary_path,
+                        load_words)
+from deck import open_compiled_deck
+from compact import CompactVocabulary
+from cache import (VocabularyCache,
+                   source_stamp)
+from scheduler import (Card,
+                       ReviewScheduler,
+                       ScheduleStore,
+                       CORRECT_QUALITY,
+                       TYPO_QUALITY,
+                       WRONG_QUALITY)
+from matching import (AnswerMatcher,
+                      MatchingRules,
+                      NormalizedAnswers,
+                      PrefixTracker)
+from answer_index import AnswerIndex
+from journal import AnswerJournal
+from search import WordSearchIndex
+from vocabulary_diff import (VocabularyDiff,
+                             WordKey,
+                             word_keys)
+from sampling import (Reservoir,
+                      WeightedPicker,
+                      error_weight)
+
+
+FIRST_BATCH_SIZE = 20
+BATCH_SIZE = 2000
+MAX_SEARCH_RESULTS = 100
+
+RESPONSE_TEXTS = {
+    NOT_CHECKED: "",
+    CORRECT: "Odpowiedź jest poprawna",
+    WRONG: "Odpowiedź nie jest poprawna",
+    EMPTY: "Pole jest nieuzupełnione",
+}
+RESULTS_TEXT = "Ilość poprawnych odpowiedzi: %s z %s"
+NO_NUMPY_TEXT = "Statystyki wymagają pakietu numpy"
+NO_JOURNAL_TEXT = "Dziennik odpowiedzi jest wyłączony"
+
+
+class QuizEngine:
+    '''
+    Class, that represents
+    quiz over one vocabulary.
+
+    Attributes:
+    -----------
+        options: argparse.Namespace
+            options, added by options.add_arguments
+
+        cache: VocabularyCache
+            cache of parsed vocabularies, None if it is disabled,
+            session is sampled, as cached vocabulary is loaded whole, or several decks are merged
+
+        random_generator: random.Random
+            generator of random numbers for sampling and order of questions,
+            seeded by options, so session with seed is reproducible
+
+        reservoir: Reservoir
+            random sample of streamed words, None if size of session isn't limited
+
+        vocabulary: CompactVocabulary | BinaryDeck | SqliteVocabulary
+            words of vocabulary, that are already loaded, in compact columns,
+            compiled deck, if it exists, or vocabulary from SQLite store
+
+        normalized_answers: dict
+            accepted answers of asked words in form, in which they are compared,
+            by index of word; answers are normalized, when word is asked first,
+            so loaded vocabulary doesn't keep normalized text of every word
+
+        matcher: AnswerMatcher
+            tolerant matching of answers by rules from options
+
+        index: AnswerIndex
+            accepted answers in both directions, built while vocabulary is loaded;
+            None in forward session, where answers of word itself are accepted
+
+        session: QuizSession
+            represents state of current quiz session
+
+        language: str
+            language, that cards and journal are saved under: language of decks of merged session
+            or language from options; None, if decks have different languages, then answers aren't saved
+
+        scheduler: ReviewScheduler
+            queue of spaced repetitions, None if it is disabled or language isn't known;
+            in weighted session it keeps only cards with numbers of errors
+
+        picker: WeightedPicker
+            picks words of weighted session by their error rates, None in other sessions
+
+        picker_words: List[int]
+            index of word of every index of picker in sampled weighted session,
+            so picker has weights only of sampled words; None in other sessions,
+            where indexes of picker are indexes of words
+
+        picker_indexes: dict
+            indexes of picker by indexes of words, they are inverse of picker_words
+
+        journal: AnswerJournal
+            journal of all graded answers, None if it is disabled or language isn't known;
+            error rates of words are taken from it, if it is enabled
+
+        search_index: WordSearchIndex
+            index of foreign words of vocabulary, it is filled on the first search
+
+        word_keys: dict
+            indexes of words by their keys of vocabulary diff, None until the first reload
+
+        is_loading: bool
+            represents boolean value, if vocabulary is still being loaded
+
+        source_stamp: tuple
+            size, mtime and inode of vocabulary json before it was parsed,
+            None if it isn't parsed or cache is disabled
+
+        parse_seconds: float
+            time, that parsing of vocabulary json took
+
+        furthest_position: int
+            the furthest number of question in order, that was shown to user
+
+        shown_position: int
+            number of question, that was shown last
+
+        shown_time: float
+            time of showing of last shown question, by time.monotonic()
+
+        due_position: int
+            position of due word, that is queued right after the furthest shown question,
+            None if there is no such word; words of weighted session are queued there too
+
+    Methods:
+    --------
+        open() -> None:
+            opens vocabulary and adds its words to quiz session.
+
+        load_words_batch(batch_size) -> None:
+            parses next batch of words from vocabulary json.
+
+        add_words(words, normalized_answers) -> None:
+            adds parsed words to vocabulary and to quiz session.
+
+        finish_loading(store_cache) -> None:
+            marks vocabulary as loaded.
+
+        store_cache() -> None:
+            caches parsed vocabulary json.
+
+        load_all() -> None:
+            parses rest of vocabulary json.
+
+        mark_shown(position) -> None:
+            remembers, that question was shown to user.
+
+        word(position) -> Word:
+            returns word of vocabulary for question on passed position.
+
+        question(position) -> str:
+            returns question on passed position.
+
+        answer(position) -> str:
+            returns expected answer for question on passed position.
+
+        normalized_answers_of(word_index) -> NormalizedAnswers:
+            returns accepted answers of word in form, in which answers are compared.
+
+        accepted_answers(position) -> NormalizedAnswers:
+            returns normalized accepted answers to question on passed position.
+
+        prefix_tracker(position) -> PrefixTracker:
+            returns incremental matching of typed text with answers to question.
+
+        check(position, user_answer) -> int:
+            grades user answer, returns status of question.
+
+        update_search_index() -> None:
+            indexes foreign words, that were loaded since previous search.
+
+        search_words(text, limit) -> List[int]:
+            returns indexes of asked words, which foreign words start with or contain text.
+
+        vocabulary_snapshot() -> Dict[WordKey, str]:
+            returns translations of words of vocabulary by their keys.
+
+        apply_diff(diff) -> None:
+            applies changes of reloaded vocabulary json to vocabulary and quiz session.
+
+        learning_stats() -> LearningStats:
+            returns statistics of learning over journal of answers.
+
+        close() -> None:
+            writes recorded answers and closes journal.
+
+        get_number_of_correct_answers() -> int:
+            returns number of correct answers.
+    '''
+    def __init__(self, options: argparse.Namespace) -> None:
+        self.options = options
+        self.cache = None if options.no_cache or options.size or options.decks else VocabularyCache()
+        self.random_generator = random.Random(options.seed)
+        self.reservoir = None
+        self.vocabulary = CompactVocabulary()
+        self.normalized_answers: Dict[int, NormalizedAnswers] = {}
+        self.matcher = AnswerMatcher(MatchingRules(fold_case = not options.keep_case,
+                                                   fold_diacritics = not options.keep_diacritics,
+                                                   max_typos = options.max_typos))
+        self.index = None if options.direction == FORWARD else AnswerIndex(self.matcher)
+        self.session = QuizSession([], direction = options.direction,
+                                   random_generator = self.random_generator)
+        self.language = options.language
+        if options.decks:
+            from decks import decks_language
+
+            self.language = decks_language(options.decks)
+        self.scheduler = None
+        if not options.no_schedule and self.language is not None:
+            self.scheduler = ReviewScheduler(ScheduleStore(options.schedule),
+                                             language = self.language)
+        self.picker = WeightedPicker(self.random_generator) if options.weighted else None
+        self.picker_words: Optional[List[int]] = [] if options.weighted and options.size else None
+        self.picker_indexes: Dict[int, int] = {}
+        self.journal = None
+        if not options.no_journal and self.language is not None:
+            self.journal = AnswerJournal(self.language, directory = options.journal)
+        self.search_index = WordSearchIndex()
+        self.word_keys: Optional[Dict[WordKey, int]] = None
+        self.words: Iterator[Word] = iter(())
+        self.is_loading = False
+        self.source_stamp = None
+        self.parse_seconds = 0.0
+        self.furthest_position = -1
+        self.shown_position = None
+        self.shown_time = 0.0
+        self.due_position = None
+
+
+    def open(self, stream: bool = True) -> None:
+        '''
+        Opens vocabulary.
+        If vocabulary is compiled into binary deck or parsed vocabulary is cached,
+        adds all its words to quiz session at once. Words of SQLite store are read
+        by indexed queries: sampled ones at once, otherwise the first batch of next words,
+        rest of them have to be loaded by load_words_batch, whether stream is True or not.
+        Words, that aren't due yet, are skipped, if spaced repetition is used;
+        if no word is new or due, words are repeated ahead of time, the soonest due first.
+        Otherwise vocabulary json has to be parsed: if stream is True,
+        only first batch of words is parsed, rest of words have to be loaded
+        by load_words_batch; if stream is False, words are expected
+        to be passed by add_words from other thread.
+        Several decks, passed in options, are parsed in parallel and merged at once,
+        or passed by add_words, if stream is False.
+        If size of session is passed in options, only random sample
+        of words of this size is added to quiz session; streamed words
+        are sampled in reservoir and added, when vocabulary is parsed.
+
+        Parameters:
+        -----------
+            stream: bool
+                represents boolean value, if engine parses vocabulary json itself
+        '''
+        if self.options.decks and not stream:
+            # merged decks are parsed in other thread and passed by add_words
+            self.is_loading = True
+            return
+        vocabulary = self.get_random_access_vocabulary()
+        if vocabulary is None and self.cache is not None:
+            vocabulary = self.cache.load(self.vocabulary_path)
+        if vocabulary is not None:
+            self.vocabulary = vocabulary
+            if self.options.database and not self.options.size:
+                # store is read by indexed queries of next words, batch by batch like parsed json
+                self.is_loading = True
+                self.load_words_batch(FIRST_BATCH_SIZE)
+                return
+            if self.index is not None:
+                normalize_answers = self.matcher.normalize_answers
+                self.index.add_words(vocabulary, (normalize_answers(word.translation) for word in vocabulary))
+            if self.options.size:
+                if self.options.database:
+                    # positions are sampled by store, sampled words are read by one query
+                    indexes = vocabulary.sample_indexes(self.options.size, self.random_generator)
+                    words = vocabulary.words_at(indexes)
+                else:
+                    indexes = self.random_generator.sample(range(len(vocabulary)),
+                                                           min(self.options.size, len(vocabulary)))
+                    words = [vocabulary[index] for index in indexes]
+                self.session.extend(self._new_word_indexes(words, indexes))
+            else:
+                self.session.extend(self._new_word_indexes(vocabulary, range(len(vocabulary))))
+            self._queue_next_word()
+            self._review_early()
+            return
+        self.is_loading = True
+        if self.cache is not None:
+            self.source_stamp = source_stamp(self.vocabulary_path)
+        if stream:
+            if self.options.size:
+                self.reservoir = Reservoir(self.options.size, self.random_generator)
+            self.words = self.get_vocabulary(language = self.options.language)
+            self.load_words_batch(FIRST_BATCH_SIZE)
+
+
+    @property
+    def vocabulary_path(self) -> str:
+        return get_vocabulary_path(self.options.language)
+
+
+    def get_random_access_vocabulary(self):
+        '''
+        Returns merged words of decks, if they are passed in options,
+        vocabulary from SQLite store, if it is passed in options,
+        or compiled deck, if it exists.
+        Otherwise returns None.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        if self.options.decks:
+            from decks import load_decks
+            return CompactVocabulary(load_decks(self.options.decks))
+        if self.options.database:
+            from store import (VocabularyStore,
+                               SqliteVocabulary)
+            # without size of session words of store are loaded by batches
+            return SqliteVocabulary(VocabularyStore(self.options.database),
+                                    language = self.options.language,
+                                    is_loaded = bool(self.options.size))
+        return open_compiled_deck(language = self.options.language)
+
+
+    def get_vocabulary(self, language: str) -> Iterator[Word]:
+        '''
+        Passes language abbreviature,
+        returns iterator, that parses words
+        from vocabulary json one by one.
+
+        Parameters:
+            language: str
+                language abbreviature, such as: (en, pl, ru, ua etc.)
+        '''
+        try:
+            return load_words(get_vocabulary_path(language))
+        except FileNotFoundError:
+            logging.exception("Vocabulary with this language doesn't exist.")
+            return iter(())
+
+
+    def load_words_batch(self, batch_size: int = BATCH_SIZE) -> None:
+        '''
+        Parses next batch of words from vocabulary or reads it from SQLite store,
+        adds them to quiz session or to reservoir, if session is sampled.
+        Finishes loading, when vocabulary is parsed;
+        sampled words are added to quiz session then.
+
+        Parameters:
+        -----------
+            batch_size: int
+                max number of words in batch
+        '''
+        parse_start = time.perf_counter()
+        if self.options.database:
+            batch = self.vocabulary.next_words(batch_size)
+        else:
+            batch = list(islice(self.words, batch_size))
+        self.parse_seconds += time.perf_counter() - parse_start
+        if self.reservoir is None:
+            self.add_words(batch)
+        else:
+            self.reservoir.add(batch)
+        if len(batch) < batch_size:
+            if self.reservoir is not None:
+                self.add_words(self.reservoir.items)
+            self.finish_loading()
+
+
+    def add_words(self, words: List[Word],
+                        normalized_answers: Optional[List[NormalizedAnswers]] = None) -> None:
+        '''
+        Adds parsed words to vocabulary and to quiz session
+        in random positions, that weren't shown to user yet.
+        Words with card of spaced repetition are queued by scheduler instead.
+
+        Parameters:
+        -----------
+            words: List[Word]
+                batch of parsed words
+
+            normalized_answers: List[NormalizedAnswers]
+                accepted answers of words, normalized by matcher; they are needed
+                only by index of reverse and mixed sessions and are normalized here,
+                if they aren't passed
+        '''
+        start = len(self.vocabulary)
+        self.vocabulary.extend(words)
+        if self.index is not None:
+            if not normalized_answers:
+                normalize_answers = self.matcher.normalize_answers
+                normalized_answers = [normalize_answers(word.translation) for word in words]
+            self.index.add_words(words, normalized_answers)
+        first_free_position = self.furthest_position + 1
+        if self.due_position is not None:
+            first_free_position = self.due_position + 1
+        self.session.extend(self._new_word_indexes(words, range(start, start + len(words))),
+                            start = first_free_position)
+        self._queue_next_word()
+
+
+    def _new_word_indexes(self, words: Sequence[Word],
+                                indexes: Sequence[int]) -> Iterable[int]:
+        new_indexes = indexes
+        if self.scheduler is not None:
+            if words is self.vocabulary:
+                # whole random access vocabulary is opened, only words of saved cards are read
+                new_indexes = self.scheduler.add_vocabulary(words)
+            else:
+                new_indexes = self.scheduler.add_words(words, indexes)
+        if self.picker is None:
+            return new_indexes
+        # words of weighted session are added to picker, session gets them one by one
+        if self.picker_words is not None:
+            # sampled words get dense indexes of picker, whatever their indexes in vocabulary are
+            self.picker_indexes.update(zip(indexes, range(len(self.picker_words),
+                                                          len(self.picker_words) + len(indexes))))
+            self.picker_words.extend(indexes)
+            self.picker.extend([self._error_weight(index, word) for index, word in zip(indexes, words)])
+            return ()
+        weights = [0] * (max(indexes, default = -1) + 1 - len(self.picker))
+        for index, word in zip(indexes, words):
+            weights[index - len(self.picker)] = self._error_weight(index, word)
+        self.picker.extend(weights)
+        return ()
+
+
+    def _picker_index(self, word_index: int) -> Optional[int]:
+        if self.picker_words is not None:
+            return self.picker_indexes.get(word_index)
+        return word_index if word_index < len(self.picker) else None
+
+
+    def _error_weight(self, word_index: int,
+                            word: Word) -> int:
+        if self.journal is not None:
+            return error_weight(*self.journal.word_stats(word))
+        card = Card() if self.scheduler is None else self.scheduler.cards.get(word_index, Card())
+        return error_weight(card.answers, card.errors)
+
+
+    def _queue_next_word(self) -> None:
+        if self.due_position is not None:
+            return
+        if self.picker is not None:
+            # weighted session has as many questions as words, picked with repetitions,
+            # so weight, changed by answer, affects the next picked question
+            if len(self.session) < self.picker.count:
+                self.due_position = self.furthest_position + 1
+                word_index = self.picker.pick()
+                if self.picker_words is not None:
+                    word_index = self.picker_words[word_index]
+                self.session.insert(self.due_position, word_index)
+            return
+        if self.scheduler is None:
+            return
+        word_index = self.scheduler.pop_due()
+        if word_index is not None:
+            self.due_position = self.furthest_position + 1
+            self.session.insert(self.due_position, word_index)
+
+
+    def finish_loading(self, store_cache: bool = True) -> None:
+        '''
+        Marks vocabulary as loaded,
+        caches it, if store_cache is True.
+
+        Parameters:
+        -----------
+            store_cache: bool
+                represents boolean value, if parsed vocabulary is cached at once;
+                otherwise store_cache() can be called later, for example from other thread
+        '''
+        self.is_loading = False
+        self._review_early()
+        if store_cache:
+            self.store_cache()
+
+
+    def _review_early(self) -> None:
+        # when every word was answered and none is due, words are repeated ahead of time,
+        # the soonest due first, instead of empty session
+        if self.scheduler is None or self.picker is not None or len(self.session):
+            return
+        for word_index in self.scheduler.upcoming():
+            self.session.insert(len(self.session), word_index)
+
+
+    def store_cache(self) -> None:
+        '''
+        Caches parsed vocabulary json,
+        if cache is enabled and json wasn't changed since parsing started.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        if self.cache is not None and self.source_stamp is not None:
+            self.cache.store(self.vocabulary_path, self.vocabulary, self.parse_seconds,
+                             stamp = self.source_stamp)
+
+
+    def load_all(self) -> None:
+        '''
+        Parses rest of vocabulary json.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        while self.is_loading:
+            self.load_words_batch()
+
+
+    def mark_shown(self, position: int) -> None:
+        '''
+        Remembers, that question on passed position was shown to user,
+        so it won't be moved by words, that are loaded later,
+        and time of showing, from which latency of answer is counted.
+        Queues next due word after it.
+
+        Parameters:
+        -----------
+            position: int
+                number of question in order
+        '''
+        self.shown_position = position
+        self.shown_time = time.monotonic()
+        if position <= self.furthest_position:
+            return
+        self.furthest_position = position
+        if self.due_position is not None and self.due_position <= position:
+            self.due_position = None
+        self._queue_next_word()
+
+
+    def word(self, position: int) -> Word:
+        '''
+        Returns word of vocabulary
+        for question on passed position.
+
+        Parameters:
+        -----------
+            position: int
+                number of question in order
+        '''
+        return self.vocabulary[self.session.word_index(position)]
+
+
+    def question(self, position: int) -> str:
+        '''
+        Returns question
+        on passed position: foreign word, or translation,
+        if question is reversed.
+
+        Parameters:
+        -----------
+            position: int
+                number of question in order
+        '''
+        if self.session.is_reversed(position):
+            return self.word(position).translation
+        return self.word(position).foreign_word
+
+
+    def answer(self, position: int) -> str:
+        '''
+        Returns expected answer
+        for question on passed position.
+
+        Parameters:
+        -----------
+            position: int
+                number of question in order
+        '''
+        if self.session.is_reversed(position):
+            return self.word(position).foreign_word
+        return self.word(position).translation
+
+
+    def normalized_answers_of(self, word_index: int) -> NormalizedAnswers:
+        '''
+        Returns accepted answers of word
+        in form, in which answers are compared;
+        they are normalized only once for every word.
+
+        Parameters:
+        -----------
+            word_index: int
+                index of word in vocabulary
+        '''
+        normalized_answers = self.normalized_answers.get(word_index)
+        if normalized_answers is None:
+            normalized_answers = self.matcher.normalize_answers(self.vocabulary[word_index].translation)
+            self.normalized_answers[word_index] = normalized_answers
+        return normalized_answers
+
+
+    def accepted_answers(self, position: int) -> NormalizedAnswers:
+        '''
+        Returns normalized accepted answers
+        to question on passed position. If session isn't forward one,
+        answers of other words with the same asked text are accepted too.
+
+        Parameters:
+        -----------
+            position: int
+                number of question in order
+        '''
+        word_index = self.session.word_index(position)
+        if self.index is None:
+            return self.normalized_answers_of(word_index)
+        if self.session.is_reversed(position):
+            return self.index.reverse_answers(self.normalized_answers_of(word_index))
+        return self.index.forward_answers(word_index)
+
+
+    def prefix_tracker(self, position: int) -> PrefixTracker:
+        '''
+        Returns incremental matching of text, that is being typed,
+        with accepted answers to question on passed position.
+
+        Parameters:
+        -----------
+            position: int
+                number of question in order
+        '''
+        return PrefixTracker(self.matcher, self.accepted_answers(position))
+
+
+    def check(self, position: int,
+                    user_answer: str) -> int:
+        '''
+        Grades user answer for question on passed position,
+        saves it with result of checking to quiz session
+        and to statistics of word, if vocabulary keeps them.
+        Answer is accepted, if it matches any of accepted answers of word tolerantly: letter case, diacritics, extra whitespaces
+        and small typos are ignored by rules from options.
+        Every not empty answer is recorded to journal,
+        the first not empty answer to question is passed to scheduler of repetitions,
+        weight of word in weighted session is changed by its new error rate.
+        Returns status of question.
+
+        Parameters:
+        -----------
+            position: int
+                number of question in order
+
+            user_answer: str
+                text, that user typed
+        '''
+        word_index = self.session.word_index(position)
+        typos = None
+        if not user_answer or user_answer.isspace():
+            status = EMPTY
+        else:
+            typos = self.matcher.match(user_answer, self.accepted_answers(position))
+            status = WRONG if typos is None else CORRECT
+        is_first_answer = self.session.status(position) in (NOT_CHECKED, EMPTY)
+        self.session.set_typed_answer(position, user_answer)
+        self.session.set_status(position, status)
+        if status == EMPTY:
+            return status
+        if hasattr(self.vocabulary, 'record_answer'):
+            self.vocabulary.record_answer(word_index, status == CORRECT)
+        if self.journal is not None:
+            latency = time.monotonic() - self.shown_time if position == self.shown_position else 0.0
+            self.journal.record(self.word(position), user_answer, status, typos,
+                                latency = latency,
+                                is_reversed = self.session.is_reversed(position))
+        if self.scheduler is not None and is_first_answer:
+            match typos:
+                case None:
+                    quality = WRONG_QUALITY
+                case 0:
+                    quality = CORRECT_QUALITY
+                case _:
+                    quality = TYPO_QUALITY
+            self.scheduler.review(word_index, self.word(position), quality = quality)
+        if self.picker is not None:
+            self.picker.set_weight(self._picker_index(word_index),
+                                   self._error_weight(word_index, self.word(position)))
+        return status
+
+
+    def update_search_index(self) -> None:
+        '''
+        Indexes foreign words of vocabulary,
+        that were loaded since previous search, so the first search
+        doesn't have to wait for indexing of whole vocabulary.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        indexed = len(self.search_index)
+        if indexed < len(self.vocabulary):
+            if hasattr(self.vocabulary, 'words_from'):
+                # words of SQLite store are read by chunks of queries, not one by one
+                words = self.vocabulary.words_from(indexed)
+            else:
+                words = (self.vocabulary[index] for index in range(indexed, len(self.vocabulary)))
+            self.search_index.add_words(words)
+        self.search_index.update()
+
+
+    def search_words(self, text: str,
+                           limit: int = MAX_SEARCH_RESULTS) -> List[int]:
+        '''
+        Returns indexes of words, that are asked in session,
+        which foreign words start with text, then which contain it.
+        Words, that were loaded since previous search, are indexed first.
+        Positions of words are not returned, because they are changed,
+        while words are added to session.
+
+        Parameters:
+        -----------
+            text: str
+                typed search text, letter case and diacritics are ignored
+
+            limit: int
+                max number of returned words
+        '''
+        self.update_search_index()
+        position_of = self.session.position_of
+        return list(islice((word_index for word_index in self.search_index.search(text)
+                            if position_of(word_index) is not None), limit))
+
+
+    def vocabulary_snapshot(self) -> Dict[WordKey, str]:
+        '''
+        Returns translations of words of vocabulary
+        by their keys, that reloaded vocabulary json is compared with.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        snapshot = word_keys(self.vocabulary)
+        self.word_keys = dict(zip(snapshot, range(len(snapshot))))
+        return snapshot
+
+
+    def apply_diff(self, diff: VocabularyDiff) -> None:
+        '''
+        Applies changes of reloaded vocabulary json
+        to vocabulary and quiz session; unchanged words, their questions
+        and answers stay as they are. Changed words are replaced in place.
+        Questions of removed words, that weren't shown yet, are removed,
+        shown questions are kept with their answers. Added words are added
+        like loaded ones, except of sampled session, which size is kept.
+        Words, that aren't in vocabulary, such as words of json, that weren't
+        sampled, are skipped, when they are changed or removed.
+        vocabulary_snapshot() must be called before the first diff.
+
+        Parameters:
+        -----------
+            diff: VocabularyDiff
+                changes, returned by diff_vocabulary
+        '''
+        if not isinstance(self.vocabulary, CompactVocabulary):
+            self.vocabulary = CompactVocabulary(self.vocabulary)
+        normalize_answers = self.matcher.normalize_answers
+        for key, word in diff.changed:
+            word_index = self.word_keys.get(key)
+            if word_index is None:
+                continue
+            self.vocabulary[word_index] = word
+            self.normalized_answers.pop(word_index, None)
+            if self.index is not None:
+                self.index.update_word(word_index, word, normalize_answers(word.translation))
+        if diff.removed:
+            self._remove_words({self.word_keys.pop(key) for key in diff.removed if key in self.word_keys})
+        if diff.added and not self.options.size:
+            start = len(self.vocabulary)
+            self.word_keys.update(zip((key for key, _ in diff.added), range(start, start + len(diff.added))))
+            self.add_words([word for _, word in diff.added])
+        self._queue_next_word()
+
+
+    def _remove_words(self, word_indexes: Collection[int]) -> None:
+        for word_index in word_indexes:
+            if self.scheduler is not None:
+                self.scheduler.remove_word(word_index)
+            if self.picker is not None and self._picker_index(word_index) is not None:
+                self.picker.set_weight(self._picker_index(word_index), 0)
+        removed = self.session.remove_words(word_indexes, start = self.furthest_position + 1)
+        if self.due_position is None or not removed:
+            return
+        shift = bisect_left(removed, self.due_position)
+        if shift < len(removed) and removed[shift] == self.due_position:
+            self.due_position = None
+        else:
+            self.due_position -= shift
+
+
+    def learning_stats(self):
+        '''
+        Returns statistics of learning
+        over all answers in journal; journal must be enabled.
+        Raises ImportError, if numpy isn't installed.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        from analytics import (AnswerHistory,
+                               compute_stats)
+
+        return compute_stats(AnswerHistory.from_records(self.journal.records()))
+
+
+    def close(self) -> None:
+        '''
+        Writes answers, that are recorded to journal,
+        and closes it; answers, that are recorded to SQLite store,
+        and changed cards of spaced repetition are written in one transaction each.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        if self.journal is not None:
+            self.journal.close()
+        if self.scheduler is not None:
+            self.scheduler.close()
+        if hasattr(self.vocabulary, 'record_answer'):
+            self.vocabulary.close()
+
+
+    def get_number_of_correct_answers(self) -> int:
+        '''
+        Returns number of correct answers
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        return self.session.get_number_of_correct_answers()
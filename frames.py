@@ -1,40 +1,75 @@
 from PySide6 import (QtWidgets,
-                     QtCore)
+                     QtCore,
+                     QtGui)
 
 from callbacks import Callbacker
+from engine import (RESPONSE_TEXTS,
+                    RESULTS_TEXT,
+                    NO_NUMPY_TEXT,
+                    NO_JOURNAL_TEXT)
+from matching import (PREFIX,
+                      COMPLETE,
+                      MISMATCH)
+from review import ReviewTableModel
+
+
+LIVE_CHECK_DELAY_MS = 100
+LIVE_COLORS = {
+    PREFIX: "#fff6d5",
+    COMPLETE: "#d5f5d5",
+    MISMATCH: "#f8d7d7",
+}
 
 
 class QuestionFrame(QtWidgets.QFrame):
     '''
     Class, that represents 
-    separate question frame.
+    question frame.
+    Only one instance of this frame is created for whole vocabulary,
+    it is rebound to data of current question on every navigation.
 
     Attributes:
     -----------
         is_first: bool
-            represents boolean value, if parent frame is first question
+            represents boolean value, if bound question is first question
             used only for the correct location of the "OK" and "Next" buttons
 
         is_last: bool
-            represents boolean value, if parent frame is last question
+            represents boolean value, if bound question is last question
             used only for the correct location of the "Back", "OK" and "Results" buttons
 
         current_frame_index: int
-            integer value, that represents number of the displayed frame in order
+            integer value, that represents number of the displayed question in order
 
         question: str
-            string value, that represets question for current frame
+            string value, that represets question for bound question
 
         answer: str
-            string value, that represets answer to question for current frame
+            string value, that represets answer to bound question
 
         main_window: MainWindow
             represents link to main window
 
+        live_tracker: PrefixTracker
+            incremental matching of typed text with answers to bound question,
+            None if live mode isn't enabled
+
+        live_state: int
+            state of typed text, that input line is colored by, None if it isn't colored
+
     Methods:
     --------
         init_variables() -> None:
-            inits passed variables to class instance.
+            inits default variables to class instance.
+
+        bind(current_frame_index) -> None:
+            shows data of question with passed index from quiz session on current frame.
+
+        update_nav_menu() -> None:
+            shows only navigation buttons, that are needed for position of bound question.
+
+        update_live_state() -> None:
+            colors input line by state of typed text.
 
         init_frame_widgets(self):
             inits widgets for current frame instance.
@@ -53,7 +88,11 @@ class QuestionFrame(QtWidgets.QFrame):
             pins current frame instance as parent for this widget by default.
 
         init_nav_menu(self):
-            calls initializations for all necessary navigation menu buttons.
+            calls initializations for all navigation menu buttons.
+
+        init_progress_bar(self):
+            creates progress bar of vocabulary loading; pins current frame instance as parent for this widget
+            by default.
 
         init_button_ok(self):
             creates "ok" button; pins main window as parent for this widget.
@@ -69,62 +108,111 @@ class QuestionFrame(QtWidgets.QFrame):
         init_button_results(self):
             creates "results" button; pins current frame as a parent for this widget
             by default.
+
+        init_button_navigator(self):
+            creates "search" button, that shows or hides navigator.
     '''
-    def __init__(self, main_window, question: str,
-                       answer: str,
-                       currect_frame_index: int,
-                       is_first: bool = False,
-                       is_last: bool = False,
-                       is_results_frame: bool = False) -> None:
+    def __init__(self, main_window) -> None:
         super().__init__()
-        self.init_variables(is_first, is_last,
-                            currect_frame_index,
-                            question, answer)
+        self.main_window = main_window
+        self.init_variables()
         self.init_frame_widgets()
-        self.setWindowTitle(question)
         Callbacker(frame = self,
-                   answer = answer,
-                   is_first = is_first,
-                   is_last = is_last,
-                   main_window = main_window,
-                   is_results_frame = is_results_frame).init_callbacks()
+                   main_window = main_window).init_callbacks()
 
 
-    def init_variables(self, is_first: bool,
-                             is_last: bool,
-                             current_frame_index: int,
-                             question: str, answer: str):
+    def init_variables(self):
         '''
-        Inits passed variables
+        Inits default variables
         to class instance.
 
         Parameters:
         -----------
-            is_first: bool
-                represents boolean value, if parent frame is first question
-                used only for the correct location of the "OK" and "Next" buttons
-    
-            is_last: bool
-                represents boolean value, if parent frame is last question
-                used only for the correct location of the "Back", "OK" and "Results" buttons
+            Doesn't have
+        '''
+        self.is_first = False
+        self.is_last = False
+        self.question = ''
+        self.answer = ''
+        self.current_frame_index = 0
+        self.live_tracker = None
+        self.live_state = None
+        self.layout: QtWidgets.QVBoxLayout = QtWidgets.QVBoxLayout(self)
 
-            current_frame_index: int
-                integer value, that represents number of the displayed frame in order
 
-            question: str
-                string value, that represets question for current frame
+    def bind(self, current_frame_index: int) -> None:
+        '''
+        Reads question with passed index from quiz engine of main window
+        and shows its data on current frame.
 
-            answer: str
-                string value, that represets answer to question for current frame
+        Parameters:
+        -----------
+            current_frame_index: int
+                integer value, that represents number of the question in order
         '''
-        self.is_first = is_first
-        self.is_last = is_last
-        self.question = question
-        self.answer = answer
+        engine = self.main_window.engine
+        session = engine.session
+
         self.current_frame_index = current_frame_index
+        self.question = engine.question(current_frame_index)
+        self.answer = engine.answer(current_frame_index)
 
-        self.is_answer_correct = False
-        self.layout: QtWidgets.QVBoxLayout = QtWidgets.QVBoxLayout(self)
+        self.setWindowTitle(self.question)
+        self.question_label.setText(self.question)
+        if self.main_window.options.live:
+            self.live_tracker = engine.prefix_tracker(current_frame_index)
+        self.input_line.setText(session.typed_answer(current_frame_index))
+        if self.live_tracker is not None:
+            self.update_live_state()
+        self.response_label.setText(RESPONSE_TEXTS[session.status(current_frame_index)])
+        self.update_nav_menu()
+
+
+    def update_nav_menu(self) -> None:
+        '''
+        Shows only navigation buttons,
+        that are needed for position of bound question.
+        While vocabulary is being loaded, last loaded question isn't last one,
+        so "Next" button is only disabled until next batch of words,
+        and progress of loading is shown.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        engine = self.main_window.engine
+        has_next = self.current_frame_index < len(engine.session) - 1
+        self.is_first = self.current_frame_index == 0
+        self.is_last = not has_next and not engine.is_loading
+
+        self.button_back.setVisible(not self.is_first)
+        self.button_next.setVisible(not self.is_last)
+        self.button_next.setEnabled(has_next)
+        self.button_results.setVisible(self.is_last)
+        self.progress_bar.setVisible(engine.is_loading)
+
+
+    def update_live_state(self) -> None:
+        '''
+        Colors input line by state of typed text:
+        beginning of accepted answer, complete answer or mismatch.
+        Input line is repainted only, when state is changed.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        text = self.input_line.text()
+        state = self.live_tracker.update(text) if text else None
+        if state == self.live_state:
+            return
+        self.live_state = state
+        if state is None:
+            self.input_line.setPalette(self.default_input_palette)
+            return
+        palette = QtGui.QPalette(self.default_input_palette)
+        palette.setColor(QtGui.QPalette.ColorRole.Base, QtGui.QColor(LIVE_COLORS[state]))
+        self.input_line.setPalette(palette)
 
     
     def init_frame_widgets(self):
@@ -139,6 +227,7 @@ class QuestionFrame(QtWidgets.QFrame):
         self.init_input_line()
         self.init_correctness_label()
         self.init_nav_menu()
+        self.init_progress_bar()
     
 
     def init_question_label(self):
@@ -152,7 +241,6 @@ class QuestionFrame(QtWidgets.QFrame):
             Doesn't have
         '''
         self.question_label = QtWidgets.QLabel(parent = self)
-        self.question_label.setText(self.question)
         self.layout.addWidget(self.question_label, alignment = QtCore.Qt.AlignmentFlag.AlignTop | QtCore.Qt.AlignmentFlag.AlignCenter)
 
 
@@ -167,6 +255,10 @@ class QuestionFrame(QtWidgets.QFrame):
             Doesn't have
         '''
         self.input_line = QtWidgets.QLineEdit()
+        self.default_input_palette = QtGui.QPalette(self.input_line.palette())
+        self.live_timer = QtCore.QTimer(self)
+        self.live_timer.setSingleShot(True)
+        self.live_timer.setInterval(LIVE_CHECK_DELAY_MS)
         self.layout.addWidget(self.input_line, alignment = QtCore.Qt.AlignmentFlag.AlignTop | QtCore.Qt.AlignmentFlag.AlignCenter)
 
 
@@ -187,8 +279,9 @@ class QuestionFrame(QtWidgets.QFrame):
 
     def init_nav_menu(self):
         '''
-        Calls initializations for all necessary
+        Calls initializations for all
         navigation menu buttons.
+        Visibility of buttons is defined on binding of question.
 
         Parameters:
         -----------
@@ -197,22 +290,29 @@ class QuestionFrame(QtWidgets.QFrame):
         '''
         self.nav_menu = QtWidgets.QBoxLayout(QtWidgets.QBoxLayout.Direction.LeftToRight)
         self.layout.addLayout(self.nav_menu, stretch = 0)
+
+        self.init_button_back()
+        self.init_button_ok()
+        self.init_button_next()
+        self.init_button_results()
+        self.init_button_navigator()
         
-        match self.is_first, self.is_last:
-            case True, False:
-                self.init_button_ok()
-                self.init_button_next()
-
-            case False, True:
-                self.init_button_back()
-                self.init_button_ok()
-                self.init_button_results()
-
-            case _:
-                self.init_button_back()
-                self.init_button_ok()
-                self.init_button_next()
-        
+
+    def init_progress_bar(self):
+        '''
+        Creates progress bar of vocabulary loading;
+        pins current frame instance as parent for this widget
+        by default.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        self.progress_bar = QtWidgets.QProgressBar(parent = self)
+        self.progress_bar.setRange(0, 100)
+        self.progress_bar.hide()
+        self.layout.addWidget(self.progress_bar)
+
 
     def init_button_ok(self):
         '''
@@ -225,15 +325,7 @@ class QuestionFrame(QtWidgets.QFrame):
         '''
         self.button_ok = QtWidgets.QPushButton(parent = self)
         self.button_ok.setText("Ok")
-        match self.is_first, self.is_last:
-            case True, False:
-                self.nav_menu.addWidget(self.button_ok, alignment = QtCore.Qt.AlignmentFlag.AlignBottom | QtCore.Qt.AlignmentFlag.AlignLeft)
-
-            case False, True:
-                self.nav_menu.addWidget(self.button_ok, alignment = QtCore.Qt.AlignmentFlag.AlignBottom | QtCore.Qt.AlignmentFlag.AlignCenter)
-    
-            case _:
-                self.nav_menu.addWidget(self.button_ok, alignment = QtCore.Qt.AlignmentFlag.AlignBottom | QtCore.Qt.AlignmentFlag.AlignCenter)
+        self.nav_menu.addWidget(self.button_ok, alignment = QtCore.Qt.AlignmentFlag.AlignBottom | QtCore.Qt.AlignmentFlag.AlignCenter)
             
 
     def init_button_next(self):
@@ -280,11 +372,200 @@ class QuestionFrame(QtWidgets.QFrame):
         self.button_results.setText("Results")
         self.nav_menu.addWidget(self.button_results, alignment = QtCore.Qt.AlignmentFlag.AlignBottom | QtCore.Qt.AlignmentFlag.AlignRight)
 
+
+    def init_button_navigator(self):
+        '''
+        Creates "search" button, that shows or hides navigator;
+        it is toggled by Ctrl+F too.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        self.button_navigator = QtWidgets.QPushButton(parent = self)
+        self.button_navigator.setText("Szukaj")
+        self.button_navigator.setCheckable(True)
+        self.button_navigator.setShortcut(QtGui.QKeySequence.StandardKey.Find)
+        self.nav_menu.addWidget(self.button_navigator, alignment = QtCore.Qt.AlignmentFlag.AlignBottom | QtCore.Qt.AlignmentFlag.AlignRight)
+
     
     def __repr__(self) -> str:
         return self.windowTitle()
 
 
+class NavigatorFrame(QtWidgets.QFrame):
+    '''
+    Class, that represents
+    side panel, that jumps to any question by its number
+    or to question with foreign word, that is found by search.
+    Found words are kept by their indexes in vocabulary and their positions
+    are looked up on jump, so results stay valid, while questions are added to session.
+
+    Attributes:
+    -----------
+        main_window: MainWindow
+            represents link to main window
+
+    Methods:
+    --------
+        set_shown(is_shown) -> None:
+            shows or hides navigator.
+
+        update_range() -> None:
+            allows numbers of all questions of session.
+
+        update_search() -> None:
+            shows words, which foreign words start with or contain searched text.
+
+        jump_to_number() -> None:
+            shows question with chosen number.
+
+        jump_to_word(item) -> None:
+            shows question with found word.
+    '''
+    def __init__(self, main_window) -> None:
+        super().__init__()
+        self.main_window = main_window
+        self.layout: QtWidgets.QVBoxLayout = QtWidgets.QVBoxLayout(self)
+        self.init_frame_widgets()
+
+
+    def init_frame_widgets(self):
+        '''
+        Inits widgets for current frame instance.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        self.init_number_menu()
+        self.init_search_line()
+        self.init_results_list()
+
+
+    def init_number_menu(self):
+        '''
+        Creates box with number of question
+        and button, that jumps to it.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        self.number_menu = QtWidgets.QHBoxLayout()
+        self.layout.addLayout(self.number_menu)
+        self.number_box = QtWidgets.QSpinBox(parent = self)
+        self.number_box.setRange(1, 1)
+        self.number_menu.addWidget(self.number_box, stretch = 1)
+        self.button_go = QtWidgets.QPushButton(parent = self)
+        self.button_go.setText("Idź")
+        self.number_menu.addWidget(self.button_go)
+
+
+    def init_search_line(self):
+        '''
+        Creates line for text,
+        that foreign words are searched by.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        self.search_line = QtWidgets.QLineEdit(parent = self)
+        self.search_line.setPlaceholderText("Szukaj słowa")
+        self.search_line.setClearButtonEnabled(True)
+        self.layout.addWidget(self.search_line)
+
+
+    def init_results_list(self):
+        '''
+        Creates list of found words.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        self.results_list = QtWidgets.QListWidget(parent = self)
+        self.layout.addWidget(self.results_list, stretch = 1)
+
+
+    def set_shown(self, is_shown: bool):
+        '''
+        Shows or hides navigator;
+        loaded words are indexed for search, when it is shown,
+        so typing of search text doesn't wait for indexing.
+
+        Parameters:
+        -----------
+            is_shown: bool
+                represents boolean value, if navigator is shown
+        '''
+        self.setVisible(is_shown)
+        if is_shown:
+            self.main_window.engine.update_search_index()
+            self.search_line.setFocus()
+
+
+    def update_range(self):
+        '''
+        Allows numbers of all questions of session
+        and shows number of bound question.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        self.number_box.setMaximum(max(len(self.main_window.engine.session), 1))
+        self.number_box.setValue(self.main_window.question_frame.current_frame_index + 1)
+
+
+    def update_search(self):
+        '''
+        Shows words, that are asked in session,
+        which foreign words start with or contain searched text.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        engine = self.main_window.engine
+        self.results_list.clear()
+        for word_index in engine.search_words(self.search_line.text()):
+            item = QtWidgets.QListWidgetItem(engine.vocabulary[word_index].foreign_word)
+            item.setData(QtCore.Qt.ItemDataRole.UserRole, word_index)
+            self.results_list.addItem(item)
+
+
+    def jump_to_number(self):
+        '''
+        Shows question with number,
+        that is chosen in number box.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        position = self.number_box.value() - 1
+        if position < len(self.main_window.engine.session):
+            self.main_window.show_question(position)
+
+
+    def jump_to_word(self, item: QtWidgets.QListWidgetItem):
+        '''
+        Shows the first question
+        with found word.
+
+        Parameters:
+        -----------
+            item: QtWidgets.QListWidgetItem
+                item of results list
+        '''
+        word_index = item.data(QtCore.Qt.ItemDataRole.UserRole)
+        position = self.main_window.engine.session.position_of(word_index)
+        if position is not None:
+            self.main_window.show_question(position)
+
+
 class ResultsFrame(QtWidgets.QFrame):
     def __init__(self, current_frame_index: int,
                        main_window) -> None:
@@ -318,9 +599,124 @@ class ResultsFrame(QtWidgets.QFrame):
             Doesn't have
         '''
         self.init_results_label()
+        self.init_review_filter()
+        self.init_review_table()
+        self.init_stats_label()
         self.init_nav_menu()
 
     
+    def update_results(self):
+        '''
+        Reads number of correct answers from quiz engine
+        of main window and shows it on results label,
+        rereads questions of review table.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        engine = self.main_window.engine
+        self.current_frame_index = len(engine.session)
+        self.button_back.setEnabled(len(engine.session) > 0)
+        self.results_label.setText(RESULTS_TEXT % (engine.get_number_of_correct_answers(),
+                                                   len(engine.session)))
+        self.review_model.refresh()
+
+
+    def update_review_filter(self):
+        '''
+        Shows in review table only questions,
+        that pass text of filter line and "only mistakes" check box.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        self.review_model.set_filter(self.review_filter_line.text(),
+                                     only_mistakes = self.only_mistakes_box.isChecked())
+
+
+    def init_review_filter(self):
+        '''
+        Creates line for text, that reviewed questions are filtered by,
+        and check box, that shows only questions with wrong or empty answers.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        self.review_filter_menu = QtWidgets.QHBoxLayout()
+        self.layout.addLayout(self.review_filter_menu)
+        self.review_filter_line = QtWidgets.QLineEdit(parent = self)
+        self.review_filter_line.setPlaceholderText("Szukaj")
+        self.review_filter_line.setClearButtonEnabled(True)
+        self.review_filter_menu.addWidget(self.review_filter_line)
+        self.only_mistakes_box = QtWidgets.QCheckBox("Tylko błędy", parent = self)
+        self.only_mistakes_box.setChecked(True)
+        self.review_filter_menu.addWidget(self.only_mistakes_box)
+
+
+    def init_review_table(self):
+        '''
+        Creates table with questions, expected and typed answers;
+        rows are fetched by model, while table is scrolled.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        self.review_model = ReviewTableModel(self.main_window.engine,
+                                             only_mistakes = self.only_mistakes_box.isChecked(),
+                                             parent = self)
+        self.review_table = QtWidgets.QTableView(parent = self)
+        self.review_table.setModel(self.review_model)
+        self.review_table.setSortingEnabled(True)
+        self.review_table.horizontalHeader().setSortIndicator(-1, QtCore.Qt.SortOrder.AscendingOrder)
+        self.review_table.horizontalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.Stretch)
+        self.review_table.verticalHeader().setSectionResizeMode(QtWidgets.QHeaderView.ResizeMode.Fixed)
+        self.review_table.setSelectionBehavior(QtWidgets.QAbstractItemView.SelectionBehavior.SelectRows)
+        self.review_table.setEditTriggers(QtWidgets.QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.layout.addWidget(self.review_table, stretch = 1)
+
+
+    def show_stats(self):
+        '''
+        Counts statistics of learning over journal of answers
+        and shows them under results.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        engine = self.main_window.engine
+        if engine.journal is None:
+            text = NO_JOURNAL_TEXT
+        else:
+            try:
+                from analytics import format_stats
+
+                text = format_stats(engine.learning_stats())
+            except ImportError:
+                text = NO_NUMPY_TEXT
+        self.stats_label.setText(text)
+        self.stats_label.show()
+
+
+    def init_stats_label(self):
+        '''
+        Creates label with statistics of learning,
+        it is hidden, until statistics are requested.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        self.stats_label = QtWidgets.QLabel(parent = self)
+        self.stats_label.setObjectName('stats_label')
+        self.layout.addWidget(self.stats_label, alignment = QtCore.Qt.AlignmentFlag.AlignCenter)
+        self.stats_label.hide()
+
+
     def init_results_label(self):
         '''
         Creates label, that contains results message:
@@ -349,6 +745,7 @@ class ResultsFrame(QtWidgets.QFrame):
         self.nav_menu = QtWidgets.QHBoxLayout()
         self.layout.addLayout(self.nav_menu, stretch = 0)
         self.init_button_back()
+        self.init_button_stats()
         self.init_button_close()
 
 
@@ -367,6 +764,12 @@ class ResultsFrame(QtWidgets.QFrame):
         self.nav_menu.addWidget(self.button_back, alignment = QtCore.Qt.AlignmentFlag.AlignBottom | QtCore.Qt.AlignmentFlag.AlignLeft)
     
 
+    def init_button_stats(self):
+        self.button_stats = QtWidgets.QPushButton(parent = self)
+        self.button_stats.setText("Statystyki")
+        self.nav_menu.addWidget(self.button_stats, alignment = QtCore.Qt.AlignmentFlag.AlignBottom)
+
+
     def init_button_close(self):
         self.button_close = QtWidgets.QPushButton(parent = self)
         self.button_close.setText("Close")
@@ -0,0 +1,366 @@
+'''
+Append-only journal of answers.
+
+Every graded answer is appended to journal of language as fixed-size record:
+id of word, time, latency, result, number of typos and direction;
+typed answers are appended to separate text file, record keeps their offset.
+Records are collected in memory and written by worker thread in batches,
+when batch is full or once in flush interval, so thread, that records answers,
+never waits for disk. Replay reads records, that are already written, and packs
+records, that still wait in memory, so it doesn't wait for disk either. Statistics of words are rebuilt from records
+by slices and counters, that run in C, so replay of millions of answers is fast.
+Incomplete record at the end, left by crash, is ignored
+and cut off before new records are appended, so they stay aligned.
+'''
+import os
+import sys
+import time
+import struct
+import hashlib
+import threading
+from array import array
+from collections import Counter
+from itertools import compress
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from vocabulary import Word
+from session import WRONG
+
+
+FLUSH_INTERVAL = 1.0
+FLUSH_BATCH_SIZE = 256
+NOT_TYPO = 255
+
+# id of word, time, offset of typed answer, latency, status, typos, 1 if translation was asked
+RECORD = struct.Struct('<QdQfBBBx')
+RECORDS_SUFFIX = '.attempts'
+ANSWERS_SUFFIX = '.answers'
+# maps status byte to 1, if answer is wrong
+_IS_WRONG = bytes(int(status == WRONG) for status in range(256))
+
+
+class WordStats(NamedTuple):
+    '''
+    Class, that represents
+    statistics of answers to one word.
+
+    Attributes:
+    -----------
+        attempts: int
+            number of recorded answers
+
+        errors: int
+            number of wrong answers
+    '''
+    attempts: int = 0
+    errors: int = 0
+
+
+def get_default_journal_directory() -> str:
+    '''
+    Returns directory of journals
+    according to XDG base directory specification.
+
+    Parameters:
+    -----------
+        Doesn't have
+    '''
+    base = os.environ.get('XDG_DATA_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'share')
+    return os.path.join(base, 'voctester', 'journal')
+
+
+def word_id(word: Word) -> int:
+    '''
+    Returns id of word,
+    that stays the same, while its texts aren't changed.
+
+    Parameters:
+    -----------
+        word: Word
+            word of vocabulary
+    '''
+    digest = hashlib.blake2b(('%s\t%s' % word).encode('utf-8'), digest_size = 8).digest()
+    return int.from_bytes(digest, 'little')
+
+
+def read_records(path: str,
+                 size: Optional[int] = None) -> bytes:
+    '''
+    Returns all complete records
+    from journal file.
+
+    Parameters:
+    -----------
+        path: str
+            path to file with records
+
+        size: int
+            number of bytes, that are read from start of file, by default whole file is read
+    '''
+    try:
+        with open(path, 'rb') as file:
+            data = file.read(-1 if size is None else size)
+    except FileNotFoundError:
+        return b''
+    return data[:len(data) - len(data) % RECORD.size]
+
+
+def get_records_size(path: str) -> int:
+    '''
+    Returns size of complete records
+    in journal file, 0 if it doesn't exist.
+
+    Parameters:
+    -----------
+        path: str
+            path to file with records
+    '''
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        return 0
+    return size - size % RECORD.size
+
+
+def replay_stats(records: bytes) -> Dict[int, WordStats]:
+    '''
+    Returns statistics of words
+    by their ids, counted from journal records.
+
+    Parameters:
+    -----------
+        records: bytes
+            complete records, returned by read_records
+    '''
+    columns = array('Q')
+    columns.frombytes(records)
+    if sys.byteorder == 'big':
+        columns.byteswap()
+    word_ids = columns[::RECORD.size // columns.itemsize]
+    attempts = Counter(word_ids)
+    is_wrong = records[RECORD.size - 4::RECORD.size].translate(_IS_WRONG)
+    errors = Counter(compress(word_ids, is_wrong))
+    return {word: WordStats(count, errors[word]) for word, count in attempts.items()}
+
+
+class AnswerJournal:
+    '''
+    Class, that represents
+    journal of answers to words of one language.
+
+    Attributes:
+    -----------
+        records_path: str
+            path to file with records of answers
+
+        answers_path: str
+            path to file with typed answers
+
+        flush_interval: float
+            max time in seconds, that recorded answer waits for writing
+
+    Methods:
+    --------
+        record(word, typed_answer, status, typos, latency, is_reversed) -> None:
+            adds answer to journal.
+
+        word_stats(word) -> WordStats:
+            returns statistics of answers to word.
+
+        records() -> bytes:
+            returns all records of journal, including not written ones.
+
+        flush() -> None:
+            writes recorded answers at once.
+
+        close() -> None:
+            writes recorded answers and stops worker thread.
+    '''
+    def __init__(self, language: str,
+                       directory: Optional[str] = None,
+                       flush_interval: float = FLUSH_INTERVAL) -> None:
+        directory = directory or get_default_journal_directory()
+        os.makedirs(directory, exist_ok = True)
+        self.records_path = os.path.join(directory, language + RECORDS_SUFFIX)
+        self.answers_path = os.path.join(directory, language + ANSWERS_SUFFIX)
+        self.flush_interval = flush_interval
+        self._stats: Optional[Dict[int, WordStats]] = None
+        self._pending: List[Tuple] = []
+        # batch, that worker thread is writing, and size of records, that are written
+        self._writing: List[Tuple] = []
+        self._written_size = get_records_size(self.records_path)
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._records_file = None
+        self._answers_file = None
+        self._is_closed = False
+        self._writer = threading.Thread(target = self._write_loop,
+                                        name = 'answer journal',
+                                        daemon = True)
+        self._writer.start()
+
+
+    @property
+    def stats(self) -> Dict[int, WordStats]:
+        '''
+        Statistics of words by their ids;
+        they are replayed from journal on the first access.
+        '''
+        if self._stats is None:
+            self._stats = replay_stats(self.records())
+        return self._stats
+
+
+    def records(self) -> bytes:
+        '''
+        Returns all complete records of journal:
+        records, that are written, and records of answers, that wait for writing,
+        without waiting for disk; offsets of typed answers of the latter are 0.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        with self._condition:
+            waiting = self._writing + self._pending
+            size = self._written_size
+        written = read_records(self.records_path, size)
+        return written + b''.join(RECORD.pack(identifier, answer_time, 0, latency,
+                                              status, typos, is_reversed)
+                                  for identifier, answer_time, latency, status, typos, is_reversed, _ in waiting)
+
+
+    def word_stats(self, word: Word) -> WordStats:
+        '''
+        Returns statistics of answers
+        to word, including answers of current session.
+
+        Parameters:
+        -----------
+            word: Word
+                word of vocabulary
+        '''
+        if not self.stats:
+            return WordStats()
+        return self.stats.get(word_id(word), WordStats())
+
+
+    def record(self, word: Word,
+                     typed_answer: str,
+                     status: int,
+                     typos: Optional[int],
+                     latency: float,
+                     is_reversed: bool = False) -> None:
+        '''
+        Adds answer to journal;
+        it is written by worker thread later.
+
+        Parameters:
+        -----------
+            word: Word
+                answered word
+
+            typed_answer: str
+                text, that user typed
+
+            status: int
+                result of checking, CORRECT or WRONG
+
+            typos: int
+                number of typos in accepted answer, None if answer is wrong
+
+            latency: float
+                time in seconds from showing of question to checking of answer
+
+            is_reversed: bool
+                represents boolean value, if translation was asked
+        '''
+        identifier = word_id(word)
+        if self._stats is not None:
+            attempts, errors = self._stats.get(identifier, WordStats())
+            self._stats[identifier] = WordStats(attempts + 1, errors + (status == WRONG))
+        entry = (identifier, time.time(), latency, status,
+                 NOT_TYPO if typos is None else min(typos, NOT_TYPO - 1),
+                 int(is_reversed), typed_answer)
+        with self._condition:
+            self._pending.append(entry)
+            if len(self._pending) >= FLUSH_BATCH_SIZE:
+                self._condition.notify()
+
+
+    def _write_loop(self) -> None:
+        while True:
+            with self._condition:
+                if not self._is_closed:
+                    self._condition.wait(self.flush_interval)
+                is_closed = self._is_closed
+            self.flush()
+            if is_closed:
+                return
+
+
+    def flush(self) -> None:
+        '''
+        Writes recorded answers
+        and syncs files with disk.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        with self._write_lock:
+            with self._condition:
+                pending, self._pending = self._pending, []
+                self._writing = pending
+            if not pending:
+                return
+            if self._records_file is None:
+                self._records_file = open(self.records_path, 'ab')
+                self._answers_file = open(self.answers_path, 'ab')
+                size = self._records_file.tell()
+                if size % RECORD.size:
+                    # records, appended after torn one, would be read shifted
+                    self._records_file.truncate(size - size % RECORD.size)
+                with self._condition:
+                    self._written_size = size - size % RECORD.size
+            offset = self._answers_file.tell()
+            records = []
+            answers = []
+            for identifier, answer_time, latency, status, typos, is_reversed, typed_answer in pending:
+                answer = typed_answer.replace('\n', ' ').encode('utf-8') + b'\n'
+                records.append(RECORD.pack(identifier, answer_time, offset, latency,
+                                           status, typos, is_reversed))
+                answers.append(answer)
+                offset += len(answer)
+            # answers are written first, so every written record has its answer
+            self._answers_file.write(b''.join(answers))
+            self._answers_file.flush()
+            os.fsync(self._answers_file.fileno())
+            records = b''.join(records)
+            self._records_file.write(records)
+            self._records_file.flush()
+            os.fsync(self._records_file.fileno())
+            with self._condition:
+                self._written_size += len(records)
+                self._writing = []
+
+
+    def close(self) -> None:
+        '''
+        Writes recorded answers,
+        stops worker thread and closes files.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        with self._condition:
+            if self._is_closed:
+                return
+            self._is_closed = True
+            self._condition.notify()
+        self._writer.join()
+        with self._write_lock:
+            if self._records_file is not None:
+                self._records_file.close()
+                self._answers_file.close()
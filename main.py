@@ -1,27 +1,15 @@
 import os
 import sys
-import json
-import random
-import logging
-from typing import Dict, List
-from dataclasses import dataclass
+import argparse
+from typing import List
 
-from PySide6 import QtWidgets
+from PySide6 import (QtWidgets,
+                     QtCore)
 
-from frames import (QuestionFrame,
-                    ResultsFrame)
+from options import add_arguments
 
 
-@dataclass
-class SequenceIndexes:
-    def __init__(self, list) -> None:
-        self.list = list
-        self.init_indexes()
-    
-    def init_indexes(self):
-        self.start_index: int = 0
-        self.stop_index: int = len(self.list) - 1
-    
+RELOAD_DELAY_MS = 300
 
 class MainWindow(QtWidgets.QWidget):
     '''
@@ -30,160 +18,438 @@ class MainWindow(QtWidgets.QWidget):
 
     Attributes:
     -----------
-        Doesn't have
+        options: argparse.Namespace
+            command line options
+
+        engine: QuizEngine
+            quiz engine with vocabulary and state of current quiz session,
+            it is created with content of window
+
+        loader: VocabularyLoader
+            task, that parses vocabulary json in worker thread, None if it isn't needed
+
+        thread_pool: QtCore.QThreadPool
+            own pool for background tasks of window; global pool isn't used,
+            because Qt uses it itself while painting, and long loading would block painting
+
+        loading_label: QtWidgets.QLabel
+            label, that is shown in window shell until first question is shown
+
+        question_frame: QuestionFrame
+            the only question frame, that is rebound to current question
+
+        navigator_frame: NavigatorFrame
+            side panel, that jumps to questions by number or found word,
+            it is shown by "search" button of question frame
+
+        results_frame: ResultsFrame
+            frame with results of quiz session
+
+        watcher: QtCore.QFileSystemWatcher
+            watcher of vocabulary json, None if it isn't reloaded
+
+        reloader: VocabularyReloader
+            task, that parses changed vocabulary json, None if it isn't running
+
+        reload_snapshot: dict
+            translations of words of the last loaded version of vocabulary json by their keys,
+            None until the first reload
+
+    Signals:
+    --------
+        content_built:
+            emitted, when first question or results are shown
 
     Methods:
     --------
+        start() -> None:
+
         run() -> None:
 
+        build_content() -> None:
+
+        show_question(current_frame_index) -> None:
+
+        show_results() -> None:
+
+        reload_vocabulary() -> None:
+
+        apply_reload(diff, snapshot) -> None:
+
+        load_store_batch() -> None:
+
     '''
-    def __init__(self) -> None:
+    content_built = QtCore.Signal()
+
+    def __init__(self, options: argparse.Namespace = None) -> None:
         super().__init__()
+        self.options = options or parse_arguments([])
         self.setWindowTitle("Vocabulary tester")
         self.resize(500, 100)
         self.layout: QtWidgets.QHBoxLayout = QtWidgets.QHBoxLayout()
-        self.number_of_question_frames = 0
-        self.number_of_correct_answers = 0
-        self.last_frame_index = 0
+        self.engine = None
+        self.loader = None
+        self.watcher = None
+        self.reloader = None
+        self.reload_snapshot = None
+        self.is_reload_pending = False
+        self.thread_pool = QtCore.QThreadPool(parent = self)
+        self.loading_label = QtWidgets.QLabel("Ładowanie...", parent = self)
+        self.layout.addWidget(self.loading_label, alignment = QtCore.Qt.AlignmentFlag.AlignCenter)
         self.setLayout(self.layout)
 
 
+    def start(self):
+        '''
+        Shows window shell at once,
+        content of window is built, when event loop is started.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        self.show()
+        QtCore.QTimer.singleShot(0, self.build_content)
+
+
     def run(self):
         '''
-        Creates frames, that contains question and navigation widgets
-        in random order.
+        Shows window and builds its content
+        without waiting for event loop.
 
         Parameters:
         -----------
             Doesn't have
         '''
         self.show()
+        self.build_content()
 
-        vocabulary = self.get_vocabulary(language = 'pl')
-        random_sequence_of_question = random.sample(
-                                                    range(len(vocabulary)),
-                                                    len(vocabulary)
-                                                    )
-        sequence_entry_points = SequenceIndexes(random_sequence_of_question)
-        self.last_frame_index = sequence_entry_points.stop_index
-        self._create_frames_by_words_in_vocabulary(random_sequence_of_question = random_sequence_of_question,
-                                                   vocabulary = vocabulary,
-                                                   sequence_entry_points = sequence_entry_points)
-    
 
-    def get_vocabulary(self, language: str) -> List:
+    def build_content(self):
+        '''
+        Imports quiz modules, creates frames, that contains question and navigation widgets.
+        Opens vocabulary and shows first question as soon as it is available;
+        if vocabulary json has to be parsed, it is parsed in worker thread
+        and words are added to quiz session by batches.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        from engine import QuizEngine
+
+        self.engine = QuizEngine(self.options)
+        self._create_navigator_frame()
+        self._create_question_frame()
+        self._create_results_frame()
+        self.engine.open(stream = False)
+        if self.engine.is_loading:
+            self._start_loader()
+        else:
+            self._show_first_question()
+            self._start_watcher()
+
+
+    def _start_loader(self) -> None:
+        from engine import (FIRST_BATCH_SIZE,
+                            BATCH_SIZE)
+        from workers import (VocabularyLoader,
+                             DecksLoader)
+
+        if self.options.database:
+            # connection of SQLite store belongs to GUI thread, its batches are read between events
+            self._show_loaded_words()
+            QtCore.QTimer.singleShot(0, self.load_store_batch)
+            return
+        # answers are normalized in worker thread only for index of reverse and mixed sessions,
+        # otherwise they are normalized, when word is asked
+        normalize = None if self.engine.index is None else self.engine.matcher.normalize_answers
+        if self.options.decks:
+            self.loader = DecksLoader(self.options.decks,
+                                      batch_size = BATCH_SIZE,
+                                      normalize = normalize,
+                                      sample_size = self.options.size,
+                                      random_generator = self.engine.random_generator)
+        else:
+            self.loader = VocabularyLoader(self.engine.vocabulary_path,
+                                           first_batch_size = FIRST_BATCH_SIZE,
+                                           batch_size = BATCH_SIZE,
+                                           normalize = normalize,
+                                           sample_size = self.options.size,
+                                           random_generator = self.engine.random_generator)
+        self.loader.signals.batch_loaded.connect(self.add_words_batch)
+        self.loader.signals.progress.connect(self.question_frame.progress_bar.setValue)
+        self.loader.signals.finished.connect(self.finish_loading)
+        self.loader.signals.failed.connect(lambda _: self.finish_loading())
+        self.thread_pool.start(self.loader)
+
+
+    def add_words_batch(self, words: List,
+                              normalized_answers: List) -> None:
         '''
-        Passes language abbreviature,
-        returns deserialized dictionary from json to py-dict,
-        which dynamically changes the type to "list" that contains
-        dictionaries with next keys:
-            question: text
-            answer: text
+        Adds batch of words, parsed in worker thread,
+        to quiz session; shows first question after first batch.
 
         Parameters:
-            language: str
-                language abbreviature, such as: (en, pl, ru, ua etc.)
+        -----------
+            words: List[Word]
+                batch of parsed words
+
+            normalized_answers: List[NormalizedAnswers]
+                accepted answers of words, normalized in worker thread
         '''
+        self.engine.add_words(words, normalized_answers)
+        self._show_loaded_words()
+
+
+    def load_store_batch(self) -> None:
+        '''
+        Reads next batch of words of SQLite store by indexed query
+        and adds them to quiz session; next batch is read after pending events,
+        so window stays responsive.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        if not self.isVisible() or not self.engine.is_loading:
+            return
+        self.engine.load_words_batch()
+        if not self.engine.is_loading:
+            self.finish_loading(self.engine.parse_seconds)
+            return
+        self.question_frame.progress_bar.setValue(len(self.engine.vocabulary) * 100
+                                                  // max(self.engine.vocabulary.count, 1))
+        self._show_loaded_words()
+        QtCore.QTimer.singleShot(0, self.load_store_batch)
+
+
+    def _show_loaded_words(self) -> None:
+        if self.loading_label.isHidden():
+            self.question_frame.update_nav_menu()
+            self.navigator_frame.update_range()
+        elif len(self.engine.session):
+            self._show_first_question()
+
+
+    def finish_loading(self, parse_seconds: float = 0.0) -> None:
+        '''
+        Marks vocabulary as loaded,
+        caches it in worker thread.
+
+        Parameters:
+        -----------
+            parse_seconds: float
+                time, that parsing took; not passed, if loading failed
+        '''
+        from workers import Task
+
+        self.engine.parse_seconds = parse_seconds
+        self.engine.finish_loading(store_cache = False)
+        self.thread_pool.start(Task(self.engine.store_cache))
+        if self.loading_label.isHidden():
+            self.question_frame.update_nav_menu()
+        else:
+            self._show_first_question()
+        self._start_watcher()
+
+
+    def _start_watcher(self) -> None:
+        path = self.engine.vocabulary_path
+        if self.options.no_reload or self.options.database or self.options.decks or not os.path.exists(path):
+            return
+        self.reload_timer = QtCore.QTimer(self)
+        self.reload_timer.setSingleShot(True)
+        self.reload_timer.setInterval(RELOAD_DELAY_MS)
+        self.reload_timer.timeout.connect(self.reload_vocabulary)
+        self.watcher = QtCore.QFileSystemWatcher([path], self)
+        # editor writes file by several steps, so vocabulary is reloaded, when writing stops
+        self.watcher.fileChanged.connect(lambda _: self.reload_timer.start())
+
+
+    def reload_vocabulary(self) -> None:
+        '''
+        Parses changed vocabulary json in worker thread
+        and compares it with previous version.
+        Only one reload runs at once: change, made while it runs,
+        is reloaded after it.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        from workers import VocabularyReloader
+
+        path = self.engine.vocabulary_path
+        # editors, that save file by renaming of new one, replace watched file
+        if path not in self.watcher.files() and os.path.exists(path):
+            self.watcher.addPath(path)
+        if self.reloader is not None:
+            self.is_reload_pending = True
+            return
+        if self.reload_snapshot is None:
+            self.reload_snapshot = self.engine.vocabulary_snapshot()
+        self.reloader = VocabularyReloader(path, self.reload_snapshot)
+        self.reloader.signals.reloaded.connect(self.apply_reload)
+        self.reloader.signals.failed.connect(lambda _: self._finish_reload())
+        self.thread_pool.start(self.reloader)
+
+
+    def apply_reload(self, diff, snapshot) -> None:
+        '''
+        Applies changes of reloaded vocabulary json
+        to quiz session and rebinds displayed question,
+        keeping text, that user typed.
+
+        Parameters:
+        -----------
+            diff: VocabularyDiff
+                added, removed and changed words
+
+            snapshot: dict
+                translations of words of reloaded version by their keys
+        '''
+        self.reload_snapshot = snapshot
         try:
-            with open('%s/vocabulary_%s.json' % (os.getcwd(), language)) as vocabulary:
-                vocabulary: Dict = json.load(vocabulary)
-            return list(
-                        vocabulary.values()
-                        )[0]
-        except FileNotFoundError:
-            logging.exception("Vocabulary with this language doesn't exist.")
+            if diff:
+                self._save_typed_answer()
+                self.engine.apply_diff(diff)
+                if not self.question_frame.isHidden():
+                    self.question_frame.bind(self.question_frame.current_frame_index)
+                    self.navigator_frame.update_range()
+                elif not self.results_frame.isHidden():
+                    self.results_frame.update_results()
+        finally:
+            # reloading goes on after failed diff, otherwise watcher would be ignored till exit
+            self._finish_reload()
 
-    
-    def _create_question_frame(self, current_frame_index,
-                                     question: str,
-                                     answer: str,
-                                     is_first: bool = False,
-                                     is_last: bool = False) -> None:
+
+    def _finish_reload(self) -> None:
+        self.reloader = None
+        if self.is_reload_pending:
+            self.is_reload_pending = False
+            self.reload_vocabulary()
+
+
+    def _show_first_question(self) -> None:
+        self.loading_label.hide()
+        if len(self.engine.session):
+            self.show_question(0)
+        else:
+            self.show_results()
+        self.content_built.emit()
+
+
+    def closeEvent(self, event) -> None:
+        if self.loader is not None:
+            self.loader.cancel()
+        if self.engine is not None:
+            self.engine.close()
+        super().closeEvent(event)
+
+
+    def show_question(self, current_frame_index: int) -> None:
         '''
-        Creates QuestionFrame object.
-        Hides it from main window layout.
+        Saves text, that user typed for displayed question,
+        binds question with passed index to question frame.
+        Question is shown by its number in session, so jump to any question
+        costs the same as step to the next one.
+        Number out of session, such as from results of empty session, is ignored.
 
         Parameters:
         -----------
             current_frame_index: int
-                index of current frame
+                number of question in order
+        '''
+        if not 0 <= current_frame_index < len(self.engine.session):
+            return
+        self._save_typed_answer()
+        self.engine.mark_shown(current_frame_index)
+        self.question_frame.bind(current_frame_index)
+        self.navigator_frame.update_range()
+        self.results_frame.hide()
+        self.navigator_frame.setVisible(self.question_frame.button_navigator.isChecked())
+        self.question_frame.show()
 
-            answer: str
-                answer for current question on frame
 
-            is_first: bool
-                represents boolean value, if parent frame is first question
-                used only for the correct location of the "OK" and "Next" buttons
+    def show_results(self) -> None:
+        '''
+        Saves text, that user typed for displayed question,
+        hides question frame, shows frame with results.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        self._save_typed_answer()
+        self.question_frame.hide()
+        self.navigator_frame.hide()
+        self.results_frame.update_results()
+        self.results_frame.show()
 
-            is_last: bool
-                represents boolean value, if parent frame is last question
-                used only for the correct location of the "Back", "OK" and "Results" buttons
-                
 
+    def _save_typed_answer(self) -> None:
+        if not self.question_frame.isHidden():
+            self.engine.session.set_typed_answer(self.question_frame.current_frame_index,
+                                                 self.question_frame.input_line.text())
+
+
+    def _create_navigator_frame(self) -> None:
+        from frames import NavigatorFrame
+
+        self.navigator_frame = NavigatorFrame(main_window = self)
+        self.navigator_frame.hide()
+        self.layout.addWidget(self.navigator_frame)
+
+    
+    def _create_question_frame(self) -> None:
+        '''
+        Creates the only QuestionFrame object,
+        which is rebound to every question of session.
+        Hides it from main window layout.
+
+        Parameters:
+        -----------
+            Doesn't have
         '''
-        frame = QuestionFrame(question = question, answer = answer,
-                              is_first = is_first, is_last = is_last,
-                              currect_frame_index = current_frame_index,
-                              main_window = self)
-        self.layout.addWidget(frame)
-        frame.hide()
+        from frames import QuestionFrame
+
+        self.question_frame = QuestionFrame(main_window = self)
+        self.layout.addWidget(self.question_frame)
+        self.question_frame.hide()
 
     
     def _create_results_frame(self):
-        self.results_frame = ResultsFrame(self.last_frame_index + 1, self)
+        from frames import ResultsFrame
+
+        self.results_frame = ResultsFrame(len(self.engine.session), self)
         self.results_frame.hide()
         self.layout.addWidget(self.results_frame)
 
-    
-    def _create_frames_by_words_in_vocabulary(self, random_sequence_of_question: List,
-                                                    vocabulary: Dict,
-                                                    sequence_entry_points: SequenceIndexes):
-        '''
-        Extracts foreign word, its translation from vocabulary.
-        Creates a new frame based on its index.
 
-        Parameters:
-        -----------
-            random_sequence_of_question: list
-                list, that represents mixed indexes of question from "vocabulary_{lang}.json"
-
-            vocabulary: dict
-                dictionary, that represents vocabulary json
-
-            sequence_entry_points:
-                dataclass, that represents entrypoint (0 index) and endpoint(last index) of random_sequence_of_question \
-        '''
-        for frame_index, random_question_index in enumerate(random_sequence_of_question):
-            
-            question = vocabulary[random_question_index]['foreign_word']
-            answer = vocabulary[random_question_index]['translation']
-            match frame_index:
-                case sequence_entry_points.start_index:
-                    self._create_question_frame(question = question,
-                                                answer = answer,
-                                                is_first = True,
-                                                current_frame_index = frame_index)
-                    self.layout.itemAt(sequence_entry_points.start_index).widget().show()
-
-                case sequence_entry_points.stop_index:
-                    self._create_question_frame(question = question,
-                                                answer = answer,
-                                                is_last = True,
-                                                current_frame_index = frame_index)
-
-                case _:
-                    self._create_question_frame(question = question,
-                                                answer = answer,
-                                                current_frame_index = frame_index)
-            self.number_of_question_frames += 1
-        self._create_results_frame()
+def parse_arguments(arguments: List[str] = None) -> argparse.Namespace:
+    '''
+    Parses command line options.
+
+    Parameters:
+    -----------
+        arguments: List[str]
+            command line arguments, by default they are taken from sys.argv
+    '''
+    parser = argparse.ArgumentParser(description = 'Vocabulary tester')
+    add_arguments(parser)
+    return parser.parse_args(arguments)
 
 
 def main() -> None:
+    options = parse_arguments()
     app = QtWidgets.QApplication()
-    window = MainWindow()
-    window.run()
-    sys.exit(app.exec())
+    window = MainWindow(options)
+    window.start()
+    exit_code = app.exec()
+    if options.cache_stats and window.engine.cache is not None:
+        print(window.engine.cache.report())
+    sys.exit(exit_code)
 
 
 if __name__ == '__main__':
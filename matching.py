@@ -0,0 +1,430 @@
+'''
+Tolerant matching of answers.
+
+Answer and typed text are compared after normalization: Unicode NFKC form,
+case folding, folding of diacritics and collapsing of whitespaces.
+Small typos are accepted by Levenshtein distance, which is counted
+only inside band of allowed distance and stops, as soon as it is exceeded.
+Expected answers are normalized once, when vocabulary is loaded;
+word with several accepted answers keeps them in AnswerSet,
+so exact match is one hashed lookup, however many answers word has,
+and typos in answer to word with many answers are looked for in trie.
+While answer is being typed, PrefixTracker follows it in trie of answers
+letter by letter, so every keystroke costs O(1) in length of answer.
+'''
+import re
+import unicodedata
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple, Union
+
+from vocabulary import split_answers
+
+
+# letters, that don't decompose into base letter and combining mark
+_LETTERS_WITHOUT_DIACRITICS = str.maketrans({
+    'ł': 'l', 'Ł': 'L',
+    'đ': 'd', 'Đ': 'D',
+    'ø': 'o', 'Ø': 'O',
+    'ħ': 'h', 'Ħ': 'H',
+    'ı': 'i',
+    'ґ': 'г', 'Ґ': 'Г',
+})
+_combining_marks = re.compile(r'[\u0300-\u036f]')
+
+# answer sets with more answers look for typos in trie instead of comparing answers one by one
+TRIE_MIN_ANSWERS = 8
+# key of trie node, that marks end of answer; letters are never empty
+_END = ''
+
+# states of typed text, that are returned by PrefixTracker
+PREFIX = 0
+COMPLETE = 1
+MISMATCH = 2
+
+
+class MatchingRules(NamedTuple):
+    '''
+    Class, that represents
+    rules of matching of answers.
+
+    Attributes:
+    -----------
+        fold_case: bool
+            represents boolean value, if letter case is ignored
+
+        fold_diacritics: bool
+            represents boolean value, if letters with diacritics match letters without them
+
+        max_typos: int
+            max number of typos (inserted, removed or replaced letters) in accepted answer
+
+        letters_per_typo: int
+            one typo is allowed on every such number of letters of answer,
+            so short words have to be typed exactly
+    '''
+    fold_case: bool = True
+    fold_diacritics: bool = True
+    max_typos: int = 1
+    letters_per_typo: int = 5
+
+
+def _common_prefix_length(first: str,
+                          second: str) -> int:
+    # binary search with comparison of slices is done in C,
+    # so long phrases with typo at the end are not compared letter by letter in python
+    low, high = 0, min(len(first), len(second))
+    while low < high:
+        middle = (low + high + 1) // 2
+        if first[:middle] == second[:middle]:
+            low = middle
+        else:
+            high = middle - 1
+    return low
+
+
+def bounded_levenshtein(first: str,
+                        second: str,
+                        max_distance: int) -> Optional[int]:
+    '''
+    Returns Levenshtein distance between texts,
+    or None, if it exceeds max_distance.
+    Only cells inside diagonal band of width max_distance are counted,
+    and counting stops, when all cells of row exceed max_distance.
+
+    Parameters:
+    -----------
+        first: str
+            the first text
+
+        second: str
+            the second text
+
+        max_distance: int
+            max distance, that is counted
+    '''
+    if first == second:
+        return 0
+    if abs(len(first) - len(second)) > max_distance:
+        return None
+    prefix = _common_prefix_length(first, second)
+    first = first[prefix:]
+    second = second[prefix:]
+    suffix = _common_prefix_length(first[::-1], second[::-1])
+    first = first[:len(first) - suffix]
+    second = second[:len(second) - suffix]
+    if not first or not second:
+        return max(len(first), len(second))
+
+    too_far = max_distance + 1
+    length = len(second)
+    previous = [column if column <= max_distance else too_far for column in range(length + 1)]
+    for row, letter in enumerate(first, 1):
+        current = [too_far] * (length + 1)
+        if row <= max_distance:
+            current[0] = row
+        row_minimum = current[0]
+        for column in range(max(1, row - max_distance), min(length, row + max_distance) + 1):
+            distance = min(previous[column - 1] + (letter != second[column - 1]),
+                           previous[column] + 1,
+                           current[column - 1] + 1)
+            current[column] = distance
+            if distance < row_minimum:
+                row_minimum = distance
+        if row_minimum > max_distance:
+            return None
+        previous = current
+    return previous[length] if previous[length] <= max_distance else None
+
+
+class AnswerTrie:
+    '''
+    Class, that represents
+    prefix tree of answers; every node is dict of child nodes by letter.
+
+    Methods:
+    --------
+        add(answer) -> None:
+            adds answer to tree.
+
+        closest_distance(text, max_distance, letters_per_distance) -> Optional[int]:
+            returns the least Levenshtein distance between text and any answer.
+    '''
+    def __init__(self, answers: Iterable[str] = ()) -> None:
+        self.root: Dict = {}
+        for answer in answers:
+            self.add(answer)
+
+
+    def add(self, answer: str) -> None:
+        '''
+        Adds answer to tree.
+
+        Parameters:
+        -----------
+            answer: str
+                normalized answer
+        '''
+        node = self.root
+        for letter in answer:
+            node = node.setdefault(letter, {})
+        node[_END] = True
+
+
+    def closest_distance(self, text: str,
+                               max_distance: int,
+                               letters_per_distance: int = 0) -> Optional[int]:
+        '''
+        Returns the least Levenshtein distance between text
+        and any answer in tree, or None, if it exceeds max_distance.
+        One row of distances inside band of max_distance is counted for every node,
+        so common prefixes of answers are counted once, and branch is skipped,
+        as soon as all its distances exceed max_distance.
+        If letters_per_distance is passed, distance to every answer is bounded
+        by its own length too, as answers are compared one by one.
+
+        Parameters:
+        -----------
+            text: str
+                normalized typed answer
+
+            max_distance: int
+                max distance, that is counted
+
+            letters_per_distance: int
+                answer allows one unit of distance on every such number of its letters,
+                0 if only max_distance bounds it
+        '''
+        least_distance = None
+        length = len(text)
+        too_far = max_distance + 1
+        first_row = [column if column <= max_distance else too_far for column in range(length + 1)]
+        stack = [(child, letter, 1, first_row) for letter, child in self.root.items() if letter]
+        while stack:
+            node, letter, depth, previous_row = stack.pop()
+            current_row = [too_far] * (length + 1)
+            if depth <= max_distance:
+                current_row[0] = depth
+            for column in range(max(1, depth - max_distance), min(length, depth + max_distance) + 1):
+                current_row[column] = min(current_row[column - 1] + 1,
+                                          previous_row[column] + 1,
+                                          previous_row[column - 1] + (text[column - 1] != letter))
+            distance = current_row[length]
+            # depth of node, that ends answer, is length of answer
+            if _END in node and distance <= max_distance \
+                    and (not letters_per_distance or distance <= depth // letters_per_distance):
+                if least_distance is None or distance < least_distance:
+                    least_distance = distance
+                    max_distance = distance
+            if min(current_row) <= max_distance:
+                stack.extend((child, child_letter, depth + 1, current_row)
+                             for child_letter, child in node.items() if child_letter)
+        return least_distance
+
+
+class AnswerSet(frozenset):
+    '''
+    Class, that represents
+    several accepted answers of one word;
+    trie of answers is built on the first search of typos.
+    '''
+    __slots__ = ('_trie',)
+
+
+    @property
+    def trie(self) -> AnswerTrie:
+        try:
+            return self._trie
+        except AttributeError:
+            self._trie = AnswerTrie(self)
+            return self._trie
+
+
+# one normalized answer is kept as text, several ones as AnswerSet
+NormalizedAnswers = Union[str, AnswerSet]
+
+
+class AnswerMatcher:
+    '''
+    Class, that represents
+    matching of typed answers with expected ones by passed rules.
+
+    Attributes:
+    -----------
+        rules: MatchingRules
+            rules of matching
+
+    Methods:
+    --------
+        normalize(text) -> str:
+            returns text in form, in which answers are compared.
+
+        normalize_answers(translation) -> NormalizedAnswers:
+            returns normalized accepted answers from translation of word.
+
+        match(user_answer, normalized_answers) -> Optional[int]:
+            returns number of typos in accepted answer, or None, if answer is wrong.
+    '''
+    def __init__(self, rules: MatchingRules = MatchingRules()) -> None:
+        self.rules = rules
+
+
+    def normalize(self, text: str) -> str:
+        '''
+        Returns text in form,
+        in which answers are compared.
+
+        Parameters:
+        -----------
+            text: str
+                expected or typed answer
+        '''
+        if text.isascii():
+            if self.rules.fold_case:
+                text = text.lower()
+            return ' '.join(text.split())
+        text = unicodedata.normalize('NFKC', text)
+        if self.rules.fold_case:
+            text = text.casefold()
+        if self.rules.fold_diacritics:
+            text = _combining_marks.sub('', unicodedata.normalize('NFD', text))
+            text = unicodedata.normalize('NFC', text.translate(_LETTERS_WITHOUT_DIACRITICS))
+        return ' '.join(text.split())
+
+
+    def normalize_answers(self, translation: str) -> NormalizedAnswers:
+        '''
+        Returns normalized accepted answers
+        from translation of word: text, if there is one answer,
+        or AnswerSet of texts, if there are several ones.
+
+        Parameters:
+        -----------
+            translation: str
+                translation of word, answers are separated by ANSWER_SEPARATOR
+        '''
+        answers = split_answers(translation)
+        if len(answers) == 1:
+            return self.normalize(answers[0])
+        return AnswerSet(map(self.normalize, answers))
+
+
+    def match(self, user_answer: str,
+                    normalized_answers: NormalizedAnswers) -> Optional[int]:
+        '''
+        Returns number of typos in typed answer,
+        if it is accepted, or None, if answer is wrong.
+        Exact match is checked by one comparison or hashed lookup,
+        typos are counted only for answers of close length,
+        or in trie, if word has many answers.
+
+        Parameters:
+        -----------
+            user_answer: str
+                text, that user typed
+
+            normalized_answers: NormalizedAnswers
+                accepted answers, normalized by normalize_answers()
+        '''
+        normalized_user_answer = self.normalize(user_answer)
+        if isinstance(normalized_answers, str):
+            if normalized_user_answer == normalized_answers:
+                return 0
+            normalized_answers = (normalized_answers,)
+        elif normalized_user_answer in normalized_answers:
+            return 0
+        max_typos = self.rules.max_typos
+        if max_typos <= 0:
+            return None
+        if len(normalized_answers) >= TRIE_MIN_ANSWERS:
+            # accepted answer isn't longer than typed one with max typos,
+            # so its own number of allowed typos bounds search of whole trie
+            allowed_typos = min(max_typos,
+                                (len(normalized_user_answer) + max_typos) // self.rules.letters_per_typo)
+            if allowed_typos <= 0:
+                return None
+            return normalized_answers.trie.closest_distance(normalized_user_answer, allowed_typos,
+                                                            letters_per_distance = self.rules.letters_per_typo)
+        least_typos = None
+        length = len(normalized_user_answer)
+        for normalized_answer in normalized_answers:
+            allowed_typos = min(max_typos, len(normalized_answer) // self.rules.letters_per_typo)
+            if allowed_typos <= 0 or abs(len(normalized_answer) - length) > allowed_typos:
+                continue
+            typos = bounded_levenshtein(normalized_user_answer, normalized_answer, allowed_typos)
+            if typos is not None and (least_typos is None or typos < least_typos):
+                least_typos = typos
+        return least_typos
+
+
+class PrefixTracker:
+    '''
+    Class, that represents
+    incremental matching of text, that is being typed, with accepted answers.
+
+    For every typed letter node of trie of answers is kept, which is reached
+    by normalized text until this letter, so appended or removed letters
+    are matched in O(1), and only changed part of text is matched after other edits.
+    Spaces are matched lazily: they are skipped at the beginning and at the end,
+    and several spaces in a row match one space.
+
+    Attributes:
+    -----------
+        matcher: AnswerMatcher
+            matcher, which rules are used for normalization of letters
+
+        text: str
+            text, that current state belongs to
+
+    Methods:
+    --------
+        update(text) -> int:
+            returns state of typed text: PREFIX, COMPLETE or MISMATCH.
+    '''
+    def __init__(self, matcher: AnswerMatcher,
+                       normalized_answers: NormalizedAnswers) -> None:
+        self.matcher = matcher
+        if isinstance(normalized_answers, str):
+            self._trie = AnswerTrie((normalized_answers,))
+        else:
+            self._trie = normalized_answers.trie
+        self.text = ''
+        # node of trie and flag of pending space after every typed letter
+        self._states: List[Tuple[Optional[Dict], bool]] = [(self._trie.root, False)]
+
+
+    def _append(self, letter: str) -> None:
+        node, is_space_pending = self._states[-1]
+        if letter.isspace():
+            self._states.append((node, node is not self._trie.root))
+            return
+        if node is not None:
+            if is_space_pending:
+                node = node.get(' ')
+            for normalized_letter in self.matcher.normalize(letter):
+                if node is None:
+                    break
+                node = node.get(normalized_letter)
+        self._states.append((node, False))
+
+
+    def update(self, text: str) -> int:
+        '''
+        Matches changed part of text
+        and returns its state: PREFIX, if text can be continued to accepted answer,
+        COMPLETE, if it is accepted answer, or MISMATCH otherwise.
+
+        Parameters:
+        -----------
+            text: str
+                whole text of input line
+        '''
+        common_length = _common_prefix_length(self.text, text)
+        del self._states[common_length + 1:]
+        for letter in text[common_length:]:
+            self._append(letter)
+        self.text = text
+        node, _ = self._states[-1]
+        if node is None:
+            return MISMATCH
+        if _END in node:
+            return COMPLETE
+        return PREFIX
@@ -0,0 +1,65 @@
+'''
+Command line options, shared by Qt window and command line runner.
+Module doesn't import anything heavy, so options are parsed before
+Qt and vocabulary modules are imported.
+'''
+import argparse
+
+
+def _positive_int(text: str) -> int:
+    value = int(text)
+    if value <= 0:
+        raise argparse.ArgumentTypeError('%s is not a positive number' % text)
+    return value
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    '''
+    Adds options of quiz engine
+    to command line parser.
+
+    Parameters:
+    -----------
+        parser: argparse.ArgumentParser
+            parser of Qt window or command line runner
+    '''
+    parser.add_argument('--language', default = 'pl',
+                        help = 'language abbreviature of vocabulary, such as: en, pl, ru, ua')
+    parser.add_argument('--decks', nargs = '+', metavar = 'PATH',
+                        help = 'vocabulary json files or directories with vocabulary_*.json files, '
+                               'that are parsed in parallel and merged into one session instead of vocabulary of language')
+    parser.add_argument('--database',
+                        help = 'path to SQLite vocabulary store, that is used instead of json')
+    parser.add_argument('--no-cache', action = 'store_true',
+                        help = "don't use cache of parsed vocabularies")
+    parser.add_argument('--cache-stats', action = 'store_true',
+                        help = 'print hits, misses and time saved by cache of parsed vocabularies on exit')
+    parser.add_argument('--no-reload', action = 'store_true',
+                        help = "don't reload vocabulary json, when it is changed while quiz is running")
+    parser.add_argument('--schedule',
+                        help = 'path to database with spaced repetition cards, '
+                               'by default it is kept in ~/.local/share/voctester')
+    parser.add_argument('--no-schedule', action = 'store_true',
+                        help = "don't use spaced repetition: ask all words in random order and don't save answers")
+    parser.add_argument('--size', type = _positive_int,
+                        help = 'number of questions in session, words are sampled randomly '
+                               'while vocabulary is read, so big vocabulary is never kept in memory')
+    parser.add_argument('--seed', type = int,
+                        help = 'seed of random numbers, session with the same seed and vocabulary is the same')
+    parser.add_argument('--journal',
+                        help = 'directory of journals of answers, by default it is ~/.local/share/voctester/journal')
+    parser.add_argument('--no-journal', action = 'store_true',
+                        help = "don't record answers to journal")
+    parser.add_argument('--weighted', action = 'store_true',
+                        help = 'pick questions by error rates of words, so words, that are often answered wrong, '
+                               'are asked more often; words can be repeated and due time of words is ignored')
+    parser.add_argument('--direction', choices = ('forward', 'reverse', 'mixed'), default = 'forward',
+                        help = 'forward asks foreign words, reverse asks translations, mixed asks both in random order')
+    parser.add_argument('--max-typos', type = int, default = 1,
+                        help = 'max number of typos in accepted answer, one typo is allowed on every 5 letters')
+    parser.add_argument('--keep-case', action = 'store_true',
+                        help = 'answers with different letter case are wrong')
+    parser.add_argument('--live', action = 'store_true',
+                        help = 'color input line while answer is typed: correct beginning, wrong or complete answer')
+    parser.add_argument('--keep-diacritics', action = 'store_true',
+                        help = 'answers without diacritics, such as "zolw" instead of "żółw", are wrong')
@@ -0,0 +1,234 @@
+'''
+Table of answers for review of quiz session.
+
+Model doesn't copy questions: it keeps only positions of shown rows
+in session, texts are read from quiz engine, when view paints them.
+Rows are given to view by batches through fetchMore, so session
+with tens of thousands of questions is shown at once; filtering and sorting
+reorder positions of all rows, not only fetched ones.
+'''
+from array import array
+from typing import Any, List
+
+from PySide6 import (QtCore,
+                     QtGui)
+
+from session import (NOT_CHECKED,
+                     CORRECT,
+                     WRONG,
+                     EMPTY)
+
+
+FETCH_BATCH_SIZE = 200
+
+HEADERS = ("Pytanie", "Poprawna odpowiedź", "Twoja odpowiedź", "Wynik")
+STATUS_TEXTS = {
+    NOT_CHECKED: "Nie sprawdzona",
+    CORRECT: "Poprawna",
+    WRONG: "Niepoprawna",
+    EMPTY: "Brak odpowiedzi",
+}
+STATUS_COLORS = {
+    CORRECT: "#d5f5d5",
+    WRONG: "#f8d7d7",
+    EMPTY: "#f8d7d7",
+}
+
+
+class ReviewTableModel(QtCore.QAbstractTableModel):
+    '''
+    Class, that represents
+    questions of quiz session with expected and typed answers.
+
+    Attributes:
+    -----------
+        engine: QuizEngine
+            quiz engine, which session is reviewed
+
+        positions: array
+            positions of questions in session, that pass filter, in shown order
+
+        fetched: int
+            number of rows, that are given to view
+
+        filter_text: str
+            text, that question or expected answer must contain, in case-folded form
+
+        only_mistakes: bool
+            represents boolean value, if only questions with wrong or empty answer are shown
+
+    Methods:
+    --------
+        refresh() -> None:
+            rereads questions of session, keeping filter and sort order.
+
+        set_filter(text, only_mistakes) -> None:
+            shows only questions, that pass filter.
+
+        position(row) -> int:
+            returns position in session of question in passed row.
+    '''
+    def __init__(self, engine,
+                       only_mistakes: bool = True,
+                       parent: QtCore.QObject = None) -> None:
+        super().__init__(parent)
+        self.engine = engine
+        self.positions = array('L')
+        self.fetched = 0
+        self.filter_text = ''
+        self.only_mistakes = only_mistakes
+        self._sort_column = None
+        self._sort_order = QtCore.Qt.SortOrder.AscendingOrder
+
+
+    def rowCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else self.fetched
+
+
+    def columnCount(self, parent: QtCore.QModelIndex = QtCore.QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(HEADERS)
+
+
+    def canFetchMore(self, parent: QtCore.QModelIndex) -> bool:
+        return not parent.isValid() and self.fetched < len(self.positions)
+
+
+    def fetchMore(self, parent: QtCore.QModelIndex) -> None:
+        if parent.isValid():
+            return
+        number_of_rows = min(FETCH_BATCH_SIZE, len(self.positions) - self.fetched)
+        if number_of_rows <= 0:
+            return
+        self.beginInsertRows(parent, self.fetched, self.fetched + number_of_rows - 1)
+        self.fetched += number_of_rows
+        self.endInsertRows()
+
+
+    def headerData(self, section: int,
+                         orientation: QtCore.Qt.Orientation,
+                         role: int = QtCore.Qt.ItemDataRole.DisplayRole) -> Any:
+        if role != QtCore.Qt.ItemDataRole.DisplayRole:
+            return None
+        if orientation == QtCore.Qt.Orientation.Horizontal:
+            return HEADERS[section]
+        return self.positions[section] + 1
+
+
+    def data(self, index: QtCore.QModelIndex,
+                   role: int = QtCore.Qt.ItemDataRole.DisplayRole) -> Any:
+        if not index.isValid():
+            return None
+        position = self.positions[index.row()]
+        match role:
+            case QtCore.Qt.ItemDataRole.DisplayRole:
+                return self._text(position, index.column())
+            case QtCore.Qt.ItemDataRole.BackgroundRole:
+                color = STATUS_COLORS.get(self.engine.session.status(position))
+                return None if color is None else QtGui.QColor(color)
+        return None
+
+
+    def _text(self, position: int,
+                    column: int) -> str:
+        match column:
+            case 0:
+                return self.engine.question(position)
+            case 1:
+                return self.engine.answer(position)
+            case 2:
+                return self.engine.session.typed_answer(position)
+            case _:
+                return STATUS_TEXTS[self.engine.session.status(position)]
+
+
+    def position(self, row: int) -> int:
+        '''
+        Returns position in session
+        of question in passed row.
+
+        Parameters:
+        -----------
+            row: int
+                row of table
+        '''
+        return self.positions[row]
+
+
+    def _filtered_positions(self) -> List[int]:
+        session = self.engine.session
+        if self.only_mistakes:
+            positions = session.wrong_positions()
+        else:
+            positions = range(len(session))
+        if not self.filter_text:
+            return positions
+        filter_text = self.filter_text
+        question = self.engine.question
+        answer = self.engine.answer
+        return [position for position in positions
+                if filter_text in question(position).casefold() or filter_text in answer(position).casefold()]
+
+
+    def _sort_key(self, column: int):
+        # column -1 means, that sorting is cleared, so questions go in order of session
+        match column:
+            case -1:
+                return None
+            case 0:
+                return lambda position: self.engine.question(position).casefold()
+            case 1:
+                return lambda position: self.engine.answer(position).casefold()
+            case 2:
+                return lambda position: self.engine.session.typed_answer(position).casefold()
+            case _:
+                return self.engine.session.status
+
+
+    def refresh(self) -> None:
+        '''
+        Rereads questions of session,
+        keeping filter and sort order; only the first batch of rows is fetched.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        self.beginResetModel()
+        positions = self._filtered_positions()
+        if self._sort_column is not None:
+            positions = sorted(positions,
+                               key = self._sort_key(self._sort_column),
+                               reverse = self._sort_order == QtCore.Qt.SortOrder.DescendingOrder)
+        self.positions = array('L', positions)
+        self.fetched = min(FETCH_BATCH_SIZE, len(self.positions))
+        self.endResetModel()
+
+
+    def set_filter(self, text: str,
+                         only_mistakes: bool) -> None:
+        '''
+        Shows only questions,
+        that pass filter.
+
+        Parameters:
+        -----------
+            text: str
+                text, that question or expected answer must contain, letter case is ignored
+
+            only_mistakes: bool
+                represents boolean value, if only questions with wrong or empty answer are shown
+        '''
+        self.filter_text = text.strip().casefold()
+        self.only_mistakes = only_mistakes
+        self.refresh()
+
+
+    def sort(self, column: int,
+                   order: QtCore.Qt.SortOrder = QtCore.Qt.SortOrder.AscendingOrder) -> None:
+        self._sort_column = column
+        self._sort_order = order
+        self.layoutAboutToBeChanged.emit()
+        self.positions = array('L', sorted(self.positions,
+                                           key = self._sort_key(column),
+                                           reverse = order == QtCore.Qt.SortOrder.DescendingOrder))
+        self.layoutChanged.emit()
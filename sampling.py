@@ -0,0 +1,249 @@
+'''
+Random sampling of words.
+
+Reservoir samples words from streamed vocabulary: only sampled words
+are kept in memory, however big vocabulary is, and words are passed by batches,
+so sampling goes together with parsing. Skips between replaced words
+are drawn at once (algorithm L), so random numbers are generated only for words,
+that get into reservoir, and cost of sampling is O(size * log(number of words / size)).
+
+WeightedPicker picks words with probability proportional to integer weights.
+Weights are kept in Fenwick tree of prefix sums, so both picking
+and change of weight after answer cost O(log n).
+'''
+import math
+import random
+from array import array
+from typing import Generic, Iterable, List, Sequence, TypeVar
+
+
+Item = TypeVar('Item')
+
+# weight of word, that is always answered wrong
+WEIGHT_SCALE = 1000
+
+
+def error_weight(answers: int,
+                 errors: int) -> int:
+    '''
+    Returns weight of word by its error rate,
+    smoothed by one wrong and one correct answer, so new word
+    has weight of word with half of wrong answers and weight is never zero.
+
+    Parameters:
+    -----------
+        answers: int
+            number of all answers to word
+
+        errors: int
+            number of wrong answers to word
+    '''
+    return (errors + 1) * WEIGHT_SCALE // (answers + 2)
+
+
+class Reservoir(Generic[Item]):
+    '''
+    Class, that represents
+    uniform random sample of fixed size from stream of unknown length.
+
+    Attributes:
+    -----------
+        size: int
+            max number of sampled items
+
+        items: list
+            sampled items; their order isn't random
+
+        count: int
+            number of items, that were passed to reservoir
+
+        random_generator: random.Random
+            generator of random numbers; generator with the same seed
+            samples the same items from the same stream
+
+    Methods:
+    --------
+        add(items) -> None:
+            passes next batch of stream to reservoir.
+    '''
+    def __init__(self, size: int,
+                       random_generator: random.Random = None) -> None:
+        self.size = size
+        self.items: List[Item] = []
+        self.count = 0
+        self.random_generator = random_generator or random.Random()
+        self._weight = 1.0
+        # index in stream of the next item, that replaces random sampled item
+        self._next_index = size - 1
+
+
+    def _uniform(self) -> float:
+        # random number in (0, 1), so its logarithm is finite
+        value = self.random_generator.random()
+        while value == 0.0:
+            value = self.random_generator.random()
+        return value
+
+
+    def _skip(self) -> None:
+        self._weight *= math.exp(math.log(self._uniform()) / self.size)
+        if self._weight < 1.0:
+            self._next_index += math.floor(math.log(self._uniform()) / math.log1p(-self._weight))
+        self._next_index += 1
+
+
+    def add(self, items: Sequence[Item]) -> None:
+        '''
+        Passes next batch of stream to reservoir:
+        fills reservoir, until it is full, then replaces random sampled items
+        by items on drawn positions of stream.
+
+        Parameters:
+        -----------
+            items: Sequence[Item]
+                next batch of stream
+        '''
+        free = self.size - len(self.items)
+        if free > 0:
+            self.items.extend(items[:free])
+            if len(self.items) == self.size:
+                self._skip()
+        end = self.count + len(items)
+        while self._next_index < end:
+            self.items[self.random_generator.randrange(self.size)] = items[self._next_index - self.count]
+            self._skip()
+        self.count = end
+
+
+class WeightedPicker:
+    '''
+    Class, that represents
+    random choice of index with probability proportional to its weight.
+
+    Attributes:
+    -----------
+        weights: array
+            weight of every index; indexes with zero weight are never picked
+
+        total: int
+            sum of all weights
+
+        count: int
+            number of indexes with weight
+
+        random_generator: random.Random
+            generator of random numbers
+
+    Methods:
+    --------
+        extend(weights) -> None:
+            adds indexes with passed weights.
+
+        set_weight(index, weight) -> None:
+            changes weight of index.
+
+        pick() -> int:
+            returns random index.
+    '''
+    def __init__(self, random_generator: random.Random = None) -> None:
+        self.weights = array('Q')
+        self.total = 0
+        self.count = 0
+        self.random_generator = random_generator or random.Random()
+        # node i (from 1) keeps sum of weights of indexes from i - lowest bit of i to i - 1
+        self._tree = array('Q', [0])
+
+
+    def __len__(self) -> int:
+        return len(self.weights)
+
+
+    def extend(self, weights: Iterable[int]) -> None:
+        '''
+        Adds indexes with passed weights after existing ones
+        in O(number of added indexes + log n).
+
+        Parameters:
+        -----------
+            weights: Iterable[int]
+                not negative weights of added indexes
+        '''
+        tree = self._tree
+        old_size = len(self.weights)
+        self.weights.extend(weights)
+        tree.extend(self.weights[old_size:])
+        size = len(self.weights)
+        added = self.weights[old_size:]
+        self.total += sum(added)
+        self.count += len(added) - added.count(0)
+        # old nodes, that sum the whole old prefix, are children of new nodes
+        node = old_size
+        while node:
+            parent = node + (node & -node)
+            if parent <= size:
+                tree[parent] += tree[node]
+            node -= node & -node
+        for node in range(old_size + 1, size + 1):
+            parent = node + (node & -node)
+            if parent <= size:
+                tree[parent] += tree[node]
+
+
+    def set_weight(self, index: int,
+                         weight: int) -> None:
+        '''
+        Changes weight of index.
+
+        Parameters:
+        -----------
+            index: int
+                index, that was added by extend()
+
+            weight: int
+                new not negative weight
+        '''
+        old_weight = self.weights[index]
+        if weight == old_weight:
+            return
+        self.weights[index] = weight
+        self.total += weight - old_weight
+        self.count += (weight != 0) - (old_weight != 0)
+        tree = self._tree
+        size = len(self.weights)
+        node = index + 1
+        if weight > old_weight:
+            delta = weight - old_weight
+            while node <= size:
+                tree[node] += delta
+                node += node & -node
+        else:
+            delta = old_weight - weight
+            while node <= size:
+                tree[node] -= delta
+                node += node & -node
+
+
+    def pick(self) -> int:
+        '''
+        Returns random index
+        with probability proportional to its weight.
+        Raises IndexError, if all weights are zero.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        if not self.total:
+            raise IndexError('pick from empty picker')
+        value = self.random_generator.randrange(self.total)
+        tree = self._tree
+        size = len(self.weights)
+        index = 0
+        step = 1 << size.bit_length()
+        while step:
+            node = index + step
+            if node <= size and tree[node] <= value:
+                index = node
+                value -= tree[node]
+            step >>= 1
+        return index
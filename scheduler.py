@@ -0,0 +1,501 @@
+'''
+Spaced repetition of words by SM-2 algorithm.
+
+Every answered word has card with ease, interval and due time,
+cards are kept in SQLite database by language and text of word,
+so they stay valid, when words of vocabulary are reordered or added.
+Position of word in vocabulary is saved with card, so cards of random access
+vocabulary, such as compiled deck, are found by reading only their words.
+Cards are kept in heap by due time, so next due word is taken in O(log n).
+'''
+import os
+import time
+import heapq
+import sqlite3
+from itertools import chain
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from vocabulary import Word
+
+
+DAY = 24 * 60 * 60
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+
+CORRECT_QUALITY = 4
+TYPO_QUALITY = 3
+WRONG_QUALITY = 1
+
+# saved position of card, which word wasn't found in vocabulary
+MISSING_POSITION = -1
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS cards (
+    language TEXT NOT NULL,
+    foreign_word TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    ease REAL NOT NULL,
+    interval REAL NOT NULL,
+    repetitions INTEGER NOT NULL,
+    due REAL NOT NULL,
+    answers INTEGER NOT NULL DEFAULT 0,
+    errors INTEGER NOT NULL DEFAULT 0,
+    position INTEGER,
+    PRIMARY KEY (language, foreign_word, translation)
+) WITHOUT ROWID;
+'''
+# columns, that were added to cards later, with their definitions
+ADDED_COLUMNS = {
+    'answers': 'INTEGER NOT NULL DEFAULT 0',
+    'errors': 'INTEGER NOT NULL DEFAULT 0',
+    'position': 'INTEGER',
+}
+
+
+class Card(NamedTuple):
+    '''
+    Class, that represents
+    state of repetition of one word.
+
+    Attributes:
+    -----------
+        ease: float
+            ease factor, that interval is multiplied by after correct answer
+
+        interval: float
+            number of days between last answer and next repetition
+
+        repetitions: int
+            number of correct answers in a row
+
+        due: float
+            time of next repetition, in seconds since the epoch
+
+        answers: int
+            number of all answers
+
+        errors: int
+            number of wrong answers
+    '''
+    ease: float = DEFAULT_EASE
+    interval: float = 0.0
+    repetitions: int = 0
+    due: float = 0.0
+    answers: int = 0
+    errors: int = 0
+
+
+def get_default_schedule_path() -> str:
+    '''
+    Returns path to database with cards
+    according to XDG base directory specification.
+
+    Parameters:
+    -----------
+        Doesn't have
+    '''
+    base = os.environ.get('XDG_DATA_HOME') or os.path.join(os.path.expanduser('~'), '.local', 'share')
+    return os.path.join(base, 'voctester', 'schedule.db')
+
+
+def review_card(card: Card,
+                quality: int,
+                now: float) -> Card:
+    '''
+    Returns card after answer
+    with passed quality by SM-2 algorithm.
+
+    Parameters:
+    -----------
+        card: Card
+            card of answered word
+
+        quality: int
+            quality of answer from 0 (no answer) to 5 (perfect answer);
+            answers with quality less than 3 start repetitions from the beginning
+
+        now: float
+            time of answer, in seconds since the epoch
+    '''
+    if quality >= 3:
+        match card.repetitions:
+            case 0:
+                interval = 1.0
+            case 1:
+                interval = 6.0
+            case _:
+                interval = round(card.interval * card.ease)
+        repetitions = card.repetitions + 1
+    else:
+        interval = 1.0
+        repetitions = 0
+    ease = max(MIN_EASE, card.ease + 0.1 - (5 - quality) * (0.08 + (5 - quality) * 0.02))
+    return Card(ease, interval, repetitions, now + interval * DAY,
+                answers = card.answers + 1,
+                errors = card.errors + (quality < 3))
+
+
+class ScheduleStore:
+    '''
+    Class, that represents
+    SQLite database with cards of all languages.
+
+    Methods:
+    --------
+        load_cards(language) -> Dict[Tuple[str, str], Card]:
+            returns cards of language by foreign word and translation.
+
+        load_positions(language) -> Dict[Tuple[str, str], int]:
+            returns saved positions of words of cards in vocabulary.
+
+        save_cards(language, cards) -> None:
+            saves cards of words in one transaction.
+
+        save_positions(language, positions) -> None:
+            saves new positions of words of cards.
+    '''
+    def __init__(self, path: Optional[str] = None) -> None:
+        self.path = path or get_default_schedule_path()
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok = True)
+        self.connection = sqlite3.connect(self.path)
+        self.connection.executescript(SCHEMA)
+        columns = {row[1] for row in self.connection.execute('PRAGMA table_info(cards)')}
+        with self.connection:
+            for column, definition in ADDED_COLUMNS.items():
+                if column not in columns:
+                    self.connection.execute('ALTER TABLE cards ADD COLUMN %s %s' % (column, definition))
+
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+    def load_cards(self, language: str) -> Dict[Tuple[str, str], Card]:
+        '''
+        Returns cards of language
+        by foreign word and translation.
+
+        Parameters:
+        -----------
+            language: str
+                language abbreviature, such as: (en, pl, ru, ua etc.)
+        '''
+        rows = self.connection.execute(
+            'SELECT foreign_word, translation, ease, interval, repetitions, due, answers, errors '
+            'FROM cards WHERE language = ?',
+            (language,))
+        return {(foreign_word, translation): Card(*state)
+                for foreign_word, translation, *state in rows}
+
+
+    def load_positions(self, language: str) -> Dict[Tuple[str, str], int]:
+        '''
+        Returns saved positions of words of cards
+        in vocabulary by foreign word and translation;
+        cards, that were saved without position, are left out.
+
+        Parameters:
+        -----------
+            language: str
+                language abbreviature, such as: (en, pl, ru, ua etc.)
+        '''
+        rows = self.connection.execute(
+            'SELECT foreign_word, translation, position '
+            'FROM cards WHERE language = ? AND position IS NOT NULL',
+            (language,))
+        return {(foreign_word, translation): position
+                for foreign_word, translation, position in rows}
+
+
+    def save_cards(self, language: str,
+                         cards: Iterable[Tuple[Word, Card, Optional[int]]]) -> None:
+        '''
+        Saves cards of words
+        in one transaction.
+
+        Parameters:
+        -----------
+            language: str
+                language abbreviature, such as: (en, pl, ru, ua etc.)
+
+            cards: Iterable[Tuple[Word, Card, Optional[int]]]
+                answered word, state of its repetition after answer
+                and index of word in vocabulary, None if it isn't known
+        '''
+        with self.connection:
+            self.connection.executemany(
+                'INSERT OR REPLACE INTO cards '
+                '(language, foreign_word, translation, ease, interval, repetitions, due, answers, errors, position) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                ((language, word.foreign_word, word.translation, *card, position)
+                 for word, card, position in cards))
+
+
+    def save_positions(self, language: str,
+                             positions: Iterable[Tuple[Tuple[str, str], int]]) -> None:
+        '''
+        Saves new positions of words of cards
+        in vocabulary.
+
+        Parameters:
+        -----------
+            language: str
+                language abbreviature, such as: (en, pl, ru, ua etc.)
+
+            positions: Iterable[Tuple[Tuple[str, str], int]]
+                foreign words and translations with their positions
+        '''
+        with self.connection:
+            self.connection.executemany(
+                'UPDATE cards SET position = ? WHERE language = ? AND foreign_word = ? AND translation = ?',
+                ((position, language, foreign_word, translation)
+                 for (foreign_word, translation), position in positions))
+
+
+class ReviewScheduler:
+    '''
+    Class, that represents
+    queue of repetitions of one vocabulary.
+
+    Words, that were never answered, are new, their order is chosen by quiz session.
+    Answered words are asked only when they are due, the most overdue first.
+
+    Attributes:
+    -----------
+        store: ScheduleStore
+            database with cards
+
+        language: str
+            language abbreviature of vocabulary
+
+        cards: dict
+            cards of answered words by index of word in vocabulary
+
+        due_queue: list
+            heap of (due, index of word); entry is outdated,
+            if card of word was changed after it was pushed
+
+    Methods:
+    --------
+        add_words(words, indexes) -> Iterable[int]:
+            finds cards of words, returns indexes of new words.
+
+        add_vocabulary(vocabulary) -> Iterable[int]:
+            finds cards of all words of random access vocabulary, returns indexes of new words.
+
+        pop_due() -> Optional[int]:
+            returns index of the most overdue word, or None, if no word is due.
+
+        upcoming() -> List[int]:
+            returns indexes of words with cards, the soonest due first.
+
+        review(index, word, quality) -> Card:
+            updates card of answered word.
+
+        remove_word(index) -> None:
+            stops repetitions of word, that was removed from vocabulary.
+
+        save() -> None:
+            saves changed cards in one transaction.
+
+        close() -> None:
+            saves changed cards and closes store.
+    '''
+    def __init__(self, store: ScheduleStore,
+                       language: str) -> None:
+        self.store = store
+        self.language = language
+        self.cards: Dict[int, Card] = {}
+        self.due_queue: List[Tuple[float, int]] = []
+        self._saved_cards = store.load_cards(language)
+        self._saved_positions = store.load_positions(language)
+        # cards, changed by answers, with their words; they are saved together, not in grading
+        self._changed_cards: Dict[int, Tuple[Word, Card]] = {}
+
+
+    def add_words(self, words: Sequence[Word],
+                        indexes: Sequence[int]) -> Iterable[int]:
+        '''
+        Finds saved cards of words and queues them by due time.
+        Returns indexes of words without card, that are new.
+
+        Parameters:
+        -----------
+            words: Sequence[Word]
+                words, that are added to quiz session
+
+            indexes: Sequence[int]
+                indexes of passed words in vocabulary
+        '''
+        if not self._saved_cards:
+            return indexes
+        new_indexes = []
+        queued = []
+        saved_cards = self._saved_cards
+        for index, word in zip(indexes, words):
+            card = saved_cards.get(word)
+            if card is None:
+                new_indexes.append(index)
+            else:
+                self.cards[index] = card
+                queued.append((card.due, index))
+        self._queue(queued)
+        return new_indexes
+
+
+    def add_vocabulary(self, vocabulary: Sequence[Word]) -> Iterable[int]:
+        '''
+        Finds saved cards of all words
+        of random access vocabulary, such as compiled deck, and queues them by due time.
+        Returns indexes of words without card, that are new.
+        Only words on saved positions of cards are read; vocabulary is searched
+        only for cards, which words were moved or saved without position,
+        and their found positions are saved, so it is searched once.
+
+        Parameters:
+        -----------
+            vocabulary: Sequence[Word]
+                vocabulary, which words are all added to quiz session
+        '''
+        length = len(vocabulary)
+        if not self._saved_cards:
+            return range(length)
+        found: Dict[int, Card] = {}
+        moved = {}
+        for key, card in self._saved_cards.items():
+            position = self._saved_positions.get(key)
+            if position is not None and 0 <= position < length and vocabulary[position] == key:
+                found[position] = card
+            elif position != MISSING_POSITION:
+                moved[key] = card
+        if moved:
+            resolved = {}
+            for position, word in enumerate(vocabulary):
+                card = moved.pop(word, None)
+                if card is not None:
+                    found[position] = card
+                    resolved[tuple(word)] = position
+                    if not moved:
+                        break
+            resolved.update(dict.fromkeys(moved, MISSING_POSITION))
+            self._saved_positions.update(resolved)
+            self.store.save_positions(self.language, resolved.items())
+        self.cards.update(found)
+        self._queue([(card.due, index) for index, card in found.items()])
+        # new words are ranges between positions of found cards
+        bounds = sorted(found)
+        return chain.from_iterable(range(start + 1, end)
+                                   for start, end in zip([-1, *bounds], [*bounds, length]))
+
+
+    def _queue(self, queued: List[Tuple[float, int]]) -> None:
+        if len(queued) > len(self.due_queue):
+            self.due_queue.extend(queued)
+            heapq.heapify(self.due_queue)
+        else:
+            for entry in queued:
+                heapq.heappush(self.due_queue, entry)
+
+
+    def pop_due(self) -> Optional[int]:
+        '''
+        Returns index of the most overdue word
+        and removes it from queue; returns None, if no word is due.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        now = time.time()
+        due_queue = self.due_queue
+        while due_queue and due_queue[0][0] <= now:
+            due, index = heapq.heappop(due_queue)
+            card = self.cards.get(index)
+            if card is not None and card.due == due:
+                return index
+        return None
+
+
+    def upcoming(self) -> List[int]:
+        '''
+        Returns indexes of words with cards,
+        that are still queued, the soonest due first; words, that were answered
+        wrong, are due the next day, so they go before well known ones.
+        Queue stays as it is.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        cards = self.cards
+        return list(dict.fromkeys(index for due, index in sorted(self.due_queue)
+                                  if index in cards and cards[index].due == due))
+
+
+    def review(self, index: int,
+                     word: Word,
+                     quality: int) -> Card:
+        '''
+        Updates card of answered word by SM-2 algorithm
+        and queues word by new due time; card is saved by save() or close(),
+        so answer doesn't wait for commit.
+
+        Parameters:
+        -----------
+            index: int
+                index of word in vocabulary
+
+            word: Word
+                answered word
+
+            quality: int
+                quality of answer from 0 to 5
+        '''
+        card = review_card(self.cards.get(index, Card()), quality, time.time())
+        self.cards[index] = card
+        heapq.heappush(self.due_queue, (card.due, index))
+        self._changed_cards[index] = (word, card)
+        return card
+
+
+    def remove_word(self, index: int) -> None:
+        '''
+        Stops repetitions of word,
+        that was removed from vocabulary; its saved card is kept.
+        Entry of word in due queue is outdated and skipped.
+
+        Parameters:
+        -----------
+            index: int
+                index of word in vocabulary
+        '''
+        self.cards.pop(index, None)
+
+
+    def save(self) -> None:
+        '''
+        Saves cards, changed since previous saving,
+        in one transaction.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        if self._changed_cards:
+            self.store.save_cards(self.language, ((word, card, index)
+                                                  for index, (word, card) in self._changed_cards.items()))
+            self._changed_cards = {}
+
+
+    def close(self) -> None:
+        '''
+        Saves changed cards
+        and closes store.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        self.save()
+        self.store.close()
@@ -0,0 +1,148 @@
+'''
+Search of words by foreign words.
+
+Foreign words are normalized once, when words are added to index:
+letter case and diacritics are ignored, so "zolw" finds "żółw".
+Prefix search is binary search in sorted list of normalized words,
+so it costs O(log n + number of results). Substring search runs str.find
+over all normalized words, joined into one text, so text is scanned in C
+and offsets of matches are mapped to words by binary search.
+Sorted list and joined text are updated lazily, on the first search
+after words were added; sorted list is merged with sorted new words
+in linear time, so growing vocabulary isn't sorted again from scratch.
+'''
+from bisect import (bisect_left,
+                    bisect_right)
+from array import array
+from typing import Iterable, Iterator, List, Tuple
+
+from vocabulary import Word
+from matching import (AnswerMatcher,
+                      MatchingRules)
+
+
+# words are joined by separator, that normalized words don't contain,
+# because whitespaces are collapsed into spaces by normalization
+SEPARATOR = '\n'
+
+
+class WordSearchIndex:
+    '''
+    Class, that represents
+    index of foreign words for incremental prefix and substring search.
+
+    Attributes:
+    -----------
+        keys: list
+            normalized foreign words by index of word in vocabulary
+
+    Methods:
+    --------
+        add_words(words) -> None:
+            adds words after indexed ones.
+
+        normalize(text) -> str:
+            returns text in form, in which foreign words are searched.
+
+        update() -> None:
+            prepares words, that were added since previous update, for search.
+
+        search(text) -> Iterator[int]:
+            yields indexes of words, which foreign words start with or contain text.
+    '''
+    def __init__(self) -> None:
+        self.keys: List[str] = []
+        self._matcher = AnswerMatcher(MatchingRules(fold_case = True,
+                                                    fold_diacritics = True))
+        self._sorted: List[Tuple[str, int]] = []
+        self._text = ''
+        # offset of every word in joined text and offset after the last word
+        self._starts = array('L', [0])
+
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+    def normalize(self, text: str) -> str:
+        '''
+        Returns text in form,
+        in which foreign words are searched.
+
+        Parameters:
+        -----------
+            text: str
+                foreign word or typed search text
+        '''
+        return self._matcher.normalize(text)
+
+
+    def add_words(self, words: Iterable[Word]) -> None:
+        '''
+        Adds words after indexed ones,
+        index of word is number of words, that were added before it.
+
+        Parameters:
+        -----------
+            words: Iterable[Word]
+                words of vocabulary
+        '''
+        normalize = self.normalize
+        self.keys.extend(normalize(word.foreign_word) for word in words)
+
+
+    def update(self) -> None:
+        '''
+        Prepares words, that were added since previous update, for search:
+        merges them into sorted list and joins them into text of substring search.
+        It is called by search itself, if words were added.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        start = len(self._starts) - 1
+        if start == len(self.keys):
+            return
+        # sorted new words are one run for timsort, so sort merges two runs
+        self._sorted.extend(sorted(zip(self.keys[start:], range(start, len(self.keys)))))
+        self._sorted.sort()
+        self._text = SEPARATOR.join(self.keys)
+        starts = self._starts
+        position = starts[-1]
+        for key in self.keys[start:]:
+            position += len(key) + 1
+            starts.append(position)
+
+
+    def search(self, text: str) -> Iterator[int]:
+        '''
+        Yields indexes of words,
+        which foreign words start with text, in alphabetical order,
+        then indexes of words, which foreign words contain it elsewhere,
+        in order of vocabulary. Results are produced lazily,
+        so only as many words are searched, as are taken.
+
+        Parameters:
+        -----------
+            text: str
+                typed search text, it is normalized here
+        '''
+        text = self.normalize(text)
+        if not text:
+            return
+        self.update()
+        entries = self._sorted
+        index = bisect_left(entries, (text,))
+        while index < len(entries) and entries[index][0].startswith(text):
+            yield entries[index][1]
+            index += 1
+        starts = self._starts
+        joined_text = self._text
+        offset = joined_text.find(text)
+        while offset >= 0:
+            word_index = bisect_right(starts, offset) - 1
+            # words, that start with text, were yielded by prefix search
+            if offset != starts[word_index]:
+                yield word_index
+            offset = joined_text.find(text, starts[word_index + 1])
@@ -0,0 +1,368 @@
+import random
+from array import array
+from bisect import bisect_left
+from itertools import compress
+from typing import Collection, Dict, Iterable, Iterator, List, Optional
+
+
+NOT_CHECKED = 0
+CORRECT = 1
+WRONG = 2
+EMPTY = 3
+
+STATUSES = (NOT_CHECKED, CORRECT, WRONG, EMPTY)
+
+FORWARD = 'forward'
+REVERSE = 'reverse'
+MIXED = 'mixed'
+
+DIRECTIONS = (FORWARD, REVERSE, MIXED)
+
+# maps random byte to 0 or 1
+_LOWEST_BIT = bytes(value & 1 for value in range(256))
+
+
+class QuizSession:
+    '''
+    Class, that represents state of one quiz session
+    independently from widgets.
+    Statuses are stored as one byte per question,
+    number of questions with every status is counted on every change,
+    so scoring doesn't depend on size of session.
+    Direction of every question is stored as one byte too;
+    in mixed session it is random for every position.
+    Session with seeded generator of random numbers has the same order.
+
+    Attributes:
+    -----------
+        order: array
+            array of unsigned integers, that represents mixed indexes of questions from vocabulary
+
+        statuses: bytearray
+            one byte per question, that represents result of checking:
+            NOT_CHECKED, CORRECT, WRONG or EMPTY
+
+        typed_answers: dict
+            texts, that user typed, by position of question;
+            questions without typed text are not stored
+
+        status_counts: list
+            number of questions with every status, indexed by status
+
+        direction: str
+            FORWARD (foreign word is asked), REVERSE (translation is asked) or MIXED
+
+        reversed: bytearray
+            one byte per question, 1 if translation is asked
+
+        random_generator: random.Random
+            generator of random positions and directions of questions
+
+    Methods:
+    --------
+        extend(word_indexes, start) -> None:
+            adds new questions to session in random positions after passed start.
+
+        insert(position, word_index) -> None:
+            adds new question to session on passed position.
+
+        remove_words(word_indexes, start) -> List[int]:
+            removes questions with passed words after passed start.
+
+        word_index(position) -> int:
+            returns index of word in vocabulary for question on passed position.
+
+        position_of(word_index) -> Optional[int]:
+            returns the first position of question with word, None if word isn't asked.
+
+        status(position) -> int:
+            returns result of checking for question on passed position.
+
+        typed_answer(position) -> str:
+            returns text, that user typed for question on passed position.
+
+        set_typed_answer(position, text) -> None:
+            remembers text, that user typed for question on passed position.
+
+        set_status(position, status) -> None:
+            remembers result of checking for question on passed position.
+
+        get_number_of_correct_answers() -> int:
+            returns number of correct answers.
+
+        positions_with_status(status) -> Iterator[int]:
+            yields positions of all questions with passed status.
+
+        wrong_positions() -> List[int]:
+            returns positions of all questions with wrong or empty answer.
+
+        is_reversed(position) -> bool:
+            returns boolean value, if translation is asked on passed position.
+    '''
+    def __init__(self, order: Iterable[int],
+                       direction: str = FORWARD,
+                       random_generator: random.Random = None) -> None:
+        self.order = array('L', order)
+        self.statuses = bytearray(len(self.order))
+        self.typed_answers: Dict[int, str] = {}
+        self.status_counts: List[int] = [0] * len(STATUSES)
+        self.status_counts[NOT_CHECKED] = len(self.order)
+        self.direction = direction
+        self.random_generator = random_generator or random.Random()
+        self.reversed = self._new_directions(len(self.order))
+        # the first position of every word index, it is rebuilt after order is changed
+        self._positions: Optional[Dict[int, int]] = None
+
+
+    def _new_directions(self, number_of_questions: int) -> bytearray:
+        if self.direction == FORWARD:
+            return bytearray(number_of_questions)
+        if self.direction == REVERSE:
+            return bytearray(b'\x01' * number_of_questions)
+        return bytearray(self.random_generator.randbytes(number_of_questions).translate(_LOWEST_BIT))
+
+
+    def __len__(self) -> int:
+        return len(self.order)
+
+
+    def extend(self, word_indexes: Iterable[int],
+                     start: int = 0) -> None:
+        '''
+        Adds new questions to session.
+        Every new question is placed in random position not less than start
+        (inside-out shuffle), so questions from start to the end stay
+        in uniformly random order, while vocabulary is being loaded.
+
+        Parameters:
+        -----------
+            word_indexes: Iterable[int]
+                indexes of new words in vocabulary
+
+            start: int
+                first position, that can be changed;
+                questions before it were already shown to user
+        '''
+        order = self.order
+        uniform = self.random_generator.random
+        for word_index in word_indexes:
+            order.append(word_index)
+            last = len(order) - 1
+            swap = start + int(uniform() * (last - start + 1))
+            if swap < last:
+                order[last], order[swap] = order[swap], word_index
+        added = len(order) - len(self.statuses)
+        self.statuses.extend(bytes(added))
+        self.status_counts[NOT_CHECKED] += added
+        self.reversed.extend(self._new_directions(added))
+        self._positions = None
+
+
+    def insert(self, position: int,
+                     word_index: int) -> None:
+        '''
+        Adds new question to session
+        on passed position; questions after it are moved forward.
+        Position must be after all questions, that have typed answers.
+
+        Parameters:
+        -----------
+            position: int
+                number of new question in order
+
+            word_index: int
+                index of word in vocabulary
+        '''
+        self.order.insert(position, word_index)
+        self.statuses.insert(position, NOT_CHECKED)
+        self.status_counts[NOT_CHECKED] += 1
+        self.reversed[position:position] = self._new_directions(1)
+        self._positions = None
+
+
+    def remove_words(self, word_indexes: Collection[int],
+                           start: int = 0) -> List[int]:
+        '''
+        Removes questions with passed words
+        from positions not less than start; questions after them are moved back.
+        Returns removed positions in ascending order.
+
+        Parameters:
+        -----------
+            word_indexes: Collection[int]
+                indexes of removed words in vocabulary
+
+            start: int
+                first position, that can be changed;
+                questions before it were already shown to user
+        '''
+        order = self.order
+        is_kept = [word_index not in word_indexes for word_index in order[start:]]
+        removed = [start + offset for offset, is_word_kept in enumerate(is_kept) if not is_word_kept]
+        if not removed:
+            return removed
+        for position in removed:
+            self.status_counts[self.statuses[position]] -= 1
+        order[start:] = array('L', compress(order[start:], is_kept))
+        self.statuses[start:] = bytes(compress(self.statuses[start:], is_kept))
+        self.reversed[start:] = bytes(compress(self.reversed[start:], is_kept))
+        typed_answers = {}
+        for position, text in self.typed_answers.items():
+            shift = bisect_left(removed, position)
+            if shift == len(removed) or removed[shift] != position:
+                typed_answers[position - shift] = text
+        self.typed_answers = typed_answers
+        self._positions = None
+        return removed
+
+
+    def word_index(self, position: int) -> int:
+        '''
+        Returns index of word in vocabulary
+        for question on passed position.
+
+        Parameters:
+        -----------
+            position: int
+                number of question in order
+        '''
+        return self.order[position]
+
+
+    def position_of(self, word_index: int) -> Optional[int]:
+        '''
+        Returns the first position of question
+        with word, None if word isn't asked in session.
+        Positions of all words are mapped at once, when order was changed,
+        so lookup costs O(1), while order stays the same.
+
+        Parameters:
+        -----------
+            word_index: int
+                index of word in vocabulary
+        '''
+        if self._positions is None:
+            # reversed pairs are inserted later, so the first position of word wins
+            self._positions = dict(zip(reversed(self.order), range(len(self.order) - 1, -1, -1)))
+        return self._positions.get(word_index)
+
+
+    def status(self, position: int) -> int:
+        '''
+        Returns result of checking
+        for question on passed position.
+
+        Parameters:
+        -----------
+            position: int
+                number of question in order
+        '''
+        return self.statuses[position]
+
+
+    def typed_answer(self, position: int) -> str:
+        '''
+        Returns text, that user typed
+        for question on passed position.
+
+        Parameters:
+        -----------
+            position: int
+                number of question in order
+        '''
+        return self.typed_answers.get(position, '')
+
+
+    def set_typed_answer(self, position: int,
+                               text: str) -> None:
+        '''
+        Remembers text, that user typed
+        for question on passed position.
+
+        Parameters:
+        -----------
+            position: int
+                number of question in order
+
+            text: str
+                text from input line
+        '''
+        if text:
+            self.typed_answers[position] = text
+        else:
+            self.typed_answers.pop(position, None)
+
+
+    def set_status(self, position: int,
+                         status: int) -> None:
+        '''
+        Remembers result of checking
+        for question on passed position,
+        updates counters of statuses.
+
+        Parameters:
+        -----------
+            position: int
+                number of question in order
+
+            status: int
+                one of NOT_CHECKED, CORRECT, WRONG, EMPTY
+        '''
+        self.status_counts[self.statuses[position]] -= 1
+        self.statuses[position] = status
+        self.status_counts[status] += 1
+
+
+    def get_number_of_correct_answers(self) -> int:
+        '''
+        Returns number of correct answers
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        return self.status_counts[CORRECT]
+
+
+    def positions_with_status(self, status: int) -> Iterator[int]:
+        '''
+        Yields positions of all questions
+        with passed status.
+
+        Parameters:
+        -----------
+            status: int
+                one of NOT_CHECKED, CORRECT, WRONG, EMPTY
+        '''
+        if not self.status_counts[status]:
+            return
+        position = self.statuses.find(status)
+        while position != -1:
+            yield position
+            position = self.statuses.find(status, position + 1)
+
+
+    def wrong_positions(self) -> List[int]:
+        '''
+        Returns positions of all questions
+        with wrong or empty answer.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        return sorted([*self.positions_with_status(WRONG),
+                       *self.positions_with_status(EMPTY)])
+
+
+    def is_reversed(self, position: int) -> bool:
+        '''
+        Returns boolean value,
+        if translation is asked on passed position.
+
+        Parameters:
+        -----------
+            position: int
+                number of question in order
+        '''
+        return self.reversed[position] == 1
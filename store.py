@@ -0,0 +1,530 @@
+'''
+SQLite vocabulary store.
+
+Keeps words of several languages with tags and per-word statistics
+in one database file. Every word has dense position inside its language,
+so random and sequential selection of questions are indexed lookups.
+
+Usage:
+    python store.py vocabulary.db vocabulary_pl.json [--language pl] [--tag TAG ...]
+'''
+import time
+import random
+import sqlite3
+import argparse
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from vocabulary import (Word,
+                        load_words)
+from decks import deck_language
+
+
+ITERATION_CHUNK_SIZE = 10000
+# max number of parameters of one query in old versions of SQLite
+MAX_QUERY_PARAMETERS = 999
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS languages (
+    id INTEGER PRIMARY KEY,
+    code TEXT NOT NULL UNIQUE,
+    word_count INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS words (
+    id INTEGER PRIMARY KEY,
+    language_id INTEGER NOT NULL REFERENCES languages(id),
+    position INTEGER NOT NULL,
+    foreign_word TEXT NOT NULL,
+    translation TEXT NOT NULL,
+    UNIQUE (language_id, position),
+    UNIQUE (language_id, foreign_word, translation)
+);
+CREATE TABLE IF NOT EXISTS tags (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS word_tags (
+    tag_id INTEGER NOT NULL REFERENCES tags(id),
+    word_id INTEGER NOT NULL REFERENCES words(id),
+    PRIMARY KEY (tag_id, word_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS word_stats (
+    word_id INTEGER PRIMARY KEY REFERENCES words(id),
+    attempts INTEGER NOT NULL DEFAULT 0,
+    correct INTEGER NOT NULL DEFAULT 0,
+    last_answered REAL
+);
+'''
+
+
+class VocabularyStore:
+    '''
+    Class, that represents
+    SQLite database with vocabularies.
+
+    Methods:
+    --------
+        import_words(language, words, tags) -> int:
+            adds words to vocabulary of language, returns number of added words.
+
+        import_json(path, language, tags) -> int:
+            adds words from vocabulary json, returns number of added words.
+
+        count(language) -> int:
+            returns number of words in vocabulary of language.
+
+        word_at(language, position) -> Word:
+            returns word with passed position inside vocabulary of language.
+
+        sample_positions(language, number_of_questions, random_generator) -> List[int]:
+            returns positions of random distinct words of language.
+
+        words_at(language, positions) -> List[Word]:
+            returns words with passed positions.
+
+        next_words(language, position, number_of_questions) -> List[Word]:
+            returns words, that go after passed position.
+
+        tagged_words(language, tag) -> List[Word]:
+            returns words of language with passed tag.
+
+        record_answers(language, answers) -> None:
+            updates statistics of words by answers in one transaction.
+    '''
+    def __init__(self, path: str) -> None:
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+
+
+    def close(self) -> None:
+        self.connection.close()
+
+
+    def _language_id(self, language: str,
+                           create: bool = False) -> Optional[int]:
+        row = self.connection.execute('SELECT id FROM languages WHERE code = ?',
+                                      (language,)).fetchone()
+        if row is None and create:
+            return self.connection.execute('INSERT INTO languages (code) VALUES (?)',
+                                           (language,)).lastrowid
+        return row and row[0]
+
+
+    def import_words(self, language: str,
+                           words: Iterable[Word],
+                           tags: Iterable[str] = ()) -> int:
+        '''
+        Adds words to vocabulary of language in one transaction,
+        skips words, that are already stored.
+        Returns number of added words.
+
+        Parameters:
+        -----------
+            language: str
+                language abbreviature, such as: (en, pl, ru, ua etc.)
+
+            words: Iterable[Word]
+                words to add
+
+            tags: Iterable[str]
+                names of tags for every added word
+        '''
+        with self.connection:
+            language_id = self._language_id(language, create = True)
+            tag_ids = []
+            for tag in tags:
+                self.connection.execute('INSERT OR IGNORE INTO tags (name) VALUES (?)', (tag,))
+                tag_ids.append(self.connection.execute('SELECT id FROM tags WHERE name = ?',
+                                                       (tag,)).fetchone()[0])
+            position = self.count(language)
+            first_position = position
+            for foreign_word, translation in words:
+                cursor = self.connection.execute(
+                    'INSERT OR IGNORE INTO words (language_id, position, foreign_word, translation) '
+                    'VALUES (?, ?, ?, ?)', (language_id, position, foreign_word, translation))
+                if cursor.rowcount:
+                    for tag_id in tag_ids:
+                        self.connection.execute('INSERT INTO word_tags (tag_id, word_id) VALUES (?, ?)',
+                                                (tag_id, cursor.lastrowid))
+                    position += 1
+            self.connection.execute('UPDATE languages SET word_count = ? WHERE id = ?',
+                                    (position, language_id))
+        return position - first_position
+
+
+    def import_json(self, path: str,
+                          language: Optional[str] = None,
+                          tags: Iterable[str] = ()) -> int:
+        '''
+        Adds words from vocabulary json,
+        returns number of added words.
+
+        Parameters:
+        -----------
+            path: str
+                path to vocabulary json
+
+            language: str
+                language abbreviature; by default it is taken
+                from name of file, such as "vocabulary_pl.json" or "vocabulary_pl.json.gz"
+
+            tags: Iterable[str]
+                names of tags for every added word
+        '''
+        if language is None:
+            language = deck_language(path)
+            if language is None:
+                raise ValueError("Can't define language of %s, pass it explicitly." % path)
+        return self.import_words(language, load_words(path), tags)
+
+
+    def count(self, language: str) -> int:
+        '''
+        Returns number of words
+        in vocabulary of language.
+
+        Parameters:
+        -----------
+            language: str
+                language abbreviature, such as: (en, pl, ru, ua etc.)
+        '''
+        row = self.connection.execute('SELECT word_count FROM languages WHERE code = ?',
+                                      (language,)).fetchone()
+        return row[0] if row else 0
+
+
+    def word_at(self, language: str,
+                      position: int) -> Word:
+        '''
+        Returns word with passed position
+        inside vocabulary of language.
+
+        Parameters:
+        -----------
+            language: str
+                language abbreviature, such as: (en, pl, ru, ua etc.)
+
+            position: int
+                position of word inside vocabulary of language
+        '''
+        row = self.connection.execute(
+            'SELECT foreign_word, translation FROM words '
+            'WHERE language_id = (SELECT id FROM languages WHERE code = ?) AND position = ?',
+            (language, position)).fetchone()
+        if row is None:
+            raise IndexError('word position out of range')
+        return Word(*row)
+
+
+    def sample_positions(self, language: str,
+                               number_of_questions: int,
+                               random_generator: random.Random = None) -> List[int]:
+        '''
+        Returns positions of random distinct words of language;
+        only number of words is read, words are read by positions later.
+
+        Parameters:
+        -----------
+            language: str
+                language abbreviature, such as: (en, pl, ru, ua etc.)
+
+            number_of_questions: int
+                number of positions; it is limited by number of words
+
+            random_generator: random.Random
+                generator of random numbers, by default module random is used
+        '''
+        count = self.count(language)
+        return (random_generator or random).sample(range(count), min(number_of_questions, count))
+
+
+    def words_at(self, language: str,
+                       positions: List[int]) -> List[Word]:
+        '''
+        Returns words with passed positions
+        in order of positions; they are read by one indexed query
+        for every chunk of positions.
+
+        Parameters:
+        -----------
+            language: str
+                language abbreviature, such as: (en, pl, ru, ua etc.)
+
+            positions: List[int]
+                positions of words inside vocabulary of language
+        '''
+        language_id = self._language_id(language)
+        words: Dict[int, Word] = {}
+        for start in range(0, len(positions), MAX_QUERY_PARAMETERS - 1):
+            chunk = positions[start:start + MAX_QUERY_PARAMETERS - 1]
+            rows = self.connection.execute(
+                'SELECT position, foreign_word, translation FROM words '
+                'WHERE language_id = ? AND position IN (%s)' % ', '.join('?' * len(chunk)),
+                (language_id, *chunk))
+            words.update((position, Word(foreign_word, translation))
+                         for position, foreign_word, translation in rows)
+        try:
+            return [words[position] for position in positions]
+        except KeyError:
+            raise IndexError('word position out of range') from None
+
+
+    def next_words(self, language: str,
+                         position: int,
+                         number_of_questions: int) -> List[Word]:
+        '''
+        Returns words, that go
+        after passed position.
+
+        Parameters:
+        -----------
+            language: str
+                language abbreviature, such as: (en, pl, ru, ua etc.)
+
+            position: int
+                position of the first returned word
+
+            number_of_questions: int
+                max number of returned words
+        '''
+        rows = self.connection.execute(
+            'SELECT foreign_word, translation FROM words '
+            'WHERE language_id = (SELECT id FROM languages WHERE code = ?) AND position >= ? '
+            'ORDER BY position LIMIT ?',
+            (language, position, number_of_questions))
+        return [Word(*row) for row in rows]
+
+
+    def tagged_words(self, language: str,
+                           tag: str) -> List[Word]:
+        '''
+        Returns words of language
+        with passed tag.
+
+        Parameters:
+        -----------
+            language: str
+                language abbreviature, such as: (en, pl, ru, ua etc.)
+
+            tag: str
+                name of tag
+        '''
+        rows = self.connection.execute(
+            'SELECT words.foreign_word, words.translation FROM word_tags '
+            'JOIN tags ON tags.id = word_tags.tag_id '
+            'JOIN words ON words.id = word_tags.word_id '
+            'WHERE tags.name = ? AND words.language_id = (SELECT id FROM languages WHERE code = ?) '
+            'ORDER BY words.position',
+            (tag, language))
+        return [Word(*row) for row in rows]
+
+
+    def record_answers(self, language: str,
+                             answers: Iterable[Tuple[int, bool, float]]) -> None:
+        '''
+        Updates statistics of words
+        by answers in one transaction.
+
+        Parameters:
+        -----------
+            language: str
+                language abbreviature, such as: (en, pl, ru, ua etc.)
+
+            answers: Iterable[Tuple[int, bool, float]]
+                position of answered word, boolean value, if answer was correct,
+                and time of answer
+        '''
+        language_id = self._language_id(language)
+        with self.connection:
+            self.connection.executemany(
+                'INSERT INTO word_stats (word_id, attempts, correct, last_answered) '
+                'SELECT id, 1, ?, ? FROM words WHERE language_id = ? AND position = ? '
+                'ON CONFLICT (word_id) DO UPDATE SET attempts = attempts + 1, '
+                'correct = correct + excluded.correct, last_answered = excluded.last_answered',
+                ((int(is_correct), answer_time, language_id, position)
+                 for position, is_correct, answer_time in answers))
+
+
+class SqliteVocabulary:
+    '''
+    Class, that represents vocabulary of one language
+    from VocabularyStore; words are read by position on access,
+    so it can be used instead of list of words.
+    Vocabulary can be loaded by batches: then its length is number of loaded words,
+    next words are read by next_words() and marked as loaded by extend().
+
+    Attributes:
+    -----------
+        store: VocabularyStore
+            store with vocabulary
+
+        language: str
+            language abbreviature of vocabulary
+
+        count: int
+            number of words of language in store
+
+    Methods:
+    --------
+        words_from(start) -> Iterator[Word]:
+            returns iterator over loaded words from passed index on.
+
+        next_words(number_of_words) -> List[Word]:
+            returns words, that go after loaded ones.
+
+        extend(words) -> None:
+            marks words, returned by next_words, as loaded.
+
+        sample_indexes(number_of_words, random_generator) -> List[int]:
+            returns indexes of random distinct words.
+
+        words_at(indexes) -> List[Word]:
+            returns words with passed indexes.
+
+        record_answer(index, is_correct) -> None:
+            remembers answer to word with passed index.
+
+        close() -> None:
+            writes remembered answers and closes store.
+    '''
+    def __init__(self, store: VocabularyStore,
+                       language: str,
+                       is_loaded: bool = True) -> None:
+        self.store = store
+        self.language = language
+        self.count = store.count(language)
+        self._length = self.count if is_loaded else 0
+        self._answers: List[Tuple[int, bool, float]] = []
+
+
+    def __len__(self) -> int:
+        return self._length
+
+
+    def __getitem__(self, index: int) -> Word:
+        if index < 0:
+            index += self._length
+        return self.store.word_at(self.language, index)
+
+
+    def __iter__(self) -> Iterator[Word]:
+        return self.words_from(0)
+
+
+    def words_from(self, start: int) -> Iterator[Word]:
+        '''
+        Returns iterator over loaded words
+        from passed index on; they are read by chunks of indexed queries.
+
+        Parameters:
+        -----------
+            start: int
+                index of the first word
+        '''
+        for position in range(start, self._length, ITERATION_CHUNK_SIZE):
+            yield from self.store.next_words(self.language, position,
+                                             min(ITERATION_CHUNK_SIZE, self._length - position))
+
+
+    def next_words(self, number_of_words: int) -> List[Word]:
+        '''
+        Returns words, that go after loaded ones,
+        by one indexed query.
+
+        Parameters:
+        -----------
+            number_of_words: int
+                max number of returned words
+        '''
+        return self.store.next_words(self.language, self._length, number_of_words)
+
+
+    def extend(self, words: List[Word]) -> None:
+        '''
+        Marks words, returned by next_words, as loaded;
+        they are already stored, so only length of vocabulary is changed.
+
+        Parameters:
+        -----------
+            words: List[Word]
+                words, returned by next_words
+        '''
+        self._length = min(self._length + len(words), self.count)
+
+
+    def sample_indexes(self, number_of_words: int,
+                             random_generator: random.Random = None) -> List[int]:
+        '''
+        Returns indexes of random distinct words
+        of whole vocabulary of language in store.
+
+        Parameters:
+        -----------
+            number_of_words: int
+                number of indexes; it is limited by number of words
+
+            random_generator: random.Random
+                generator of random numbers, by default module random is used
+        '''
+        return self.store.sample_positions(self.language, number_of_words, random_generator)
+
+
+    def words_at(self, indexes: List[int]) -> List[Word]:
+        '''
+        Returns words
+        with passed indexes.
+
+        Parameters:
+        -----------
+            indexes: List[int]
+                indexes of words in vocabulary
+        '''
+        return self.store.words_at(self.language, indexes)
+
+
+    def record_answer(self, index: int,
+                            is_correct: bool) -> None:
+        '''
+        Remembers answer to word with passed index;
+        statistics of words are updated by all answers at once, when store is closed,
+        so answer doesn't wait for commit.
+
+        Parameters:
+        -----------
+            index: int
+                index of word in vocabulary
+
+            is_correct: bool
+                represents boolean value, if answer was correct
+        '''
+        self._answers.append((index, is_correct, time.time()))
+
+
+    def close(self) -> None:
+        '''
+        Writes remembered answers
+        in one transaction and closes store.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        if self._answers:
+            self.store.record_answers(self.language, self._answers)
+            self._answers = []
+        self.store.close()
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description = 'Imports vocabulary json into SQLite store.')
+    parser.add_argument('database')
+    parser.add_argument('json_path')
+    parser.add_argument('--language')
+    parser.add_argument('--tag', dest = 'tags', action = 'append', default = [])
+    arguments = parser.parse_args()
+
+    store = VocabularyStore(arguments.database)
+    print('Imported %s words.' % store.import_json(arguments.json_path,
+                                                   language = arguments.language,
+                                                   tags = arguments.tags))
+    store.close()
@@ -0,0 +1,295 @@
+import io
+import os
+import re
+import json
+import unicodedata
+from itertools import repeat
+from typing import IO, Iterable, Iterator, List, NamedTuple, Optional, Union
+
+
+CHUNK_SIZE = 64 * 1024
+ANSWER_SEPARATOR = '/'
+# compressed vocabularies, such as "vocabulary_pl.json.gz", are decompressed while they are parsed
+COMPRESSION_SUFFIXES = ('.gz', '.xz', '.bz2')
+
+_decoder = json.JSONDecoder()
+_whitespace = re.compile(r'[ \t\n\r]*')
+_separator = re.compile(r'[ \t\n\r]*([,\]])[ \t\n\r]*')
+
+
+class Word(NamedTuple):
+    '''
+    Class, that represents
+    one word of vocabulary.
+
+    Attributes:
+    -----------
+        foreign_word: str
+            word, that is asked
+
+        translation: str
+            expected answer; several accepted answers
+            are separated by ANSWER_SEPARATOR
+    '''
+    foreign_word: str
+    translation: str
+
+
+def normalize_text(text: str) -> str:
+    '''
+    Returns text without surrounding whitespaces
+    in NFC form, so letters with diacritics, typed in different ways,
+    are stored equally.
+
+    Parameters:
+    -----------
+        text: str
+            text of word from vocabulary json
+    '''
+    text = text.strip()
+    if unicodedata.is_normalized('NFC', text):
+        return text
+    return unicodedata.normalize('NFC', text)
+
+
+def normalize_translation(translation: Union[str, List[str]]) -> str:
+    '''
+    Returns translation from vocabulary json
+    normalized by normalize_text; list of accepted answers
+    is joined by ANSWER_SEPARATOR, so it is stored as one text everywhere.
+
+    Parameters:
+    -----------
+        translation: str | List[str]
+            translation or list of accepted translations from vocabulary json
+    '''
+    if isinstance(translation, str):
+        return normalize_text(translation)
+    return (' %s ' % ANSWER_SEPARATOR).join(normalize_text(answer) for answer in translation)
+
+
+def split_answers(translation: str) -> List[str]:
+    '''
+    Returns accepted answers
+    from translation of word.
+
+    Parameters:
+    -----------
+        translation: str
+            translation of word, answers are separated by ANSWER_SEPARATOR
+    '''
+    if ANSWER_SEPARATOR not in translation:
+        return [translation]
+    return [answer.strip() for answer in translation.split(ANSWER_SEPARATOR) if answer.strip()]
+
+
+def make_words(foreign_words: Iterable[str],
+               translations: Iterable[str]) -> List[Word]:
+    '''
+    Returns list of words, made from columns of foreign words
+    and translations; words are created without calling Word constructor
+    in python, what is several times faster for big vocabularies.
+
+    Parameters:
+    -----------
+        foreign_words: Iterable[str]
+            foreign words in order of vocabulary
+
+        translations: Iterable[str]
+            translations in the same order
+    '''
+    return list(map(tuple.__new__, repeat(Word), zip(foreign_words, translations)))
+
+
+def get_vocabulary_path(language: str) -> str:
+    '''
+    Returns path to vocabulary json
+    for passed language in current working directory.
+    If there is no plain json, but there is compressed one,
+    such as "vocabulary_pl.json.gz", path to it is returned.
+
+    Parameters:
+    -----------
+        language: str
+            language abbreviature, such as: (en, pl, ru, ua etc.)
+    '''
+    path = '%s/vocabulary_%s.json' % (os.getcwd(), language)
+    if os.path.exists(path):
+        return path
+    for suffix in COMPRESSION_SUFFIXES:
+        if os.path.exists(path + suffix):
+            return path + suffix
+    return path
+
+
+def strip_compression_suffix(path: str) -> str:
+    '''
+    Returns path to vocabulary json
+    without suffix of compression.
+
+    Parameters:
+    -----------
+        path: str
+            path to plain or compressed vocabulary json
+    '''
+    for suffix in COMPRESSION_SUFFIXES:
+        if path.endswith(suffix):
+            return path[:-len(suffix)]
+    return path
+
+
+def open_vocabulary_file(path: str,
+                         file: Optional[IO[bytes]] = None) -> IO[bytes]:
+    '''
+    Opens vocabulary json in binary mode;
+    compressed json is decompressed by codec from suffix of path, while it is read.
+    Codec modules are imported only for compressed files.
+
+    Parameters:
+    -----------
+        path: str
+            path to plain or compressed vocabulary json
+
+        file: IO[bytes]
+            already opened file, that is read instead of opening of path;
+            it isn't closed together with returned file
+    '''
+    source = path if file is None else file
+    if path.endswith('.gz'):
+        import gzip
+        return gzip.open(source, 'rb')
+    if path.endswith('.xz'):
+        import lzma
+        return lzma.open(source, 'rb')
+    if path.endswith('.bz2'):
+        import bz2
+        return bz2.open(source, 'rb')
+    return open(path, 'rb') if file is None else file
+
+
+def load_words(path: str) -> Iterator[Word]:
+    '''
+    Opens vocabulary json and returns iterator,
+    that parses its words one by one.
+    Compressed json is decompressed by chunks together with parsing,
+    so it is never inflated whole into memory or temporary file.
+    Raises FileNotFoundError at once, if file doesn't exist.
+
+    Parameters:
+    -----------
+        path: str
+            path to plain or compressed vocabulary json
+    '''
+    return iter_words(io.TextIOWrapper(open_vocabulary_file(path), encoding = 'utf-8'))
+
+
+def iter_words(file: IO[str]) -> Iterator[Word]:
+    '''
+    Yields words from the first array of vocabulary json
+    (such as "words_pl") one by one, reading file by chunks,
+    so whole file is never kept in memory.
+    Texts of words are normalized by normalize_text,
+    translation can be list of accepted answers.
+    Closes file, when it is read.
+
+    Parameters:
+    -----------
+        file: IO[str]
+            opened vocabulary json in text mode
+    '''
+    with file:
+        reader = _JsonStreamReader(file)
+        reader.expect('{')
+        reader.decode()
+        reader.expect(':')
+        reader.expect('[')
+        for item in reader.iter_array():
+            yield Word(normalize_text(item['foreign_word']),
+                       normalize_translation(item['translation']))
+
+
+class _JsonStreamReader:
+    '''
+    Decodes json values one after another
+    from text file, keeping in memory only unparsed part of current chunk.
+    '''
+    def __init__(self, file: IO[str]) -> None:
+        self.file = file
+        self.buffer = ''
+        self.position = 0
+        self.is_exhausted = False
+
+
+    def _read_chunk(self) -> bool:
+        chunk = self.file.read(CHUNK_SIZE)
+        if not chunk:
+            self.is_exhausted = True
+            return False
+        self.buffer = self.buffer[self.position:] + chunk
+        self.position = 0
+        return True
+
+
+    def _skip_whitespace(self) -> None:
+        while True:
+            self.position = _whitespace.match(self.buffer, self.position).end()
+            if self.position < len(self.buffer) or not self._read_chunk():
+                return
+
+
+    def skip_if(self, char: str) -> bool:
+        self._skip_whitespace()
+        if self.buffer.startswith(char, self.position):
+            self.position += 1
+            return True
+        return False
+
+
+    def expect(self, char: str) -> None:
+        if not self.skip_if(char):
+            raise json.JSONDecodeError('Expecting %r' % char, self.buffer, self.position)
+
+
+    def decode(self):
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                if self.is_exhausted or not self._read_chunk():
+                    raise
+                continue
+            self.position = end
+            return value
+
+
+    def iter_array(self) -> Iterator:
+        '''
+        Yields values of array, which opening bracket is already read.
+        Separator after value is matched in the same buffer, when it is possible,
+        so common case costs one decoding and one regex match per value.
+        '''
+        if self.skip_if(']'):
+            return
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.position)
+            except json.JSONDecodeError:
+                if self.is_exhausted or not self._read_chunk():
+                    raise
+                self._skip_whitespace()
+                continue
+            match = _separator.match(self.buffer, end)
+            if match is not None:
+                self.position = match.end()
+                yield value
+                if match.group(1) == ']':
+                    return
+            else:
+                self.position = end
+                yield value
+                if self.skip_if(']'):
+                    return
+                self.expect(',')
+                self._skip_whitespace()
@@ -0,0 +1,103 @@
+'''
+Differences between versions of vocabulary json.
+
+Words are keyed by foreign word; the second and further words
+with the same foreign word are keyed by foreign word and number of occurrence,
+so every word of vocabulary has its own key. Versions are compared as mappings
+of keys to translations by set operations on dict views, which run in C,
+so only added, removed and changed words are touched in python.
+'''
+from typing import Dict, Hashable, Iterable, List, NamedTuple, Tuple
+
+from vocabulary import Word
+
+
+WordKey = Hashable
+
+
+def word_keys(words: Iterable[Word]) -> Dict[WordKey, str]:
+    '''
+    Returns translations of words
+    by their keys, in order of words.
+
+    Parameters:
+    -----------
+        words: Iterable[Word]
+            words of vocabulary
+    '''
+    translations: Dict[WordKey, str] = {}
+    occurrences: Dict[str, int] = {}
+    for foreign_word, translation in words:
+        key = foreign_word
+        if key in translations:
+            occurrence = occurrences.get(foreign_word, 0) + 1
+            occurrences[foreign_word] = occurrence
+            key = (foreign_word, occurrence)
+        translations[key] = translation
+    return translations
+
+
+def foreign_word_of(key: WordKey) -> str:
+    '''
+    Returns foreign word
+    of word with passed key.
+
+    Parameters:
+    -----------
+        key: WordKey
+            key, returned by word_keys
+    '''
+    return key if isinstance(key, str) else key[0]
+
+
+class VocabularyDiff(NamedTuple):
+    '''
+    Class, that represents
+    changes of vocabulary between two versions.
+
+    Attributes:
+    -----------
+        added: list
+            keys and words, that are new, in order of new version
+
+        removed: list
+            keys of words, that were removed
+
+        changed: list
+            keys and words, which translations were changed
+    '''
+    added: List[Tuple[WordKey, Word]]
+    removed: List[WordKey]
+    changed: List[Tuple[WordKey, Word]]
+
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.changed)
+
+
+def diff_vocabulary(old: Dict[WordKey, str],
+                    words: Iterable[Word]) -> Tuple[VocabularyDiff, Dict[WordKey, str]]:
+    '''
+    Returns changes of vocabulary
+    and translations of new version by keys, that new version
+    is compared with on the next change.
+
+    Parameters:
+    -----------
+        old: Dict[WordKey, str]
+            translations of previous version by keys, returned by word_keys
+
+        words: Iterable[Word]
+            words of new version
+    '''
+    new = word_keys(words)
+    different = new.items() - old.items()
+    added_keys = new.keys() - old.keys()
+    removed = list(old.keys() - new.keys())
+    changed = [(key, Word(foreign_word_of(key), translation))
+               for key, translation in different if key not in added_keys]
+    added = []
+    if added_keys:
+        added = [(key, Word(foreign_word_of(key), translation))
+                 for key, translation in new.items() if key in added_keys]
+    return VocabularyDiff(added, removed, changed), new
@@ -0,0 +1,272 @@
+import io
+import os
+import time
+import random
+import logging
+from itertools import islice
+from typing import Callable, Dict, List, Optional
+
+from PySide6 import QtCore
+
+from vocabulary import (iter_words,
+                        load_words,
+                        open_vocabulary_file)
+from matching import NormalizedAnswers
+from sampling import Reservoir
+from vocabulary_diff import (WordKey,
+                             diff_vocabulary)
+
+
+class LoaderSignals(QtCore.QObject):
+    '''
+    Class, that represents
+    signals of VocabularyLoader; they are delivered
+    to receivers in GUI thread through event loop.
+
+    Signals:
+    --------
+        batch_loaded: list, list
+            batch of parsed words and their normalized accepted answers,
+            empty list, if answers aren't normalized
+
+        progress: int
+            percent of vocabulary file, that is parsed
+
+        finished: float
+            time, that parsing took, in seconds
+
+        failed: str
+            error message
+    '''
+    batch_loaded = QtCore.Signal(list, list)
+    progress = QtCore.Signal(int)
+    finished = QtCore.Signal(float)
+    failed = QtCore.Signal(str)
+
+
+class VocabularyLoader(QtCore.QRunnable):
+    '''
+    Class, that represents
+    task for QThreadPool, which parses vocabulary json
+    in worker thread and sends parsed words by batches
+    together with their accepted answers, normalized for matching.
+    If size of sample is passed, words are sampled in reservoir
+    and only sampled words are sent in one batch at the end.
+
+    Attributes:
+    -----------
+        path: str
+            path to vocabulary json
+
+        first_batch_size: int
+            size of the first batch, small to show first question sooner
+
+        batch_size: int
+            size of other batches
+
+        normalize: Callable[[str], NormalizedAnswers]
+            function, that returns normalized accepted answers from translation,
+            None if answers aren't needed before words are asked
+
+        sample_size: int
+            number of randomly sampled words, None if all words are sent
+
+        random_generator: random.Random
+            generator of random numbers for sampling
+
+        signals: LoaderSignals
+            signals with batches, progress and end of loading
+
+    Methods:
+    --------
+        cancel() -> None:
+            stops loading after current batch.
+    '''
+    def __init__(self, path: str,
+                       first_batch_size: int,
+                       batch_size: int,
+                       normalize: Optional[Callable[[str], NormalizedAnswers]],
+                       sample_size: int = None,
+                       random_generator: random.Random = None) -> None:
+        super().__init__()
+        self.path = path
+        self.first_batch_size = first_batch_size
+        self.batch_size = batch_size
+        self.normalize = normalize
+        self.sample_size = sample_size
+        self.random_generator = random_generator
+        self.signals = LoaderSignals()
+        self.is_cancelled = False
+
+
+    def cancel(self) -> None:
+        '''
+        Stops loading after current batch.
+
+        Parameters:
+        -----------
+            Doesn't have
+        '''
+        self.is_cancelled = True
+
+
+    def _send_batch(self, batch: List) -> None:
+        normalized_answers = []
+        if self.normalize is not None:
+            normalized_answers = [self.normalize(word.translation) for word in batch]
+        self.signals.batch_loaded.emit(batch, normalized_answers)
+
+
+    def run(self) -> None:
+        start = time.perf_counter()
+        reservoir = None
+        if self.sample_size:
+            reservoir = Reservoir(self.sample_size, self.random_generator)
+        try:
+            raw_file = open(self.path, 'rb')
+            size = os.fstat(raw_file.fileno()).st_size or 1
+            # progress is counted by read bytes of file, compressed or not
+            words = iter_words(io.TextIOWrapper(open_vocabulary_file(self.path, raw_file), encoding = 'utf-8'))
+            try:
+                batch_size = self.first_batch_size
+                while not self.is_cancelled:
+                    batch = list(islice(words, batch_size))
+                    if reservoir is None:
+                        self._send_batch(batch)
+                    else:
+                        reservoir.add(batch)
+                    if len(batch) < batch_size:
+                        break
+                    self.signals.progress.emit(raw_file.tell() * 100 // size)
+                    batch_size = self.batch_size
+                if reservoir is not None and not self.is_cancelled:
+                    self._send_batch(reservoir.items)
+            finally:
+                words.close()
+                raw_file.close()
+        except Exception as error:
+            logging.exception("Vocabulary can't be loaded.")
+            self.signals.failed.emit(str(error))
+            return
+        self.signals.progress.emit(100)
+        self.signals.finished.emit(time.perf_counter() - start)
+
+
+class DecksLoader(VocabularyLoader):
+    '''
+    Class, that represents
+    task for QThreadPool, which parses several vocabulary decks
+    in parallel by process pool, merges them and sends merged words by batches
+    together with their normalized accepted answers.
+    If size of sample is passed, only sampled words are sent.
+
+    Attributes:
+    -----------
+        paths: List[str]
+            paths to vocabulary json files or directories with them
+    '''
+    def __init__(self, paths: List[str],
+                       batch_size: int,
+                       normalize: Optional[Callable[[str], NormalizedAnswers]],
+                       sample_size: int = None,
+                       random_generator: random.Random = None) -> None:
+        super().__init__(None,
+                         first_batch_size = batch_size,
+                         batch_size = batch_size,
+                         normalize = normalize,
+                         sample_size = sample_size,
+                         random_generator = random_generator)
+        self.paths = paths
+
+
+    def run(self) -> None:
+        from decks import load_decks
+
+        start = time.perf_counter()
+        try:
+            words = load_decks(self.paths)
+        except Exception as error:
+            logging.exception("Vocabulary decks can't be loaded.")
+            self.signals.failed.emit(str(error))
+            return
+        if self.sample_size:
+            words = (self.random_generator or random).sample(words, min(self.sample_size, len(words)))
+        for position in range(0, len(words), self.batch_size):
+            if self.is_cancelled:
+                return
+            self._send_batch(words[position:position + self.batch_size])
+            self.signals.progress.emit(min(position + self.batch_size, len(words)) * 100 // len(words))
+        self.signals.progress.emit(100)
+        self.signals.finished.emit(time.perf_counter() - start)
+
+
+class ReloaderSignals(QtCore.QObject):
+    '''
+    Class, that represents
+    signals of VocabularyReloader.
+
+    Signals:
+    --------
+        reloaded: VocabularyDiff, dict
+            changes of vocabulary and translations of reloaded version by keys
+
+        failed: str
+            error message
+    '''
+    reloaded = QtCore.Signal(object, object)
+    failed = QtCore.Signal(str)
+
+
+class VocabularyReloader(QtCore.QRunnable):
+    '''
+    Class, that represents
+    task for QThreadPool, which parses changed vocabulary json
+    in worker thread and compares it with previous version,
+    so only changes are applied in GUI thread.
+
+    Attributes:
+    -----------
+        path: str
+            path to vocabulary json
+
+        snapshot: Dict[WordKey, str]
+            translations of previous version by keys
+
+        signals: ReloaderSignals
+            signals with changes or error
+    '''
+    def __init__(self, path: str,
+                       snapshot: Dict[WordKey, str]) -> None:
+        super().__init__()
+        self.path = path
+        self.snapshot = snapshot
+        self.signals = ReloaderSignals()
+
+
+    def run(self) -> None:
+        try:
+            diff, snapshot = diff_vocabulary(self.snapshot, load_words(self.path))
+        except Exception as error:
+            # file is often read, while editor is still writing it
+            logging.warning("Changed vocabulary can't be loaded: %s", error)
+            self.signals.failed.emit(str(error))
+            return
+        self.signals.reloaded.emit(diff, snapshot)
+
+
+class Task(QtCore.QRunnable):
+    '''
+    Class, that represents
+    task for QThreadPool, which calls passed function
+    in worker thread.
+    '''
+    def __init__(self, function: Callable[[], None]) -> None:
+        super().__init__()
+        self.function = function
+
+
+    def run(self) -> None:
+        try:
+            self.function()
+        except Exception:
+            logging.exception("Background task failed.")